@@ -0,0 +1,327 @@
+"""Headless filtering with the viewer's saved filter sets.
+
+``python -m loganalysis_gui.cli -f triage.json device1.log device2.log.gz``
+runs the filters from File > Save Filters over each input through
+``filter_engine``, exactly as the viewer's filter pass does, writes the lines
+the viewer would show and optionally per-filter match counts as JSON. Inputs
+ending in ``.gz``, ``.bz2``, ``.xz`` or ``.lzma`` are decompressed on the fly,
+and several inputs are filtered in parallel worker processes whose output is
+streamed out in input order as each one finishes. Nothing here imports Qt.
+"""
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .constants import COLOR_MAP, TEXT_COLOR_MAP
+from .filter_engine import evaluate_line, parse_filter_set, prepare_filters, validate_filters
+from .highlight import filter_colors
+
+_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+}
+COLOR_NEVER = "never"
+COLOR_ALWAYS = "always"
+COLOR_AUTO = "auto"
+_ANSI_RESET = "\x1b[0m"
+_OUTPUT_BUFFER_BYTES = 1 << 20
+
+
+class FilterFileError(ValueError):
+    pass
+
+
+def open_log(path):
+    """Open a log for reading as text, decompressing by file extension."""
+    opener = _OPENERS.get(os.path.splitext(path)[1].lower(), open)
+    # newline="" keeps line endings as they are, like the viewer's loader.
+    return opener(path, "rt", encoding="utf-8", errors="replace", newline="")
+
+
+def load_filter_files(paths):
+    """Return the filters of every enabled filter set in ``paths``, in order.
+
+    Disabled sets are skipped like disabled tabs in the viewer; raises
+    FilterFileError for unreadable or invalid files and for files that hold
+    no filters, which would otherwise let every line through.
+    """
+    filters = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                loaded = json.load(handle)
+        except json.JSONDecodeError:
+            raise FilterFileError(f"{path}: not valid JSON") from None
+        except OSError as error:
+            raise FilterFileError(f"{path}: {error.strerror or error}") from None
+
+        if not isinstance(loaded, list) and not (isinstance(loaded, dict) and "filters" in loaded):
+            raise FilterFileError(f"{path}: not a saved filter set (expected a list or an object with \"filters\")")
+        loaded_set, _name, enabled = parse_filter_set(loaded)
+        if not isinstance(loaded_set, list):
+            raise FilterFileError(f"{path}: invalid filter file format")
+        normalized_filters, invalid_filters = validate_filters(loaded_set)
+        if normalized_filters is None or invalid_filters:
+            raise FilterFileError(f"{path}: {'; '.join(invalid_filters)}")
+        if not normalized_filters:
+            raise FilterFileError(f"{path}: no filters")
+        if enabled:
+            filters.extend(normalized_filters)
+    return filters
+
+
+def _hex_rgb(color):
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def color_marker(matched_filters):
+    """Return the ANSI escape that colors a line like the viewer, or ""."""
+    background, foreground = filter_colors([matched.filter_data for matched in matched_filters])
+    codes = []
+    if foreground:
+        codes.append("38;2;%d;%d;%d" % _hex_rgb(TEXT_COLOR_MAP.get(foreground, foreground)))
+    if background:
+        codes.append("48;2;%d;%d;%d" % _hex_rgb(COLOR_MAP.get(background, background)))
+    return f"\x1b[{';'.join(codes)}m" if codes else ""
+
+
+def filter_log(input_path, filters, output, *, show_only_filtered=True, color=False, line_numbers=False):
+    """Write the visible lines of ``input_path`` to the text stream ``output``.
+
+    Returns a summary dict with line, visible and match totals and one count
+    per entry of ``filters`` (inactive ones stay 0), counted like the
+    viewer's filter pass.
+    """
+    prepared_filters = prepare_filters(filters)
+    filter_counts = [0] * len(filters)
+    line_count = 0
+    visible_count = 0
+    match_count = 0
+    write = output.write
+
+    with open_log(input_path) as handle:
+        for line_index, line in enumerate(handle):
+            line_count += 1
+            matching_filters, is_visible = evaluate_line(line, prepared_filters, show_only_filtered)
+            for matched_filter in matching_filters:
+                filter_counts[matched_filter.original_index] += 1
+            if matching_filters and not matching_filters[-1].filter_data["exclude"]:
+                match_count += 1
+            if not is_visible:
+                continue
+
+            visible_count += 1
+            if line_numbers:
+                write(f"{line_index + 1:6d} | ")
+            marker = color_marker(matching_filters) if color and matching_filters else ""
+            if marker:
+                text = line.rstrip("\r\n")
+                ending = line[len(text):] or "\n"
+                write(f"{marker}{text}{_ANSI_RESET}{ending}")
+            else:
+                write(line if line.endswith("\n") else line + "\n")
+
+    return {
+        "path": input_path,
+        "lines": line_count,
+        "visible": visible_count,
+        "matched": match_count,
+        "filter_counts": filter_counts,
+    }
+
+
+def _filter_into(input_path, filters, output, options):
+    """Run ``filter_log``, returning an error summary instead of raising for a bad input."""
+    try:
+        return filter_log(input_path, filters, output, **options)
+    except BrokenPipeError:
+        raise
+    except OSError as error:
+        return {"path": input_path, "error": error.strerror or str(error)}
+    except (EOFError, lzma.LZMAError) as error:
+        # Truncated or corrupt compressed input.
+        return {"path": input_path, "error": str(error) or type(error).__name__}
+
+
+def _filter_to_file(job):
+    """Process-pool entry point: filter one input into ``output_path``."""
+    input_path, output_path, filters, options = job
+    try:
+        with open(output_path, "w", encoding="utf-8", newline="", buffering=_OUTPUT_BUFFER_BYTES) as output:
+            return _filter_into(input_path, filters, output, options)
+    except OSError as error:
+        return {"path": input_path, "error": error.strerror or str(error)}
+
+
+def _job_count(jobs, input_count):
+    return min(jobs or os.cpu_count() or 1, input_count)
+
+
+def filter_logs(input_paths, filters, output_paths, jobs=None, **options):
+    """Filter each input into the matching output path; returns summaries in input order."""
+    work = [(input_path, output_path, filters, options) for input_path, output_path in zip(input_paths, output_paths)]
+    jobs = _job_count(jobs, len(work))
+    if jobs <= 1:
+        return [_filter_to_file(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_filter_to_file, work))
+
+
+def filter_logs_to_stream(input_paths, filters, output, jobs=None, **options):
+    """Write the visible lines of every input to ``output`` in input order.
+
+    With one job the lines are written as they are filtered. Parallel jobs
+    write one temporary part per input, and each part is copied out and
+    deleted as soon as it and every input before it are done. Lines read
+    before an input fails are kept either way. Returns summaries in input
+    order.
+    """
+    jobs = _job_count(jobs, len(input_paths))
+    if jobs <= 1:
+        return [_filter_into(input_path, filters, output, options) for input_path in input_paths]
+
+    temp_dir = tempfile.mkdtemp(prefix="loganalysis-cli-")
+    try:
+        part_paths = [os.path.join(temp_dir, f"{index}.part") for index in range(len(input_paths))]
+        work = [(input_path, part_path, filters, options) for input_path, part_path in zip(input_paths, part_paths)]
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map yields in input order, so parts are copied while later inputs run.
+            for result, part_path in zip(executor.map(_filter_to_file, work), part_paths):
+                if os.path.exists(part_path):
+                    with open(part_path, "r", encoding="utf-8", newline="") as part:
+                        shutil.copyfileobj(part, output, _OUTPUT_BUFFER_BYTES)
+                    os.remove(part_path)
+                results.append(result)
+        return results
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def summarize_counts(filters, results):
+    """Return the JSON report: per-file summaries plus per-filter totals."""
+    totals = [0] * len(filters)
+    for result in results:
+        for index, count in enumerate(result.get("filter_counts", ())):
+            totals[index] += count
+    return {
+        "files": results,
+        "filters": [
+            {
+                "text": filter_data["text"],
+                "description": filter_data["description"],
+                "field": filter_data["field"],
+                "exclude": filter_data["exclude"],
+                "active": filter_data["active"],
+                "count": total,
+            }
+            for filter_data, total in zip(filters, totals)
+        ],
+    }
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog="loganalysis-cli",
+        description="Filter log files with filter sets saved by the log viewer.",
+    )
+    parser.add_argument("inputs", nargs="+", metavar="LOG", help="log files, optionally .gz/.bz2/.xz compressed")
+    parser.add_argument(
+        "-f", "--filters", action="append", required=True, metavar="JSON",
+        help="filter set saved by the viewer; repeat to combine sets like tabs",
+    )
+    outputs = parser.add_mutually_exclusive_group()
+    outputs.add_argument(
+        "-o", "--output", default="-", metavar="FILE",
+        help="write visible lines of all inputs here, in input order (default: stdout)",
+    )
+    outputs.add_argument(
+        "--output-dir", metavar="DIR", help="write each input's visible lines to DIR/<name>.filtered instead",
+    )
+    parser.add_argument("--counts", metavar="FILE", help="write per-file and per-filter match counts as JSON")
+    parser.add_argument(
+        "--show-all", action="store_true", help="also keep lines no filter matched, like unchecking Show Only Filtered",
+    )
+    parser.add_argument("-n", "--line-numbers", action="store_true", help="prefix lines with their line number")
+    parser.add_argument(
+        "--color", choices=(COLOR_NEVER, COLOR_ALWAYS, COLOR_AUTO), default=COLOR_AUTO,
+        help="mark lines with their filter colors as ANSI escapes (auto: when writing to a terminal)",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (default: one per core)")
+    return parser
+
+
+def _output_dir_paths(input_paths, output_dir):
+    paths = []
+    used = set()
+    for input_path in input_paths:
+        name = os.path.basename(input_path)
+        stem, extension = os.path.splitext(name)
+        if extension.lower() in _OPENERS:
+            name = stem
+        candidate = f"{name}.filtered"
+        suffix = 1
+        while candidate in used:
+            suffix += 1
+            candidate = f"{name}.{suffix}.filtered"
+        used.add(candidate)
+        paths.append(os.path.join(output_dir, candidate))
+    return paths
+
+
+def main(argv=None, stdout=None):
+    args = build_argument_parser().parse_args(argv)
+    stdout = stdout or sys.stdout
+    try:
+        filters = load_filter_files(args.filters)
+    except FilterFileError as error:
+        sys.stderr.write(f"loganalysis-cli: {error}\n")
+        return 2
+
+    to_stdout = args.output_dir is None and args.output == "-"
+    color = args.color == COLOR_ALWAYS or (args.color == COLOR_AUTO and to_stdout and stdout.isatty())
+    options = {"show_only_filtered": not args.show_all, "color": color, "line_numbers": args.line_numbers}
+
+    try:
+        if args.output_dir is not None:
+            os.makedirs(args.output_dir, exist_ok=True)
+            output_paths = _output_dir_paths(args.inputs, args.output_dir)
+            results = filter_logs(args.inputs, filters, output_paths, jobs=args.jobs, **options)
+        else:
+            output = stdout if to_stdout else open(
+                args.output, "w", encoding="utf-8", newline="", buffering=_OUTPUT_BUFFER_BYTES
+            )
+            try:
+                results = filter_logs_to_stream(args.inputs, filters, output, jobs=args.jobs, **options)
+                output.flush()
+            finally:
+                if output is not stdout:
+                    output.close()
+
+        if args.counts:
+            with open(args.counts, "w", encoding="utf-8") as handle:
+                json.dump(summarize_counts(filters, results), handle, ensure_ascii=False, indent=2)
+    except BrokenPipeError:
+        return 0
+    except OSError as error:
+        sys.stderr.write(f"loganalysis-cli: {error}\n")
+        return 1
+
+    failed = [result for result in results if "error" in result]
+    for result in failed:
+        sys.stderr.write(f"loganalysis-cli: {result['path']}: {result['error']}\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,50 @@
 # Shared Color Maps and Styles
+from .replay import REPLAY_FAST, REPLAY_RATE, REPLAY_REALTIME
+
 MAX_MONITOR_LINES = 200000
+MAX_PENDING_MEMORY_LINES = 50000
+LIVE_MERGE_INTERVAL_MS = 50
+# A device that sent nothing for this many merge intervals no longer holds
+# back the other devices' newer lines, and no line waits longer than that.
+LIVE_MERGE_HOLD_DRAINS = 4
+# Live appends resize the full-line column at most once per interval.
+COLUMN_WIDTH_UPDATE_INTERVAL_MS = 250
+# Coalesces highlight requests from one paint pass into one background batch.
+HIGHLIGHT_PASS_DELAY_MS = 16
+# SearchWorker reports find hits in blocks of this many lines.
+SEARCH_SCAN_BLOCK_LINES = 100000
+# The Find box applies typed text once keystrokes pause for this long.
+FIND_TYPING_DEBOUNCE_MS = 150
+# Find next/previous builds its hit index in the background for views with
+# at least this many rows; smaller views are indexed on the spot.
+FIND_INDEX_BACKGROUND_ROWS = 200000
+# Export writes this many visible rows per buffered write and progress report.
+EXPORT_BLOCK_ROWS = 50000
+EXPORT_BUFFER_BYTES = 1 << 20
+# Copying at least this many rows builds the clipboard text in the background;
+# above COPY_CLIPBOARD_MAX_ROWS exporting to a file is offered instead.
+COPY_BACKGROUND_ROWS = 20000
+COPY_CLIPBOARD_MAX_ROWS = 1000000
+ALL_DEVICES_LABEL = "All Devices"
+LOGCAT_BUFFERS = ("main", "system", "crash", "events", "radio", "kernel")
+# logcat's own default selection when no -b is given.
+DEFAULT_LOGCAT_BUFFERS = ("main", "system", "crash")
+ADB_RECONNECT_INITIAL_DELAY = 0.5
+ADB_RECONNECT_MAX_DELAY = 10.0
+# Refilters over at least this many lines publish the region around the
+# current row first (FILTER_FOCUS_LINES wide) and then grow in
+# FILTER_PROGRESS_LINES steps.
+PROGRESSIVE_FILTER_MIN_LINES = 500000
+FILTER_FOCUS_LINES = 20000
+FILTER_PROGRESS_LINES = 250000
+# Replay pace choices: label -> (mode, lines per second).
+REPLAY_PACE_CHOICES = {
+    "Real Time (log timestamps)": (REPLAY_REALTIME, 0),
+    "1,000 lines/s": (REPLAY_RATE, 1000),
+    "10,000 lines/s": (REPLAY_RATE, 10000),
+    "100,000 lines/s": (REPLAY_RATE, 100000),
+    "As Fast As Possible": (REPLAY_FAST, 0),
+}
 
 COLOR_MAP = {
     "Khaki": "#F0E68C", "Yellow": "#FFFF00", "Gold": "#FFD700", "Cyan": "#00FFFF",
@@ -27,7 +72,7 @@ QMainWindow, QWidget {
     background-color: #2b2b2b;
     color: #e0e0e0;
 }
-QListView, QTreeView {
+QListView, QTreeView, LogView {
     background-color: #1e1e1e;
     color: #e0e0e0;
     selection-background-color: #3a3a3a;
@@ -0,0 +1,111 @@
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFontMetricsF
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate
+
+from .constants import COLOR_MAP, TEXT_COLOR_MAP
+from .highlight import SEARCH_SPAN
+from .models import UNMATCHED_TEXT_COLOR
+
+GUTTER_SEPARATOR = " | "
+SEARCH_SPAN_COLORS = {False: QColor("#FFEB3B"), True: QColor("#8D6E00")}
+# Matches of filters without a background color.
+DEFAULT_SPAN_COLOR = QColor(255, 193, 7, 110)
+
+
+class LogLineDelegate(QStyledItemDelegate):
+    """Paints log rows straight from the model's columns.
+
+    Row colors and match spans come from a ``HighlightCache`` filled by
+    ``HighlightWorker``; a row that is not cached yet is painted as plain
+    text and repainted once its entry arrives. ``data()`` is never queried,
+    so painting formats no display strings and matches no filters.
+    """
+
+    def __init__(self, model, cache, parent=None, *, on_missing_entry=None):
+        super().__init__(parent)
+        self.model = model
+        self.cache = cache
+        # Called when a row had to be painted without its highlight entry.
+        self.on_missing_entry = on_missing_entry
+
+    def _span_color(self, kind):
+        if kind == SEARCH_SPAN:
+            return SEARCH_SPAN_COLORS[self.model.is_dark_theme]
+        filters = self.model.filters
+        background = filters[kind]["bg_color"] if kind < len(filters) else "None"
+        if background == "None":
+            return DEFAULT_SPAN_COLOR
+        return QColor(COLOR_MAP.get(background, background)).darker(125)
+
+    def paint(self, painter, option, index):
+        model = self.model
+        row = index.row()
+        if row >= len(model.visible_indices):
+            return
+        line_index = model.visible_indices[row]
+        if line_index >= len(model.all_lines):
+            return
+
+        entry = self.cache.get(line_index)
+        if entry is None and self.on_missing_entry is not None:
+            self.on_missing_entry()
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        margin = style.pixelMetric(QStyle.PM_FocusFrameHMargin, None, option.widget) + 1
+        rect = QRectF(option.rect)
+        selected = bool(option.state & QStyle.State_Selected)
+
+        painter.save()
+        painter.setClipRect(option.rect)
+        if selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        elif entry is not None and entry.background:
+            painter.fillRect(option.rect, QColor(COLOR_MAP.get(entry.background, entry.background)))
+
+        font = model.font
+        painter.setFont(font)
+        metrics = QFontMetricsF(font)
+        x = rect.left() + margin
+        baseline = rect.top() + (rect.height() - metrics.height()) / 2 + metrics.ascent()
+
+        if model.show_line_numbers:
+            gutter = f"{line_index + 1:6d}{GUTTER_SEPARATOR}"
+            painter.setPen(option.palette.highlightedText().color() if selected else QColor(UNMATCHED_TEXT_COLOR))
+            painter.drawText(QPointF(x, baseline), gutter)
+            x += metrics.horizontalAdvance(gutter)
+
+        text = model._display_text(model.all_lines[line_index])
+        offset = 0
+        if len(model.source_labels) > 1:
+            label = f"[{model._source_label(line_index)}] "
+            text = label + text
+            offset = len(label)
+
+        visible_length = len(text)
+        if option.textElideMode != Qt.ElideNone:
+            elided = metrics.elidedText(text, option.textElideMode, rect.right() - x)
+            if elided != text:
+                text = elided
+                # Keep spans off the ellipsis.
+                visible_length = len(text) - 1
+
+        if entry is not None and entry.spans:
+            for start, end, kind in entry.spans:
+                start += offset
+                end = min(end + offset, visible_length)
+                if start >= end:
+                    continue
+                left = x + metrics.horizontalAdvance(text[:start])
+                width = metrics.horizontalAdvance(text[start:end])
+                painter.fillRect(QRectF(left, rect.top() + 1, width, rect.height() - 2), self._span_color(kind))
+
+        if selected:
+            color = option.palette.highlightedText().color()
+        elif entry is not None and entry.foreground:
+            color = QColor(TEXT_COLOR_MAP.get(entry.foreground, entry.foreground))
+        elif entry is not None and not entry.matched:
+            color = QColor(UNMATCHED_TEXT_COLOR)
+        else:
+            color = option.palette.text().color()
+        painter.setPen(color)
+        painter.drawText(QPointF(x, baseline), text)
+        painter.restore()
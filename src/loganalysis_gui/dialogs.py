@@ -5,14 +5,23 @@ from PyQt5.QtWidgets import (
     QCheckBox, QLabel, QComboBox, QGroupBox, QFormLayout, QMessageBox
 )
 from PyQt5.QtGui import QColor, QPixmap, QIcon
-from PyQt5.QtCore import Qt
-from .constants import COLOR_MAP, TEXT_COLOR_MAP
+from PyQt5.QtCore import Qt, QTimer
+from .constants import COLOR_MAP, FIND_TYPING_DEBOUNCE_MS, TEXT_COLOR_MAP
+from .filter_engine import filter_field_error
+
+FILTER_FIELD_CHOICES = [
+    ("Whole line", "line"),
+    ("Tag (exact)", "tag"),
+    ("Level (at least)", "level"),
+    ("Message", "message"),
+    ("PID", "pid"),
+]
 
 class FindDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Find")
-        self.setFixedWidth(400)
+        self.setFixedWidth(480)
         
         layout = QVBoxLayout(self)
         
@@ -26,8 +35,11 @@ class FindDialog(QDialog):
         self.btn_next.clicked.connect(self.find_next)
         self.btn_prev = QPushButton("Previous")
         self.btn_prev.clicked.connect(self.find_prev)
+        self.btn_all = QPushButton("Find All")
+        self.btn_all.clicked.connect(self.find_all)
         input_layout.addWidget(self.btn_prev)
         input_layout.addWidget(self.btn_next)
+        input_layout.addWidget(self.btn_all)
         
         layout.addLayout(input_layout)
         
@@ -37,18 +49,26 @@ class FindDialog(QDialog):
         opt_layout.addWidget(self.chk_case)
         opt_layout.addWidget(self.chk_regex)
         opt_layout.addStretch()
+        self.hit_count_lbl = QLabel("")
+        opt_layout.addWidget(self.hit_count_lbl)
         layout.addLayout(opt_layout)
         
         self.status_lbl = QLabel("")
         self.status_lbl.setStyleSheet("color: red")
         layout.addWidget(self.status_lbl)
 
-        # Signals for real-time highlighting
-        self.input_field.textChanged.connect(self._on_search_params_changed)
+        # Signals for real-time highlighting. Typing restarts the timer, so
+        # only the text present when keystrokes pause starts a scan.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(FIND_TYPING_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._on_search_params_changed)
+        self.input_field.textChanged.connect(self.search_timer.start)
         self.chk_case.toggled.connect(self._on_search_params_changed)
         self.chk_regex.toggled.connect(self._on_search_params_changed)
 
     def _on_search_params_changed(self):
+        self.search_timer.stop()
         if hasattr(self.parent(), "update_search_highlights"):
             self.parent().update_search_highlights(
                 self.input_field.text(),
@@ -56,7 +76,12 @@ class FindDialog(QDialog):
                 self.chk_regex.isChecked()
             )
 
+    def _flush_pending_search(self):
+        if self.search_timer.isActive():
+            self._on_search_params_changed()
+
     def hideEvent(self, event):
+        self.search_timer.stop()
         if hasattr(self.parent(), "clear_search_highlights"):
             self.parent().clear_search_highlights()
         super().hideEvent(event)
@@ -67,16 +92,32 @@ class FindDialog(QDialog):
         super().closeEvent(event)
 
     def find_next(self):
+        self._flush_pending_search()
         self.parent().find_in_files(self.input_field.text(), forward=True, 
                                    case=self.chk_case.isChecked(), regex=self.chk_regex.isChecked())
 
     def find_prev(self):
+        self._flush_pending_search()
         self.parent().find_in_files(self.input_field.text(), forward=False, 
                                    case=self.chk_case.isChecked(), regex=self.chk_regex.isChecked())
     
+    def find_all(self):
+        self._flush_pending_search()
+        self.parent().find_all(self.input_field.text(), case=self.chk_case.isChecked(),
+                               regex=self.chk_regex.isChecked())
+
     def set_status(self, text):
         self.status_lbl.setText(text)
 
+    def set_hit_count(self, count, scanning=False):
+        """Show the number of matching lines; None clears it."""
+        if count is None:
+            self.hit_count_lbl.setText("")
+            return
+        noun = "line" if count == 1 else "lines"
+        suffix = " (searching...)" if scanning else ""
+        self.hit_count_lbl.setText(f"{count:,} matching {noun}{suffix}")
+
 
 class FilterDialog(QDialog):
     def __init__(self, parent=None, filter_data=None):
@@ -92,6 +133,14 @@ class FilterDialog(QDialog):
         self.desc_input = QLineEdit()
         self.desc_input.setPlaceholderText("Enter optional description...")
         
+        self.field = QComboBox()
+        for label, field in FILTER_FIELD_CHOICES:
+            self.field.addItem(label, field)
+        self.field.setToolTip(
+            "Part of a threadtime logcat line to match. Tag and level filters can be "
+            "applied on the device while monitoring."
+        )
+
         # Options
         self.case_sensitive = QCheckBox("Case Sensitive")
         self.regex = QCheckBox("Regex")
@@ -148,6 +197,9 @@ class FilterDialog(QDialog):
             self.case_sensitive.setChecked(filter_data.get("case_sensitive", False))
             self.regex.setChecked(filter_data.get("regex", False))
             self.exclude.setChecked(filter_data.get("exclude", False))
+
+            idx = self.field.findData(filter_data.get("field", "line"))
+            if idx >= 0: self.field.setCurrentIndex(idx)
             
             idx = self.bg_color.findText(filter_data.get("bg_color", "None"))
             if idx >= 0: self.bg_color.setCurrentIndex(idx)
@@ -158,7 +210,16 @@ class FilterDialog(QDialog):
         self.update_preview()
 
     def accept(self):
-        if self.regex.isChecked():
+        field_error = filter_field_error(self.get_filter_data())
+        if field_error:
+            QMessageBox.warning(
+                self,
+                "Invalid Filter",
+                f"Cannot save this filter: {field_error}.",
+            )
+            return
+
+        if self.regex.isChecked() and self.field.currentData() not in ("level", "pid"):
             flags = 0 if self.case_sensitive.isChecked() else re.IGNORECASE
             try:
                 re.compile(self.text_input.text(), flags)
@@ -182,6 +243,7 @@ class FilterDialog(QDialog):
         form_layout_match = QFormLayout()
         form_layout_match.addRow("Pattern:", self.text_input)
         form_layout_match.addRow("Description:", self.desc_input)
+        form_layout_match.addRow("Match in:", self.field)
         match_layout.addLayout(form_layout_match)
         
         opts_layout = QHBoxLayout()
@@ -298,5 +360,6 @@ class FilterDialog(QDialog):
             "exclude": self.exclude.isChecked(),
             "bg_color": self.bg_color.currentText(),
             "text_color": self.text_color.currentText(),
-            "description": self.desc_input.text()
+            "description": self.desc_input.text(),
+            "field": self.field.currentData(),
         }
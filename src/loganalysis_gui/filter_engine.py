@@ -2,8 +2,15 @@ import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
 
+from .logcat import PRIORITY_ORDER, parse_threadtime
+
 _REGEX_CACHE: Dict[Tuple[str, bool], Pattern[str]] = {}
 
+# "line" matches anywhere in the raw line; the other fields match one part of a
+# parsed threadtime header and never match lines without one.
+FILTER_FIELDS = ("line", "tag", "level", "message", "pid")
+_UNPARSED = object()
+
 
 def get_compiled_regex(pattern: str, case_sensitive: bool) -> Pattern[str]:
     key = (pattern, case_sensitive)
@@ -13,11 +20,93 @@ def get_compiled_regex(pattern: str, case_sensitive: bool) -> Pattern[str]:
     return _REGEX_CACHE[key]
 
 
+def filter_field_error(filter_data: Dict[str, Any]) -> Optional[str]:
+    field = filter_data.get("field", "line")
+    text = filter_data.get("text", "").strip()
+    if field not in FILTER_FIELDS:
+        return f"unknown match field '{field}'"
+    if field == "level" and text.upper() not in PRIORITY_ORDER:
+        return "level filters need one of V, D, I, W, E, F or S"
+    if field == "pid" and not text.isdigit():
+        return "PID filters need a numeric process id"
+    return None
+
+
+def regex_error(pattern: str, case_sensitive: bool) -> Optional[str]:
+    """Return why ``pattern`` does not compile, or None."""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    try:
+        re.compile(pattern, flags)
+    except re.error as error:
+        return str(error)
+    return None
+
+
+def normalize_filter_data(filter_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``filter_data`` with every key a filter dict carries, defaults filled in."""
+    normalized = {
+        "text": filter_data.get("text", ""),
+        "case_sensitive": filter_data.get("case_sensitive", False),
+        "regex": filter_data.get("regex", False),
+        "exclude": filter_data.get("exclude", False),
+        "bg_color": filter_data.get("bg_color", "None"),
+        "text_color": filter_data.get("text_color", "None"),
+        "active": filter_data.get("active", True),
+        "description": filter_data.get("description", ""),
+        "field": filter_data.get("field", "line"),
+    }
+    if "total_matches" in filter_data:
+        normalized["total_matches"] = filter_data["total_matches"]
+    return normalized
+
+
+def validate_filters(loaded_filters: Sequence[Any]) -> Tuple[Optional[List[Dict[str, Any]]], List[str]]:
+    """Normalize loaded filter entries and describe the invalid ones.
+
+    Returns ``(None, [reason])`` when an entry is not a filter object at all.
+    """
+    normalized_filters = []
+    invalid_filters = []
+
+    for raw_filter in loaded_filters:
+        if not isinstance(raw_filter, dict):
+            return None, ["Each filter entry must be an object."]
+
+        filter_data = normalize_filter_data(raw_filter)
+        field_error = filter_field_error(filter_data)
+        if field_error:
+            invalid_filters.append(f"\"{filter_data['text']}\": {field_error}")
+        elif filter_data["regex"]:
+            error = regex_error(filter_data["text"], filter_data["case_sensitive"])
+            if error:
+                invalid_filters.append(f"\"{filter_data['text']}\": {error}")
+
+        normalized_filters.append(filter_data)
+
+    return normalized_filters, invalid_filters
+
+
+def parse_filter_set(loaded: Any) -> Tuple[Any, Optional[str], bool]:
+    """Split a saved filter file into ``(filters, name, enabled)``.
+
+    Accepts the ``{"name", "enabled", "filters"}`` object written by Save
+    Filters, a list holding such an object, or a bare list of filters.
+    """
+    if isinstance(loaded, dict):
+        return loaded.get("filters", []), loaded.get("name"), loaded.get("enabled", True)
+    if isinstance(loaded, list):
+        if len(loaded) > 0 and isinstance(loaded[0], dict) and "filters" in loaded[0]:
+            return loaded[0]["filters"], loaded[0].get("name"), True
+        return loaded, None, True
+    return [], None, True
+
+
 @dataclass(frozen=True)
 class PreparedFilter:
     filter_data: Dict[str, Any]
     original_index: int
     compiled_re: Optional[Pattern[str]] = None
+    field: str = "line"
 
 
 def prepare_filters(filters: Sequence[Dict[str, Any]]) -> List[PreparedFilter]:
@@ -35,16 +124,49 @@ def prepare_filters(filters: Sequence[Dict[str, Any]]) -> List[PreparedFilter]:
                 filter_data=filter_data,
                 original_index=index,
                 compiled_re=compiled_re,
+                field=filter_data.get("field", "line"),
             )
         )
     return prepared_filters
 
 
+def _header_field_matches(header, filter_data, compiled_re):
+    if header is None:
+        return False
+
+    field = filter_data.get("field", "line")
+    text = filter_data["text"]
+    if field == "level":
+        threshold = PRIORITY_ORDER.get(text.strip().upper())
+        return threshold is not None and PRIORITY_ORDER.get(header.priority, 0) >= threshold
+    if field == "pid":
+        return header.pid == text.strip()
+
+    value = header.tag if field == "tag" else header.message
+    if filter_data["regex"]:
+        regex = compiled_re
+        if regex is None:
+            regex = get_compiled_regex(text, filter_data["case_sensitive"])
+        return bool(regex.search(value))
+    if field == "tag":
+        # Exact and case-sensitive, like logcat filterspecs.
+        return value == text.strip()
+    if filter_data["case_sensitive"]:
+        return text in value
+    return text.lower() in value.lower()
+
+
 def filter_matches_line(
     line: str,
     filter_data: Dict[str, Any],
     compiled_re: Optional[Pattern[str]] = None,
+    header: Any = _UNPARSED,
 ) -> bool:
+    if filter_data.get("field", "line") != "line":
+        if header is _UNPARSED:
+            header = parse_threadtime(line)
+        return _header_field_matches(header, filter_data, compiled_re)
+
     if filter_data["regex"]:
         regex = compiled_re
         if regex is None:
@@ -61,11 +183,17 @@ def find_matching_filters(
     prepared_filters: Sequence[PreparedFilter],
 ) -> List[PreparedFilter]:
     matches = []
+    header = _UNPARSED
     for prepared_filter in prepared_filters:
+        # Parse the threadtime header at most once per line, and only when a
+        # field filter needs it.
+        if prepared_filter.field != "line" and header is _UNPARSED:
+            header = parse_threadtime(line)
         if filter_matches_line(
             line,
             prepared_filter.filter_data,
             prepared_filter.compiled_re,
+            header,
         ):
             matches.append(prepared_filter)
     return matches
@@ -84,3 +212,62 @@ def evaluate_line(
         return [], not show_only_filtered
 
     return matches, not matches[-1].filter_data["exclude"]
+
+
+# Above this many changed row runs a model reset is cheaper than replaying
+# every insert/remove through the view.
+MAX_VISIBLE_DIFF_RANGES = 64
+
+
+@dataclass(frozen=True)
+class VisibleDiff:
+    """Row changes that turn one ``visible_indices`` sequence into another.
+
+    ``removed`` holds ``(first_row, last_row)`` runs numbered against the old
+    rows and ``inserted`` holds ``(first_row, line_indices)`` runs numbered
+    against the new rows. Removing in reverse and then inserting in order
+    reproduces the new list. A ``None`` base stands for the rows a
+    progressive pass has published through ``partial_filtering``.
+    """
+
+    base: Optional[Sequence[int]]
+    base_count: int
+    removed: List[Tuple[int, int]]
+    inserted: List[Tuple[int, Sequence[int]]]
+
+
+def diff_visible_indices(
+    old: Sequence[int],
+    new: Sequence[int],
+    old_count: Optional[int] = None,
+    max_ranges: int = MAX_VISIBLE_DIFF_RANGES,
+) -> Optional[VisibleDiff]:
+    """Sorted-merge diff of two ascending index sequences.
+
+    Only the first ``old_count`` entries of ``old`` are compared, so a caller
+    can snapshot an array that live appends keep growing. Returns None as soon as
+    the change needs more than ``max_ranges`` runs.
+    """
+    old_count = len(old) if old_count is None else old_count
+    new_count = len(new)
+    removed = []
+    inserted = []
+    i = j = 0
+    while i < old_count or j < new_count:
+        if i < old_count and j < new_count and old[i] == new[j]:
+            i += 1
+            j += 1
+            continue
+        if j >= new_count or (i < old_count and old[i] < new[j]):
+            start = i
+            while i < old_count and (j >= new_count or old[i] < new[j]):
+                i += 1
+            removed.append((start, i - 1))
+        else:
+            start = j
+            while j < new_count and (i >= old_count or new[j] < old[i]):
+                j += 1
+            inserted.append((start, new[start:j]))
+        if len(removed) + len(inserted) > max_ranges:
+            return None
+    return VisibleDiff(old, old_count, removed, inserted)
@@ -0,0 +1,187 @@
+"""Per-line colors and in-line highlight spans for the log view.
+
+Everything here is Qt-free: ``HighlightWorker`` computes ``RowHighlight``
+entries off the UI thread and ``LogLineDelegate`` only looks them up in a
+``HighlightCache`` while painting.
+"""
+import re
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from itertools import compress, islice
+
+from .filter_engine import find_matching_filters, get_compiled_regex
+from .logcat import parse_threadtime
+
+# Span kind used for find/search matches; filter spans carry the filter's
+# original index instead.
+SEARCH_SPAN = -1
+HIGHLIGHT_CACHE_ROWS = 4096
+# Characters of context shown per Find All result.
+SNIPPET_CHARS = 160
+
+# ``background``/``foreground`` are filter color names (or None); ``matched``
+# is False for lines no filter matched, which the view draws dimmed. ``spans``
+# holds ``(start, end, kind)`` offsets into the display text, where ``kind``
+# is a filter's original index or SEARCH_SPAN.
+RowHighlight = namedtuple("RowHighlight", "background foreground matched spans")
+
+
+def filter_colors(matched_filters):
+    """Return the ``(background, foreground)`` color names for matched filter dicts.
+
+    The last non-exclude filter with a color wins; an exclude filter at the top
+    of the matches suppresses both colors.
+    """
+    background = None
+    foreground = None
+    for filter_data in reversed(matched_filters):
+        if filter_data["exclude"]:
+            return None, None
+        if background is None and filter_data["bg_color"] != "None":
+            background = filter_data["bg_color"]
+        if foreground is None and filter_data.get("text_color", "None") != "None":
+            foreground = filter_data["text_color"]
+        if background and foreground:
+            break
+    return background, foreground
+
+
+def search_pattern(query, case_sensitive, regex):
+    """Compile the find/search query the way ``LogModel`` matches it, or None."""
+    if not query:
+        return None
+    try:
+        return get_compiled_regex(query if regex else re.escape(query), case_sensitive)
+    except re.error:
+        return None
+
+
+def search_hit_block(lines, search_re):
+    """Return one byte per line, 1 where ``search_re`` matches, as ``LogModel.search_hits`` stores it."""
+    return bytearray(map(bool, map(search_re.search, lines)))
+
+
+def match_snippet(line, search_re=None, width=SNIPPET_CHARS):
+    """Return at most ``width`` characters of ``line`` around its first match."""
+    text = line.rstrip("\r\n")
+    if len(text) <= width:
+        return text
+    match = search_re.search(text) if search_re is not None else None
+    start = 0
+    if match is not None:
+        start = max(min(match.start() - width // 4, len(text) - width), 0)
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if start + width < len(text) else ""
+    return f"{prefix}{text[start:start + width]}{suffix}"
+
+
+def search_hit_rows(visible_indices, lines, search_re, search_hits=b"", start_row=0, stop_row=None):
+    """Return the rows in ``[start_row, stop_row)`` whose line is a find hit, as an ``array('I')``.
+
+    ``visible_indices`` is ascending, so the rows whose lines are already in
+    ``search_hits`` form a prefix that is looked up; only the rest are matched.
+    """
+    if stop_row is None:
+        stop_row = len(visible_indices)
+    split = max(min(bisect_left(visible_indices, len(search_hits), start_row, stop_row), stop_row), start_row)
+    rows = array("I", compress(
+        range(start_row, split),
+        map(search_hits.__getitem__, islice(visible_indices, start_row, split)),
+    ))
+    search = search_re.search
+    rows.extend(row for row in range(split, stop_row) if search(lines[visible_indices[row]]))
+    return rows
+
+
+def _filter_span_pattern(prepared_filter):
+    filter_data = prepared_filter.filter_data
+    if prepared_filter.compiled_re is not None:
+        return prepared_filter.compiled_re
+    text = filter_data["text"].strip() if prepared_filter.field == "tag" else filter_data["text"]
+    if not text:
+        return None
+    case_sensitive = filter_data["case_sensitive"] or prepared_filter.field == "tag"
+    return get_compiled_regex(re.escape(text), case_sensitive)
+
+
+def _pattern_spans(pattern, text, start, end, kind):
+    spans = []
+    for match in pattern.finditer(text, start, end):
+        if match.end() > match.start():
+            spans.append((match.start(), match.end(), kind))
+    return spans
+
+
+def compute_row_highlight(line, prepared_filters, search_re=None):
+    """Return the ``RowHighlight`` for one raw line.
+
+    Whole-line and message filters highlight every match, tag filters the tag
+    itself; level and PID filters only color the row.
+    """
+    text = line.rstrip("\r\n")
+    matches = find_matching_filters(line, prepared_filters)
+    background, foreground = filter_colors([matched.filter_data for matched in matches])
+
+    spans = []
+    header = None
+    for matched in matches:
+        if matched.filter_data["exclude"] or matched.field in ("level", "pid"):
+            continue
+        pattern = _filter_span_pattern(matched)
+        if pattern is None:
+            continue
+        start, end = 0, len(text)
+        if matched.field != "line":
+            header = header or parse_threadtime(line)
+            if header is None:
+                continue
+            if matched.field == "message":
+                start = len(text) - len(header.message)
+            else:
+                start = text.find(header.tag, 18)
+                end = start + len(header.tag)
+                if start < 0:
+                    continue
+        spans.extend(_pattern_spans(pattern, text, start, end, matched.original_index))
+    if search_re is not None:
+        spans.extend(_pattern_spans(search_re, text, 0, len(text), SEARCH_SPAN))
+    spans.sort()
+    return RowHighlight(background, foreground, bool(matches), spans)
+
+
+class HighlightCache:
+    """LRU of ``RowHighlight`` entries keyed by line index.
+
+    ``generation`` changes whenever the cached entries stop being valid
+    (filters, search or line numbering changed), so results computed for an
+    older generation can be dropped on arrival.
+    """
+
+    def __init__(self, capacity=HIGHLIGHT_CACHE_ROWS):
+        self.capacity = max(capacity, 1)
+        self.generation = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, line_index):
+        return line_index in self._entries
+
+    def get(self, line_index):
+        entry = self._entries.get(line_index)
+        if entry is not None:
+            self._entries.move_to_end(line_index)
+        return entry
+
+    def update(self, entries):
+        self._entries.update(entries)
+        for line_index in entries:
+            self._entries.move_to_end(line_index)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        self.generation += 1
+        self._entries.clear()
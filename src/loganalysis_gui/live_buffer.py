@@ -0,0 +1,123 @@
+import bisect
+import struct
+import tempfile
+from array import array
+
+from .constants import MAX_PENDING_MEMORY_LINES
+from .live_merge import source_column
+
+_SPILL_RECORD = struct.Struct("<IH")
+
+
+class PendingChunkBuffer:
+    """Holds live chunks that arrive while the log view is paused or refiltering.
+
+    The oldest ``memory_limit`` lines stay in memory. Once that budget is used,
+    every later line is appended to an anonymous temporary file so a long pause
+    on a busy device cannot grow the process without bound. Ordering is kept
+    because memory always holds the head of the queue and the spill file the tail.
+    Each line keeps the id of the live source it came from.
+    """
+
+    def __init__(self, memory_limit=MAX_PENDING_MEMORY_LINES):
+        self.memory_limit = max(memory_limit, 0)
+        self._memory_lines = []
+        self._memory_sources = array("H")
+        self._spill_file = None
+        # (first spilled line number, byte offset) for every spilled chunk, so a
+        # bounded drain can seek past lines that would be trimmed anyway.
+        self._spill_chunks = []
+        self.spilled_count = 0
+
+    @property
+    def buffered_count(self):
+        return len(self._memory_lines)
+
+    def __len__(self):
+        return len(self._memory_lines) + self.spilled_count
+
+    def append(self, lines, sources=None):
+        if not lines:
+            return
+        sources = source_column(sources, len(lines))
+
+        if self._spill_file is None:
+            room = self.memory_limit - len(self._memory_lines)
+            if len(lines) <= room:
+                self._memory_lines.extend(lines)
+                self._memory_sources.extend(sources)
+                return
+            if room > 0:
+                self._memory_lines.extend(lines[:room])
+                self._memory_sources.extend(sources[:room])
+                lines = lines[room:]
+                sources = sources[room:]
+
+        self._spill(lines, sources)
+
+    def _spill(self, lines, sources):
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="loganalysis-spill-")
+
+        payload = bytearray()
+        pack = _SPILL_RECORD.pack
+        for line, source_id in zip(lines, sources):
+            data = line.encode("utf-8", errors="replace")
+            payload += pack(len(data), source_id)
+            payload += data
+
+        self._spill_chunks.append((self.spilled_count, self._spill_file.tell()))
+        self._spill_file.write(payload)
+        self.spilled_count += len(lines)
+
+    def _read_spilled(self, skip, lines, sources):
+        chunk_pos = bisect.bisect_right(self._spill_chunks, (skip, float("inf"))) - 1
+        first_line, offset = self._spill_chunks[max(chunk_pos, 0)]
+        skip -= first_line
+
+        self._spill_file.flush()
+        self._spill_file.seek(offset)
+        data = self._spill_file.read()
+
+        unpack_from = _SPILL_RECORD.unpack_from
+        header_size = _SPILL_RECORD.size
+        position = 0
+        size = len(data)
+        while position < size:
+            length, source_id = unpack_from(data, position)
+            position += header_size
+            if skip > 0:
+                skip -= 1
+            else:
+                lines.append(data[position:position + length].decode("utf-8", errors="replace"))
+                sources.append(source_id)
+            position += length
+
+    def drain(self, max_lines=None):
+        """Return ``(lines, sources)`` for everything buffered and reset the buffer.
+
+        When ``max_lines`` is given only the newest ``max_lines`` lines are
+        returned; older spilled lines are skipped without being decoded.
+        """
+        total = len(self)
+        skip = 0
+        if max_lines is not None and total > max_lines:
+            skip = total - max(max_lines, 0)
+
+        memory_skip = min(skip, len(self._memory_lines))
+        lines = self._memory_lines[memory_skip:]
+        sources = self._memory_sources[memory_skip:]
+        if self._spill_file is not None:
+            self._read_spilled(skip - memory_skip, lines, sources)
+
+        self.clear()
+        return lines, sources
+
+    def clear(self):
+        self._memory_lines = []
+        self._memory_sources = array("H")
+        self._spill_chunks = []
+        self.spilled_count = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
@@ -0,0 +1,173 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from itertools import repeat
+from operator import itemgetter
+
+from .constants import LIVE_MERGE_HOLD_DRAINS
+
+# threadtime lines start with "MM-DD HH:MM:SS.mmm", which sorts lexicographically.
+_THREADTIME_STAMP_RE = re.compile(r"\d\d-\d\d \d\d:\d\d:\d\d\.\d{3}")
+THREADTIME_STAMP_LENGTH = 18
+LOGCAT_BANNER_PREFIX = "--------- "
+
+
+def source_column(sources, count):
+    """Normalize a per-line source argument (None, one id or a sequence) to an array."""
+    if sources is None:
+        sources = 0
+    if isinstance(sources, int):
+        return array("H", [sources]) * count
+    if isinstance(sources, array) and sources.typecode == "H":
+        return sources
+    return array("H", sources)
+
+
+def threadtime_sort_key(line):
+    if _THREADTIME_STAMP_RE.match(line):
+        return line[:THREADTIME_STAMP_LENGTH]
+    return None
+
+
+class RecentLineDeduper:
+    """Drops the lines a resumed ``logcat -T`` stream sends a second time.
+
+    Hashes of the most recent lines are kept in a bounded window. After
+    ``begin_resume`` incoming lines are matched against that window as a
+    multiset, so a line that legitimately repeats is only dropped as often as
+    it was already seen; the first unseen line ends the overlap. The
+    "--------- beginning of main" banner a restarted logcat prints before
+    the overlap is dropped without ending it.
+    """
+
+    def __init__(self, capacity=4096):
+        self._recent = deque(maxlen=capacity)
+        self._overlap = None
+
+    @property
+    def resuming(self):
+        return self._overlap is not None
+
+    def begin_resume(self):
+        self._overlap = Counter(self._recent)
+
+    def filter(self, lines):
+        overlap = self._overlap
+        if overlap is not None:
+            skipped = 0
+            for line in lines:
+                key = hash(line)
+                if not overlap.get(key):
+                    if line.startswith(LOGCAT_BANNER_PREFIX):
+                        skipped += 1
+                        continue
+                    self._overlap = None
+                    break
+                overlap[key] -= 1
+                skipped += 1
+            if skipped:
+                lines = lines[skipped:]
+        self._recent.extend(map(hash, lines))
+        return lines
+
+
+class LiveStreamMerger:
+    """Collects chunks from several live sources and merges them by timestamp.
+
+    Each source is already in timestamp order, so merging is a k-way merge of
+    the per-source queues. ``release`` only hands out lines up to a watermark,
+    the oldest "latest timestamp" among the recently active sources: a line
+    past it could still be preceded by one a slower device has yet to deliver.
+    That keeps the order across drains, not only within one. A source that sent
+    nothing for ``hold_drains`` releases stops holding the others back, and a
+    line waiting longer than that is released whatever the watermark says, so
+    an idle device or one whose clock runs behind the others costs at most that
+    many intervals of latency. ``drain`` hands out everything, for when the
+    streams have stopped.
+    """
+
+    def __init__(self, hold_drains=LIVE_MERGE_HOLD_DRAINS):
+        self.hold_drains = hold_drains
+        # source id -> ([sort key], [line], release count when each line was
+        # pushed); unstamped lines take the key of the line before them so
+        # they stay glued to it.
+        self._queues = {}
+        # source id -> (latest sort key, release count when it was pushed)
+        self._latest = {}
+        self._releases = 0
+        self._pending_count = 0
+
+    def __len__(self):
+        return self._pending_count
+
+    def push(self, source_id, lines):
+        if not lines:
+            return
+        keys, queued, arrivals = self._queues.setdefault(source_id, ([], [], array("I")))
+        last_key = self._latest.get(source_id, ("", 0))[0]
+        for line in lines:
+            key = threadtime_sort_key(line)
+            if key is None:
+                key = last_key
+            else:
+                last_key = key
+            keys.append(key)
+        queued.extend(lines)
+        arrivals.extend(array("I", [self._releases]) * len(lines))
+        self._latest[source_id] = (last_key, self._releases)
+        self._pending_count += len(lines)
+
+    def release(self):
+        """Return ``(lines, sources)`` for the pending lines no source can still precede."""
+        self._releases += 1
+        if len(self._latest) < 2:
+            return self.drain()
+        overdue = self._releases - self.hold_drains
+        active = [key for key, pushed_at in self._latest.values() if pushed_at >= overdue]
+        # Device clocks are independent; skew must not hold lines back forever.
+        return self._take(min(active) if active else None, overdue)
+
+    def drain(self):
+        """Return ``(lines, sources)`` with every pending line in timestamp order."""
+        return self._take(None)
+
+    def _take(self, watermark, overdue=0):
+        released = {}
+        for source_id, (keys, queued, arrivals) in list(self._queues.items()):
+            if watermark is None:
+                count = len(keys)
+            else:
+                count = max(bisect_right(keys, watermark), bisect_left(arrivals, overdue))
+            if not count:
+                continue
+            released[source_id] = (keys[:count], queued[:count])
+            if count == len(keys):
+                del self._queues[source_id]
+            else:
+                del keys[:count]
+                del queued[:count]
+                del arrivals[:count]
+            self._pending_count -= count
+
+        if len(released) == 1:
+            ((source_id, (_keys, lines)),) = released.items()
+            return lines, source_column(source_id, len(lines))
+
+        lines = []
+        sources = array("H")
+        merged = heapq.merge(
+            *(zip(keys, repeat(source_id), queued) for source_id, (keys, queued) in released.items()),
+            key=itemgetter(0),
+        )
+        for _key, source_id, line in merged:
+            lines.append(line)
+            sources.append(source_id)
+        return lines, sources
+
+    def clear(self):
+        self._queues = {}
+        self._latest = {}
+        self._releases = 0
+        self._pending_count = 0
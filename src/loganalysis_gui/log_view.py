@@ -0,0 +1,222 @@
+from PyQt5.QtCore import QItemSelection, QModelIndex, QRect
+from PyQt5.QtGui import QFontMetrics, QPainter, QRegion
+from PyQt5.QtWidgets import QAbstractItemView, QStyle
+
+# Content width used before the viewport has a size.
+DEFAULT_CONTENT_WIDTH = 400
+ROW_PADDING = 2
+# Pixel offsets handed to QAbstractItemView stay well inside int32 even when
+# the row count times the row height does not.
+_MAX_PIXEL_OFFSET = 1 << 30
+
+
+class LogView(QAbstractItemView):
+    """Single-column viewport that paints only the rows on screen.
+
+    Every row has the same height, taken from the model font, so row
+    positions are arithmetic and there is no per-row layout. The vertical
+    scroll bar counts rows rather than pixels, which keeps 100M+ row logs
+    inside its int range; the horizontal scroll bar is pixel-precise over
+    ``contentWidth()``. Selection, the current index, keyboard navigation and
+    context menus come from QAbstractItemView.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._content_width = DEFAULT_CONTENT_WIDTH
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerItem)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+    def setModel(self, model):
+        previous = self.model()
+        if previous is not None:
+            for signal in (previous.rowsInserted, previous.rowsRemoved):
+                signal.disconnect(self._rows_changed)
+            for signal in (previous.modelReset, previous.layoutChanged):
+                signal.disconnect(self._layout_changed)
+        super().setModel(model)
+        if model is not None:
+            for signal in (model.rowsInserted, model.rowsRemoved):
+                signal.connect(self._rows_changed)
+            for signal in (model.modelReset, model.layoutChanged):
+                signal.connect(self._layout_changed)
+        self._layout_changed()
+
+    def _rows_changed(self, *_args):
+        self._layout_changed()
+
+    def _layout_changed(self, *_args):
+        self.updateGeometries()
+        self.viewport().update()
+
+    # Geometry
+
+    def rowHeight(self):
+        font = getattr(self.model(), "font", None) or self.font()
+        return max(QFontMetrics(font).height(), 1) + ROW_PADDING
+
+    def _row_count(self):
+        model = self.model()
+        return model.rowCount() if model is not None else 0
+
+    def _page_rows(self):
+        return max(self.viewport().height() // self.rowHeight(), 1)
+
+    def _top_row(self):
+        return self.verticalScrollBar().value()
+
+    def contentWidth(self):
+        return self._content_width
+
+    def setContentWidth(self, width):
+        if width != self._content_width:
+            self._content_width = width
+            self.updateGeometries()
+            self.viewport().update()
+
+    def updateGeometries(self):
+        page = self._page_rows()
+        vertical = self.verticalScrollBar()
+        vertical.setSingleStep(1)
+        vertical.setPageStep(page)
+        vertical.setRange(0, max(self._row_count() - page, 0))
+
+        horizontal = self.horizontalScrollBar()
+        viewport_width = self.viewport().width()
+        horizontal.setSingleStep(max(QFontMetrics(self.font()).averageCharWidth() * 2, 1))
+        horizontal.setPageStep(max(viewport_width, 1))
+        horizontal.setRange(0, max(self._content_width - viewport_width, 0))
+        super().updateGeometries()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.updateGeometries()
+
+    def scrollContentsBy(self, dx, dy):
+        # Offsets are rows vertically, so nothing can be blitted.
+        self.viewport().update()
+
+    def horizontalOffset(self):
+        return self.horizontalScrollBar().value()
+
+    def verticalOffset(self):
+        return min(self._top_row() * self.rowHeight(), _MAX_PIXEL_OFFSET)
+
+    def _row_at_y(self, y):
+        return self._top_row() + y // self.rowHeight()
+
+    def _row_rect(self, row):
+        row_height = self.rowHeight()
+        y = (row - self._top_row()) * row_height
+        y = max(min(y, _MAX_PIXEL_OFFSET), -_MAX_PIXEL_OFFSET)
+        width = max(self._content_width, self.viewport().width())
+        return QRect(-self.horizontalOffset(), y, width, row_height)
+
+    def visualRect(self, index):
+        if not index.isValid():
+            return QRect()
+        return self._row_rect(index.row())
+
+    def indexAt(self, point):
+        row = self._row_at_y(point.y())
+        if 0 <= row < self._row_count():
+            return self.model().index(row, 0)
+        return QModelIndex()
+
+    def scrollTo(self, index, hint=QAbstractItemView.EnsureVisible):
+        if not index.isValid():
+            return
+        row = index.row()
+        top = self._top_row()
+        page = self._page_rows()
+        if hint == QAbstractItemView.PositionAtTop:
+            top = row
+        elif hint == QAbstractItemView.PositionAtBottom:
+            top = row - page + 1
+        elif hint == QAbstractItemView.PositionAtCenter:
+            top = row - page // 2
+        elif row < top:
+            top = row
+        elif row >= top + page:
+            top = row - page + 1
+        self.verticalScrollBar().setValue(max(top, 0))
+
+    def moveCursor(self, cursor_action, modifiers):
+        row_count = self._row_count()
+        if row_count == 0:
+            return QModelIndex()
+        current = self.currentIndex()
+        row = current.row() if current.isValid() else self._top_row()
+        page = self._page_rows()
+        if cursor_action == QAbstractItemView.MoveUp or cursor_action == QAbstractItemView.MovePrevious:
+            row -= 1
+        elif cursor_action == QAbstractItemView.MoveDown or cursor_action == QAbstractItemView.MoveNext:
+            row += 1
+        elif cursor_action == QAbstractItemView.MovePageUp:
+            row -= page
+        elif cursor_action == QAbstractItemView.MovePageDown:
+            row += page
+        elif cursor_action == QAbstractItemView.MoveHome:
+            row = 0
+        elif cursor_action == QAbstractItemView.MoveEnd:
+            row = row_count - 1
+        return self.model().index(max(min(row, row_count - 1), 0), 0)
+
+    def isIndexHidden(self, index):
+        return False
+
+    # Selection
+
+    def setSelection(self, rect, command):
+        row_count = self._row_count()
+        if row_count == 0:
+            return
+        first_row = max(min(self._row_at_y(rect.top()), row_count - 1), 0)
+        last_row = max(min(self._row_at_y(rect.bottom()), row_count - 1), 0)
+        model = self.model()
+        self.selectionModel().select(
+            QItemSelection(model.index(min(first_row, last_row), 0), model.index(max(first_row, last_row), 0)),
+            command,
+        )
+
+    def visualRegionForSelection(self, selection):
+        region = QRegion()
+        top = self._top_row()
+        bottom = top + self._page_rows()
+        for selection_range in selection:
+            first_row = max(selection_range.top(), top)
+            last_row = min(selection_range.bottom(), bottom)
+            if first_row <= last_row:
+                region += self._row_rect(first_row).united(self._row_rect(last_row))
+        return region
+
+    # Painting
+
+    def paintEvent(self, event):
+        model = self.model()
+        if model is None:
+            return
+        row_count = model.rowCount()
+        top = self._top_row()
+        last_row = min(top + self._page_rows(), row_count - 1)
+        if last_row < top:
+            return
+
+        painter = QPainter(self.viewport())
+        delegate = self.itemDelegate()
+        selection = self.selectionModel()
+        current = self.currentIndex()
+        option = self.viewOptions()
+        base_state = option.state
+        root = self.rootIndex()
+        for row in range(top, last_row + 1):
+            index = model.index(row, 0)
+            option.rect = self._row_rect(row)
+            option.state = base_state
+            if selection is not None and selection.isRowSelected(row, root):
+                option.state |= QStyle.State_Selected
+            if current.isValid() and current.row() == row and self.hasFocus():
+                option.state |= QStyle.State_HasFocus
+            delegate.paint(painter, option, index)
+        painter.end()
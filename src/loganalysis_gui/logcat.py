@@ -0,0 +1,298 @@
+import re
+import struct
+import time
+from collections import namedtuple
+
+# android/log.h priorities; 0 (unknown) and 1 (default) never reach the reader.
+PRIORITY_LETTERS = {2: "V", 3: "D", 4: "I", 5: "W", 6: "E", 7: "F", 8: "S"}
+PRIORITY_ORDER = {"V": 2, "D": 3, "I": 4, "W": 5, "E": 6, "F": 7, "A": 7, "S": 8}
+
+_THREADTIME_HEADER_RE = re.compile(
+    r"(\d\d-\d\d \d\d:\d\d:\d\d\.\d+)\s+(\d+)\s+(\d+)\s+([VDIWEFAS])\s+(.*?)\s*: "
+)
+# Characters that carry meaning in logcat's ECMAScript -e regex.
+_ECMASCRIPT_SPECIAL = set("\\^$.|?*+()[]{}/")
+
+ThreadtimeHeader = namedtuple("ThreadtimeHeader", "timestamp pid tid priority tag message")
+
+# struct logger_entry: every version starts with len/hdr_size followed by
+# pid/tid/sec/nsec. v1 stores padding in hdr_size and has a fixed 20 byte header.
+_ENTRY_PREFIX = struct.Struct("<HH")
+_ENTRY_FIELDS = struct.Struct("<iIII")
+LOGGER_ENTRY_V1_HEADER_SIZE = 20
+
+# Event payload type bytes from android/log.h (EVENT_TYPE_*).
+EVENT_TYPE_INT = 0
+EVENT_TYPE_LONG = 1
+EVENT_TYPE_STRING = 2
+EVENT_TYPE_LIST = 3
+EVENT_TYPE_FLOAT = 4
+_EVENT_INT = struct.Struct("<i")
+_EVENT_LONG = struct.Struct("<q")
+_EVENT_FLOAT = struct.Struct("<f")
+EVENT_LOG_PRIORITY = 4
+
+
+class LogcatRecords:
+    """Columnar batch of decoded logger entries.
+
+    Text is only rendered when a consumer asks for it, so callers that need the
+    raw fields (timestamps for merging, pid/tag for filtering) never pay for
+    formatting.
+    """
+
+    __slots__ = ("seconds", "nanoseconds", "pids", "tids", "priorities", "tags", "messages")
+
+    def __init__(self):
+        self.seconds = []
+        self.nanoseconds = []
+        self.pids = []
+        self.tids = []
+        self.priorities = []
+        self.tags = []
+        self.messages = []
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def last_epoch_time(self):
+        """Return the newest entry's time as ``logcat -T`` epoch text (``<sec>.<msec>``), or None.
+
+        Unlike the rendered threadtime stamp it does not depend on the host's
+        timezone, so a device reads it back as the same instant.
+        """
+        if not self.seconds:
+            return None
+        return f"{self.seconds[-1]}.{self.nanoseconds[-1] // 1000000:03d}"
+
+    def render_threadtime(self):
+        """Render the batch exactly like ``logcat -v threadtime`` would."""
+        lines = []
+        last_second = None
+        second_text = ""
+        for sec, nsec, pid, tid, priority, tag, message in zip(
+            self.seconds,
+            self.nanoseconds,
+            self.pids,
+            self.tids,
+            self.priorities,
+            self.tags,
+            self.messages,
+        ):
+            if sec != last_second:
+                last_second = sec
+                second_text = time.strftime("%m-%d %H:%M:%S", time.localtime(sec))
+            prefix = (
+                f"{second_text}.{nsec // 1000000:03d} {pid:5d} {tid:5d} "
+                f"{PRIORITY_LETTERS.get(priority, '?')} {tag:<8}: "
+            )
+            # logcat prints one output line per message line, each with the header.
+            for message_line in message.split("\n"):
+                lines.append(f"{prefix}{message_line}\n")
+        return lines
+
+
+def parse_event_log_tags(text):
+    """Map event tag numbers to names from an ``event-log-tags`` file."""
+    tags = {}
+    for line in text.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) >= 2 and parts[0].isdigit():
+            tags[int(parts[0])] = parts[1]
+    return tags
+
+
+def _decode_event_value(payload, offset):
+    event_type = payload[offset]
+    offset += 1
+    if event_type == EVENT_TYPE_INT:
+        return str(_EVENT_INT.unpack_from(payload, offset)[0]), offset + 4
+    if event_type == EVENT_TYPE_LONG:
+        return str(_EVENT_LONG.unpack_from(payload, offset)[0]), offset + 8
+    if event_type == EVENT_TYPE_FLOAT:
+        return f"{_EVENT_FLOAT.unpack_from(payload, offset)[0]:g}", offset + 4
+    if event_type == EVENT_TYPE_STRING:
+        (length,) = _EVENT_INT.unpack_from(payload, offset)
+        offset += 4
+        return payload[offset:offset + length].decode("utf-8", errors="replace"), offset + length
+    if event_type == EVENT_TYPE_LIST:
+        count = payload[offset]
+        offset += 1
+        values = []
+        for _ in range(count):
+            value, offset = _decode_event_value(payload, offset)
+            values.append(value)
+        return f"[{','.join(values)}]", offset
+    raise ValueError(f"Unknown event type: {event_type}")
+
+
+def decode_event_payload(payload):
+    """Return ``(tag number, text)`` for a binary events-buffer payload."""
+    (tag_number,) = _EVENT_INT.unpack_from(payload, 0)
+    if len(payload) <= 4:
+        return tag_number, ""
+    try:
+        text, _offset = _decode_event_value(payload, 4)
+    except (ValueError, IndexError, struct.error):
+        text = payload[4:].hex()
+    return tag_number, text
+
+
+class BinaryLogcatDecoder:
+    """Incrementally decodes the ``logcat -B`` logger_entry stream.
+
+    ``feed`` accepts arbitrary byte chunks; a trailing partial entry is kept
+    until the next chunk completes it. Entries from the binary ``events``
+    buffer carry a tag number and typed values instead of text; pass
+    ``event_tags`` (tag number -> name) to decode them.
+    """
+
+    def __init__(self, event_tags=None):
+        self._pending = b""
+        self.event_tags = event_tags
+
+    @property
+    def pending_bytes(self):
+        return len(self._pending)
+
+    def feed(self, data):
+        buffer = self._pending + data if self._pending else data
+        records = LogcatRecords()
+        seconds = records.seconds
+        nanoseconds = records.nanoseconds
+        pids = records.pids
+        tids = records.tids
+        priorities = records.priorities
+        tags = records.tags
+        messages = records.messages
+
+        event_tags = self.event_tags
+        unpack_prefix = _ENTRY_PREFIX.unpack_from
+        unpack_fields = _ENTRY_FIELDS.unpack_from
+        offset = 0
+        size = len(buffer)
+        while size - offset >= LOGGER_ENTRY_V1_HEADER_SIZE:
+            payload_size, header_size = unpack_prefix(buffer, offset)
+            if header_size == 0:
+                header_size = LOGGER_ENTRY_V1_HEADER_SIZE
+            elif header_size < LOGGER_ENTRY_V1_HEADER_SIZE:
+                raise ValueError(f"Invalid logger_entry header size: {header_size}")
+
+            entry_end = offset + header_size + payload_size
+            if entry_end > size:
+                break
+
+            pid, tid, sec, nsec = unpack_fields(buffer, offset + 4)
+            payload = buffer[offset + header_size:entry_end]
+            offset = entry_end
+
+            if event_tags is not None:
+                if len(payload) < 4:
+                    continue
+                tag_number, text = decode_event_payload(payload)
+                seconds.append(sec)
+                nanoseconds.append(nsec)
+                pids.append(pid)
+                tids.append(tid)
+                priorities.append(EVENT_LOG_PRIORITY)
+                tags.append(event_tags.get(tag_number) or str(tag_number))
+                messages.append(text)
+                continue
+
+            # Payload layout: priority byte, NUL-terminated tag, NUL-terminated message.
+            tag_end = payload.find(b"\0", 1)
+            if tag_end < 0:
+                tag_end = len(payload)
+            message_end = payload.find(b"\0", tag_end + 1)
+            if message_end < 0:
+                message_end = len(payload)
+
+            seconds.append(sec)
+            nanoseconds.append(nsec)
+            pids.append(pid)
+            tids.append(tid)
+            priorities.append(payload[0] if payload else 0)
+            tags.append(payload[1:tag_end].decode("utf-8", errors="replace"))
+            messages.append(
+                payload[tag_end + 1:message_end].decode("utf-8", errors="replace").rstrip("\n")
+            )
+
+        self._pending = buffer[offset:]
+        return records
+
+
+def parse_threadtime(line):
+    """Split a ``-v threadtime`` line into its fields, or return None."""
+    match = _THREADTIME_HEADER_RE.match(line)
+    if match is None:
+        return None
+    timestamp, pid, tid, priority, tag = match.groups()
+    return ThreadtimeHeader(timestamp, pid, tid, priority, tag, line[match.end():].rstrip("\r\n"))
+
+
+def _ecmascript_literal(text, case_sensitive):
+    parts = []
+    for char in text:
+        if char in _ECMASCRIPT_SPECIAL:
+            parts.append("\\" + char)
+        elif not case_sensitive and char.isalpha() and char.lower() != char.upper():
+            parts.append(f"[{char.lower()}{char.upper()}]")
+        else:
+            parts.append(char)
+    return "".join(parts)
+
+
+def logcat_filter_args(filters, show_only_filtered):
+    """Translate filters into logcat arguments that pre-select lines on the device.
+
+    Arguments are only returned when every line that could be visible locally
+    is guaranteed to pass them, so the local filter pass (which still runs)
+    gives exact results. Exclude filters only hide lines and are ignored here.
+    """
+    if not show_only_filtered:
+        return []
+
+    includes = [
+        filter_data
+        for filter_data in filters
+        if filter_data.get("active", True) and not filter_data.get("exclude", False)
+    ]
+    if not includes:
+        return []
+
+    fields = {filter_data.get("field", "line") for filter_data in includes}
+    if fields <= {"tag", "level"}:
+        # "TAG:V" keeps every line of TAG and "*:E" every line at E or above, so
+        # listing them together is exactly the union of the filters.
+        specs = []
+        min_level = None
+        for filter_data in includes:
+            text = filter_data["text"].strip()
+            if filter_data.get("field") == "tag":
+                if filter_data["regex"] or not text or any(c.isspace() or c == ":" for c in text):
+                    return []
+                specs.append(f"{text}:V")
+            else:
+                level = "F" if text.upper() == "A" else text.upper()
+                if level not in PRIORITY_ORDER:
+                    return []
+                if min_level is None or PRIORITY_ORDER[level] < PRIORITY_ORDER[min_level]:
+                    min_level = level
+        specs.append(f"*:{min_level}" if min_level else "*:S")
+        return list(dict.fromkeys(specs))
+
+    if fields == {"message"}:
+        if any(filter_data["regex"] for filter_data in includes):
+            return []
+        patterns = [
+            _ecmascript_literal(filter_data["text"], filter_data["case_sensitive"])
+            for filter_data in includes
+        ]
+        return ["-e", "|".join(dict.fromkeys(patterns))]
+
+    if fields == {"pid"} and len(includes) == 1:
+        pid = includes[0]["text"].strip()
+        if pid.isdigit():
+            return [f"--pid={pid}"]
+
+    return []
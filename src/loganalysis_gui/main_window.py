@@ -1,24 +1,45 @@
-import re
 import json
 import bisect
 import os
-import subprocess
+import time
+from dataclasses import replace
 from PyQt5.QtWidgets import (
     QMainWindow, QAction, QFileDialog, QStatusBar,
     QVBoxLayout, QWidget, QLineEdit, QCheckBox, 
     QPushButton, QLabel, QHBoxLayout, QListWidget, QSplitter, 
-    QListWidgetItem, QTabWidget, QMessageBox, QInputDialog, QTreeView,
+    QListWidgetItem, QTabWidget, QMessageBox, QInputDialog,
     QAbstractItemView, QToolBar, QStyle, QGroupBox, QFormLayout, QMenu,
-    QHeaderView, QTabBar, QApplication, QProgressBar, QComboBox
+    QTabBar, QApplication, QProgressBar, QComboBox, QToolButton,
+    QDockWidget, QPlainTextEdit, QListView
 )
-from PyQt5.QtGui import QColor, QFontMetrics
-from PyQt5.QtCore import Qt
-
-from .constants import COLOR_MAP, TEXT_COLOR_MAP, DARK_STYLESHEET, MAX_MONITOR_LINES
-from .workers import AdbWorker, FileLoadWorker, FilterWorker
-from .models import LogModel
+from PyQt5.QtGui import QColor, QFontDatabase, QFontMetrics
+from PyQt5.QtCore import QPoint, Qt, QTimer
+
+from .constants import (
+    COLOR_MAP, TEXT_COLOR_MAP, DARK_STYLESHEET, MAX_MONITOR_LINES,
+    LIVE_MERGE_INTERVAL_MS, ALL_DEVICES_LABEL, REPLAY_PACE_CHOICES, LOGCAT_BUFFERS,
+    DEFAULT_LOGCAT_BUFFERS, COLUMN_WIDTH_UPDATE_INTERVAL_MS, HIGHLIGHT_PASS_DELAY_MS,
+    FIND_INDEX_BACKGROUND_ROWS, COPY_BACKGROUND_ROWS, COPY_CLIPBOARD_MAX_ROWS
+)
+from .filter_engine import normalize_filter_data, parse_filter_set, regex_error, validate_filters
+from .logcat import logcat_filter_args
+from .recorder import RecordedSessionLines, SessionRecorder
+from .trigram_index import search_trigrams
+from .telemetry import (
+    METRIC_APPEND, METRIC_APPLY, METRIC_DROPPED, METRIC_QUEUE_DEPTH, METRIC_TRIMMED,
+    format_report, format_status
+)
+from .workers import (
+    AdbWorker, CopyTextWorker, DeviceWatcher, ExportWorker, FileLoadWorker, FilterWorker, FindIndexWorker, HighlightWorker, ReplayWorker,
+    SearchWorker, TrigramIndexWorker,
+)
+from .models import FindResultsModel, LogModel, display_lines_text, visible_index_array
+from .row_selection import RowSelection
+from .log_view import DEFAULT_CONTENT_WIDTH, LogView
+from .delegate import LogLineDelegate
+from .highlight import HighlightCache, search_hit_rows
 from .dialogs import FindDialog, FilterDialog
-from .widgets import FilterItemWidget, describe_filter_text
+from .widgets import FilterItemWidget, TextWidthCache, describe_filter_text
 from .window_state import FilterTabState, MainWindowRuntimeState
 
 class LogAnalysisMainWindow(QMainWindow):
@@ -38,18 +59,32 @@ class LogAnalysisMainWindow(QMainWindow):
         self.loaded_file_label = QLabel()
         self.loaded_file_label.setVisible(False)
         self.status_bar.addPermanentWidget(self.loaded_file_label)
+        self.live_buffer_label = QLabel()
+        self.live_buffer_label.setVisible(False)
+        self.live_buffer_label.setToolTip("Live lines held back while paused or refiltering")
+        self.status_bar.addPermanentWidget(self.live_buffer_label)
+        self.telemetry_label = QLabel()
+        self.telemetry_label.setVisible(False)
+        self.telemetry_label.setToolTip("Live ingest telemetry over the last few seconds")
+        self.status_bar.addPermanentWidget(self.telemetry_label)
         self.file_load_progress = QProgressBar()
         self.file_load_progress.setVisible(False)
         self.file_load_progress.setFixedWidth(150)
         self.file_load_progress.setTextVisible(True)
         self.file_load_progress.setFormat("%p%")
         self.status_bar.addPermanentWidget(self.file_load_progress)
+        self.export_progress = QProgressBar()
+        self.export_progress.setVisible(False)
+        self.export_progress.setFixedWidth(150)
+        self.export_progress.setFormat("Export %p%")
+        self.status_bar.addPermanentWidget(self.export_progress)
         
         self.create_menu()
         self.init_ui()
         
         self.filter_thread = None
-        self.adb_thread = None
+        self.adb_threads = []
+        self.retired_adb_threads = []
         self.file_load_thread = None
         self.runtime = MainWindowRuntimeState()
         
@@ -65,6 +100,19 @@ class LogAnalysisMainWindow(QMainWindow):
         open_action.setShortcut("Ctrl+O")
         open_action.triggered.connect(self.open_file)
         file_menu.addAction(open_action)
+
+        open_session_action = QAction("Open Recorded Session...", self)
+        open_session_action.triggered.connect(self.open_recorded_session)
+        file_menu.addAction(open_session_action)
+
+        export_action = QAction("Export Visible Lines...", self)
+        export_action.setShortcut("Ctrl+E")
+        export_action.triggered.connect(self.export_visible_lines)
+        file_menu.addAction(export_action)
+        self.cancel_export_action = QAction("Cancel Export", self)
+        self.cancel_export_action.setEnabled(False)
+        self.cancel_export_action.triggered.connect(self.cancel_export)
+        file_menu.addAction(self.cancel_export_action)
         
         load_filters_action = QAction(style.standardIcon(QStyle.SP_DirOpenIcon), "Load Filters", self)
         load_filters_action.setShortcut("Ctrl+L")
@@ -104,6 +152,13 @@ class LogAnalysisMainWindow(QMainWindow):
         find_action.triggered.connect(self.show_find_dialog)
         edit_menu.addAction(find_action)
 
+        self.search_index_action = QAction("Index Loaded Files for Search", self, checkable=True)
+        self.search_index_action.setToolTip(
+            "Build a trigram index of opened files (saved next to them) so find and text filters only check candidate lines"
+        )
+        self.search_index_action.toggled.connect(self._set_search_index_enabled)
+        edit_menu.addAction(self.search_index_action)
+
         edit_menu.addSeparator()
         copy_action = QAction("Copy", self)
         copy_action.setShortcut("Ctrl+C")
@@ -128,6 +183,7 @@ class LogAnalysisMainWindow(QMainWindow):
         self.full_line_display_action.setChecked(self.full_line_display_enabled)
         self.full_line_display_action.toggled.connect(self.toggle_full_line_display)
         view_menu.addAction(self.full_line_display_action)
+        self.view_menu = view_menu
         
         view_menu.addSeparator()
         zoom_in_action = QAction("Zoom In", self)
@@ -162,6 +218,42 @@ class LogAnalysisMainWindow(QMainWindow):
         self.pause_action.setEnabled(False) 
         monitor_menu.addAction(self.pause_action)
 
+        replay_action = QAction(style.standardIcon(QStyle.SP_MediaPlay), "Replay Log File...", self)
+        replay_action.setToolTip("Stream a recorded log through the live path at a chosen pace")
+        replay_action.triggered.connect(self.start_replay)
+        monitor_menu.addAction(replay_action)
+
+        monitor_menu.addSeparator()
+        self.binary_logcat_action = QAction("Binary Transport (logcat -B)", self, checkable=True)
+        self.binary_logcat_action.setToolTip(
+            "Stream binary log entries and decode them locally instead of device-formatted text"
+        )
+        monitor_menu.addAction(self.binary_logcat_action)
+
+        # Checked buffers are read by one logcat per device (see _selected_logcat_buffers).
+        buffers_menu = monitor_menu.addMenu("Buffers")
+        self.buffer_actions = {}
+        for buffer in LOGCAT_BUFFERS:
+            action = QAction(buffer, self, checkable=True)
+            action.setChecked(buffer in DEFAULT_LOGCAT_BUFFERS)
+            buffers_menu.addAction(action)
+            self.buffer_actions[buffer] = action
+
+        self.device_filter_action = QAction("Device-Side Filtering", self, checkable=True)
+        self.device_filter_action.setChecked(True)
+        self.device_filter_action.setToolTip(
+            "Let logcat drop lines that no include filter can show before they are sent"
+        )
+        self.device_filter_action.toggled.connect(self._update_logcat_pushdown)
+        monitor_menu.addAction(self.device_filter_action)
+
+        self.record_sessions_action = QAction("Record Live Sessions...", self, checkable=True)
+        self.record_sessions_action.setToolTip(
+            "Write every live line to compressed segments on disk, including lines later trimmed from the view"
+        )
+        self.record_sessions_action.toggled.connect(self._set_session_recording)
+        monitor_menu.addAction(self.record_sessions_action)
+
         # Tabs menu
         tabs_menu = menubar.addMenu("Tabs")
         add_tab_action = QAction(style.standardIcon(QStyle.SP_FileDialogNewFolder), "Add Tab", self)
@@ -223,6 +315,9 @@ class LogAnalysisMainWindow(QMainWindow):
         self.device_selector = QComboBox()
         self.device_selector.setFixedWidth(130)
         self.device_selector.setToolTip("Target ADB Device Serial")
+        self.device_selector.addItem("Scanning...")
+        self.device_selector.setEnabled(False)
+        self.discovered_devices = []
 
         self.btn_refresh_devices = QPushButton()
         self.btn_refresh_devices.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
@@ -233,6 +328,19 @@ class LogAnalysisMainWindow(QMainWindow):
         self.quick_filter_toolbar.addWidget(self.device_selector)
         self.quick_filter_toolbar.addWidget(self.btn_refresh_devices)
 
+        self.source_filter_button = QToolButton()
+        self.source_filter_button.setText("Sources")
+        self.source_filter_button.setToolTip("Show or hide lines from each live source")
+        self.source_filter_button.setPopupMode(QToolButton.InstantPopup)
+        self.source_filter_button.setMenu(QMenu(self.source_filter_button))
+        self.source_filter_button.setEnabled(False)
+        self.quick_filter_toolbar.addWidget(self.source_filter_button)
+
+        self.live_merge_timer = QTimer(self)
+        self.live_merge_timer.setSingleShot(True)
+        self.live_merge_timer.setInterval(LIVE_MERGE_INTERVAL_MS)
+        self.live_merge_timer.timeout.connect(self._drain_live_merger)
+
         self.quick_filter_toolbar.addSeparator()
         # Add Monitor Actions to Toolbar
         self.quick_filter_toolbar.addAction(self.adb_monitor_action)
@@ -245,21 +353,50 @@ class LogAnalysisMainWindow(QMainWindow):
         self.quick_filter_toolbar.addWidget(self.btn_clear)
         
         # Main Layout
-        self.log_view = QTreeView()
-        self.log_view.setUniformRowHeights(True) 
+        self.log_view = LogView()
         self.log_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.log_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.log_view.setHeaderHidden(True)
-        self.log_view.setRootIsDecorated(False)
         self.log_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.log_view.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
-        self.log_view.header().setStretchLastSection(False)
-        self.log_view.header().setSectionResizeMode(QHeaderView.Interactive)
-        self.log_view.header().setDefaultSectionSize(400) 
+
+        self.text_width_cache = TextWidthCache()
+        # Trailing resize for live appends that arrive inside the throttle interval.
+        self.column_width_timer = QTimer(self)
+        self.column_width_timer.setSingleShot(True)
+        self.column_width_timer.timeout.connect(self._throttled_update_log_column_width)
+        # time.monotonic() of the last resize made for live appends.
+        self.last_column_width_update = 0.0
         
         self.log_model = LogModel()
         self.log_model.is_dark_theme = False
         self.log_view.setModel(self.log_model)
+
+        # Row colors and match spans are computed off the UI thread for the
+        # rows around the viewport and painted by the delegate from a cache.
+        self.highlight_cache = HighlightCache()
+        self.highlight_thread = None
+        self.highlight_timer = QTimer(self)
+        self.highlight_timer.setSingleShot(True)
+        self.highlight_timer.setInterval(HIGHLIGHT_PASS_DELAY_MS)
+        self.highlight_timer.timeout.connect(self._start_highlight_pass)
+        # Find hits are scanned into LogModel.search_hits in the background.
+        self.search_thread = None
+        # Cancelled scans still finishing their current block.
+        self.retired_search_threads = []
+        self.find_index_thread = None
+        self.trigram_index_thread = None
+        self.export_thread = None
+        self.copy_thread = None
+        self.log_delegate = LogLineDelegate(
+            self.log_model,
+            self.highlight_cache,
+            self.log_view,
+            on_missing_entry=self._schedule_highlight_pass,
+        )
+        self.log_view.setItemDelegate(self.log_delegate)
+        self.log_model.modelReset.connect(self._invalidate_highlights)
+        self.log_model.modelReset.connect(self._invalidate_find_index)
+        self.log_model.rowsInserted.connect(self._on_rows_changed_for_find)
+        self.log_model.rowsRemoved.connect(self._on_rows_changed_for_find)
         self._apply_log_view_display_mode()
         self._update_mode_indicators()
 
@@ -290,7 +427,75 @@ class LogAnalysisMainWindow(QMainWindow):
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
-        self.refresh_adb_devices()
+        self._create_telemetry_dock()
+        self._create_find_results_dock()
+
+        # Device discovery runs off the UI thread and starts once the event loop
+        # is up, so a wedged adb server cannot delay startup.
+        self.device_watcher = DeviceWatcher()
+        self.device_watcher.devices_changed.connect(self._on_devices_changed)
+        self.device_watcher.scan_failed.connect(self._on_device_scan_failed)
+        QTimer.singleShot(0, self.device_watcher.start)
+
+    def _create_telemetry_dock(self):
+        self.telemetry_view = QPlainTextEdit()
+        self.telemetry_view.setReadOnly(True)
+        self.telemetry_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.telemetry_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+
+        dump_button = QPushButton("Dump CSV...")
+        dump_button.clicked.connect(self.dump_telemetry_csv)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self._reset_telemetry)
+        button_row = QHBoxLayout()
+        button_row.addStretch()
+        button_row.addWidget(reset_button)
+        button_row.addWidget(dump_button)
+
+        panel = QWidget()
+        panel_layout = QVBoxLayout(panel)
+        panel_layout.addWidget(self.telemetry_view)
+        panel_layout.addLayout(button_row)
+
+        self.telemetry_dock = QDockWidget("Live Telemetry", self)
+        self.telemetry_dock.setObjectName("telemetry_dock")
+        self.telemetry_dock.setWidget(panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.telemetry_dock)
+        self.telemetry_dock.hide()
+        # Sampling only runs while the panel is shown.
+        self.telemetry_dock.visibilityChanged.connect(self._set_telemetry_enabled)
+
+        telemetry_action = self.telemetry_dock.toggleViewAction()
+        telemetry_action.setText("Live Telemetry")
+        self.view_menu.addAction(telemetry_action)
+
+        self.telemetry_timer = QTimer(self)
+        self.telemetry_timer.setInterval(1000)
+        self.telemetry_timer.timeout.connect(self._refresh_telemetry)
+
+    def _create_find_results_dock(self):
+        self.find_results_model = FindResultsModel(self.log_model, self)
+        self.find_results_view = QListView()
+        self.find_results_view.setModel(self.find_results_model)
+        self.find_results_view.setUniformItemSizes(True)
+        self.find_results_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.find_results_view.clicked.connect(self._jump_to_find_result)
+        self.find_results_view.activated.connect(self._jump_to_find_result)
+
+        self.find_results_dock = QDockWidget("Find Results", self)
+        self.find_results_dock.setObjectName("find_results_dock")
+        self.find_results_dock.setWidget(self.find_results_view)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.find_results_dock)
+        self.find_results_dock.hide()
+        self.find_results_model.modelReset.connect(self._update_find_results_title)
+        self.find_results_model.rowsInserted.connect(self._update_find_results_title)
+
+        find_results_action = self.find_results_dock.toggleViewAction()
+        find_results_action.setText("Find Results")
+        self.view_menu.addAction(find_results_action)
+
+    def _update_find_results_title(self, *_args):
+        self.find_results_dock.setWindowTitle(f"Find Results ({self.find_results_model.rowCount():,})")
 
     def _next_filter_request_id(self):
         self.runtime.filter_request_id += 1
@@ -376,7 +581,8 @@ class LogAnalysisMainWindow(QMainWindow):
         self._stop_filter_worker()
         self._cancel_file_load()
         self._invalidate_filter_results()
-        self.runtime.pending_chunks = []
+        self.runtime.pending_chunks.clear()
+        self._update_live_buffer_label()
         self.runtime.pending_status_message = None
 
         request_id = self._next_file_load_request_id()
@@ -391,12 +597,21 @@ class LogAnalysisMainWindow(QMainWindow):
         self.file_load_thread.start()
 
     def _stop_adb_worker(self):
-        thread = self.adb_thread
-        self.adb_thread = None
-        if thread:
+        threads = self.adb_threads + self.retired_adb_threads
+        self.adb_threads = []
+        self.retired_adb_threads = []
+        for thread in threads:
             thread.stop()
+        for thread in threads:
             if thread.isRunning():
                 thread.wait()
+        self._stop_session_recorder()
+
+    def _stop_session_recorder(self):
+        recorder = self.runtime.recorder
+        if recorder is not None:
+            self.runtime.recorder = None
+            recorder.close()
 
     def _effective_model_filters(self):
         effective_filters = []
@@ -407,45 +622,13 @@ class LogAnalysisMainWindow(QMainWindow):
         return effective_filters
 
     def _regex_error(self, pattern, case_sensitive):
-        flags = 0 if case_sensitive else re.IGNORECASE
-        try:
-            re.compile(pattern, flags)
-        except re.error as error:
-            return str(error)
-        return None
+        return regex_error(pattern, case_sensitive)
 
     def _normalize_filter_data(self, filter_data):
-        normalized = {
-            "text": filter_data.get("text", ""),
-            "case_sensitive": filter_data.get("case_sensitive", False),
-            "regex": filter_data.get("regex", False),
-            "exclude": filter_data.get("exclude", False),
-            "bg_color": filter_data.get("bg_color", "None"),
-            "text_color": filter_data.get("text_color", "None"),
-            "active": filter_data.get("active", True),
-            "description": filter_data.get("description", ""),
-        }
-        if "total_matches" in filter_data:
-            normalized["total_matches"] = filter_data["total_matches"]
-        return normalized
+        return normalize_filter_data(filter_data)
 
     def _validate_loaded_filters(self, loaded_filters):
-        normalized_filters = []
-        invalid_filters = []
-
-        for raw_filter in loaded_filters:
-            if not isinstance(raw_filter, dict):
-                return None, ["Each filter entry must be an object."]
-
-            filter_data = self._normalize_filter_data(raw_filter)
-            if filter_data["regex"]:
-                regex_error = self._regex_error(filter_data["text"], filter_data["case_sensitive"])
-                if regex_error:
-                    invalid_filters.append(f"\"{filter_data['text']}\": {regex_error}")
-
-            normalized_filters.append(filter_data)
-
-        return normalized_filters, invalid_filters
+        return validate_filters(loaded_filters)
 
     def _tab_state(self, index):
         if 0 <= index < len(self.filter_tab_states):
@@ -629,14 +812,20 @@ class LogAnalysisMainWindow(QMainWindow):
 
         self._on_tab_toggled(index, state)
 
-    def _apply_chunk_to_model(self, lines):
+    def _apply_chunk_to_model(self, lines, sources=None):
+        telemetry = self.runtime.telemetry
+        started = time.perf_counter() if telemetry.enabled else None
         was_at_bottom = False
         scrollbar = self.log_view.verticalScrollBar()
         if scrollbar.value() == scrollbar.maximum():
             was_at_bottom = True
 
-        data_added = self.log_model.append_chunk(lines)
-        self._update_log_column_width()
+        data_added = self.log_model.append_chunk(lines, sources)
+        if started is not None:
+            telemetry.record(METRIC_APPEND, (time.perf_counter() - started) * 1000)
+        self._throttled_update_log_column_width()
+        if self.log_model.search_re is not None:
+            self._start_search_scan()
         if data_added:
             self.update_stats()
             self.update_filter_counts_ui()
@@ -644,21 +833,76 @@ class LogAnalysisMainWindow(QMainWindow):
         trimmed = self._trim_live_log_buffer_if_needed(was_at_bottom)
         if data_added and was_at_bottom and not trimmed:
             self.log_view.scrollToBottom()
+        if started is not None:
+            telemetry.record(METRIC_APPLY, (time.perf_counter() - started) * 1000)
+
+    def _set_telemetry_enabled(self, enabled):
+        self.runtime.telemetry.enabled = enabled
+        self.telemetry_label.setVisible(enabled)
+        if enabled:
+            self._refresh_telemetry()
+            self.telemetry_timer.start()
+        else:
+            self.telemetry_timer.stop()
+
+    def _reset_telemetry(self):
+        self.runtime.telemetry.clear()
+        self._refresh_telemetry()
+
+    def _refresh_telemetry(self):
+        telemetry = self.runtime.telemetry
+        telemetry.record(
+            METRIC_QUEUE_DEPTH, len(self.runtime.pending_chunks) + len(self.runtime.live_merger)
+        )
+        summary = telemetry.summary()
+        self.telemetry_label.setText(format_status(summary))
+        self.telemetry_view.setPlainText(format_report(summary))
+
+    def dump_telemetry_csv(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Dump Telemetry", "telemetry.csv", "CSV Files (*.csv);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            row_count = self.runtime.telemetry.write_csv(file_path)
+        except OSError as error:
+            self.status_bar.showMessage(f"Error writing telemetry: {error}", 5000)
+            return
+        self.status_bar.showMessage(f"Wrote {row_count:,} telemetry samples to {file_path}", 5000)
+
+    def _update_live_buffer_label(self):
+        pending = self.runtime.pending_chunks
+        if not pending:
+            self.live_buffer_label.clear()
+            self.live_buffer_label.setVisible(False)
+            return
+
+        self.live_buffer_label.setText(
+            f"Buffered: {pending.buffered_count:,} | Spilled: {pending.spilled_count:,}"
+        )
+        self.live_buffer_label.setVisible(True)
 
     def _flush_pending_chunks(self):
         if self.runtime.is_paused or self.runtime.is_refiltering or not self.runtime.pending_chunks:
             return
 
-        chunks = self.runtime.pending_chunks
-        self.runtime.pending_chunks = []
-        for chunk in chunks:
-            self._apply_chunk_to_model(chunk)
+        # Only the newest MAX_MONITOR_LINES could survive the live trim, so older
+        # buffered lines are dropped before they are decoded and filtered.
+        max_lines = MAX_MONITOR_LINES if self.runtime.is_monitoring else None
+        if self.runtime.telemetry.enabled and max_lines is not None:
+            dropped = len(self.runtime.pending_chunks) - max_lines
+            if dropped > 0:
+                self.runtime.telemetry.record(METRIC_DROPPED, dropped)
+        lines, sources = self.runtime.pending_chunks.drain(max_lines)
+        self._update_live_buffer_label()
+        self._apply_chunk_to_model(lines, sources)
 
     def _base_log_column_width(self):
         viewport_width = self.log_view.viewport().width()
         if viewport_width > 0:
             return viewport_width
-        return self.log_view.header().defaultSectionSize()
+        return DEFAULT_CONTENT_WIDTH
 
     def _apply_log_view_display_mode(self):
         if not hasattr(self, "log_view"):
@@ -679,20 +923,37 @@ class LogAnalysisMainWindow(QMainWindow):
         if not hasattr(self, "log_view") or not hasattr(self, "log_model"):
             return
 
+        self.column_width_timer.stop()
         width = self._base_log_column_width()
         if self.full_line_display_enabled:
-            metrics = QFontMetrics(self.log_model.font)
             prefix = ""
             if self.log_model.show_line_numbers:
                 max_line_number = max(len(self.log_model.all_lines), 1)
                 prefix = f"{max_line_number:6d} | "
 
             if self.log_model.visible_longest_line_text:
-                sample_text = f"{prefix}{self.log_model.visible_longest_line_text}"
-                content_width = metrics.horizontalAdvance(sample_text) + 24
+                content_width = self.text_width_cache.width(
+                    self.log_model.font,
+                    self.log_model.visible_longest_line_text,
+                    prefix,
+                ) + 24
                 width = max(width, content_width)
 
-        self.log_view.header().resizeSection(0, width)
+        self.log_view.setContentWidth(width)
+
+    def _throttled_update_log_column_width(self):
+        """Resize the log column for live appends, at most once per interval."""
+        if not self.full_line_display_enabled:
+            # Nothing is measured, so there is nothing to save.
+            self._update_log_column_width()
+            return
+        now = time.monotonic()
+        elapsed_ms = (now - self.last_column_width_update) * 1000
+        if elapsed_ms >= COLUMN_WIDTH_UPDATE_INTERVAL_MS:
+            self.last_column_width_update = now
+            self._update_log_column_width()
+        elif not self.column_width_timer.isActive():
+            self.column_width_timer.start(int(COLUMN_WIDTH_UPDATE_INTERVAL_MS - elapsed_ms) + 1)
 
     def _trim_live_log_buffer_if_needed(self, preserve_bottom=False):
         if not self.runtime.is_monitoring:
@@ -702,8 +963,10 @@ class LogAnalysisMainWindow(QMainWindow):
         if excess_lines <= 0:
             return False
 
+        if self.runtime.telemetry.enabled:
+            self.runtime.telemetry.record(METRIC_TRIMMED, excess_lines)
         self._invalidate_filter_results()
-        self.log_model.set_lines(self.log_model.all_lines[excess_lines:])
+        self.log_model.trim_front(excess_lines)
         self._update_log_column_width()
         if preserve_bottom:
             self.runtime.scroll_to_bottom_after_refilter = True
@@ -731,15 +994,171 @@ class LogAnalysisMainWindow(QMainWindow):
 
     def update_search_highlights(self, query, case, regex):
         if hasattr(self, "log_model"):
-            self.log_model.search_query = query
-            self.log_model.search_case = case
-            self.log_model.search_regex = regex
+            self.log_model.set_search(query, case, regex)
+            self._invalidate_highlights()
+            self._invalidate_find_index()
             self.log_model.layoutChanged.emit()
+            self._restart_search_scan()
 
     def clear_search_highlights(self):
         if hasattr(self, "log_model"):
-            self.log_model.search_query = ""
+            self.log_model.set_search("", self.log_model.search_case, self.log_model.search_regex)
+            self._invalidate_highlights()
+            self._invalidate_find_index()
             self.log_model.layoutChanged.emit()
+            self._restart_search_scan()
+
+    def _restart_search_scan(self):
+        self._retire_search_worker()
+        self._start_search_scan()
+
+    def _retire_search_worker(self):
+        """Cancel the running scan without waiting for it on the UI thread.
+
+        Its remaining blocks carry an old generation and are dropped.
+        """
+        thread = self.search_thread
+        self.search_thread = None
+        if thread is None:
+            return
+        # Connect before checking isRunning(): the queued finished signal can
+        # only be delivered after this returns, so a thread that finishes in
+        # between is still removed instead of being retained forever.
+        thread.finished.connect(self._on_retired_search_worker_finished)
+        thread.stop()
+        if thread.isRunning():
+            self.retired_search_threads.append(thread)
+
+    def _on_retired_search_worker_finished(self):
+        thread = self.sender()
+        if thread in self.retired_search_threads:
+            thread.wait()
+            self.retired_search_threads.remove(thread)
+
+    def _start_search_scan(self):
+        """Scan the lines past the end of ``LogModel.search_hits`` in the background."""
+        if self.search_thread is not None and self.search_thread.isRunning():
+            # The running scan continues from its end when it reports back.
+            return
+
+        model = self.log_model
+        if not model.search_scan_complete():
+            self.search_thread = SearchWorker(
+                model.search_generation,
+                model.all_lines,
+                model.search_re,
+                start=len(model.search_hits),
+                first_line_number=model.first_line_number,
+                trigram_index=model.trigram_index,
+                trigrams=search_trigrams(model.search_query, model.search_case, model.search_regex),
+                candidates=model.search_candidates,
+                candidate_stop=model.search_candidate_stop,
+            )
+            self.search_thread.hits_ready.connect(self._on_search_hits)
+            self.search_thread.search_finished.connect(self._on_search_finished)
+            self.search_thread.start()
+        self._report_search_hits()
+
+    def _on_search_hits(self, generation, first_line_number, hits):
+        if self.log_model.add_search_hits(generation, first_line_number, hits):
+            self._report_search_hits()
+
+    def _on_search_finished(self, generation):
+        thread = self.search_thread
+        # A stopped worker's last signal can still be queued.
+        if thread is None or self.sender() is not thread:
+            return
+        thread.wait()
+        self.search_thread = None
+        if generation == self.log_model.search_generation:
+            # Live lines may have arrived while the scan ran.
+            self._start_search_scan()
+
+    def _report_search_hits(self):
+        model = self.log_model
+        if model.search_re is not None:
+            # Results of a cleared search stay listed until the lines change.
+            self.find_results_model.sync()
+        if not self.find_dialog:
+            return
+        if model.search_re is None:
+            self.find_dialog.set_hit_count(None)
+        else:
+            self.find_dialog.set_hit_count(model.search_hit_count, scanning=not model.search_scan_complete())
+
+    def _stop_search_worker(self):
+        thread = self.search_thread
+        self.search_thread = None
+        if thread:
+            thread.stop()
+            if thread.isRunning():
+                thread.wait()
+        retired, self.retired_search_threads = self.retired_search_threads, []
+        for thread in retired:
+            thread.wait()
+
+    def _invalidate_highlights(self):
+        self.highlight_cache.invalidate()
+        self.log_view.viewport().update()
+
+    def _schedule_highlight_pass(self):
+        if not self.highlight_timer.isActive():
+            self.highlight_timer.start()
+
+    def _highlight_pass_rows(self):
+        """Return the row range to highlight: the viewport plus a page either side."""
+        row_count = self.log_model.rowCount()
+        if row_count == 0:
+            return 0, -1
+        viewport = self.log_view.viewport()
+        top_index = self.log_view.indexAt(QPoint(0, 0))
+        bottom_index = self.log_view.indexAt(QPoint(0, max(viewport.height() - 1, 0)))
+        top = top_index.row() if top_index.isValid() else 0
+        bottom = bottom_index.row() if bottom_index.isValid() else row_count - 1
+        page = bottom - top + 1
+        return max(top - page, 0), min(bottom + page, row_count - 1)
+
+    def _start_highlight_pass(self):
+        if self.highlight_thread is not None and self.highlight_thread.isRunning():
+            # The running pass reschedules when it reports back.
+            return
+
+        first_row, last_row = self._highlight_pass_rows()
+        all_lines = self.log_model.all_lines
+        cache = self.highlight_cache
+        numbered_lines = [
+            (line_index, all_lines[line_index])
+            for line_index in self.log_model.visible_indices[first_row:last_row + 1]
+            if line_index not in cache
+        ]
+        if not numbered_lines:
+            return
+
+        model = self.log_model
+        self.highlight_thread = HighlightWorker(
+            cache.generation,
+            numbered_lines,
+            list(model.filters),
+            model.search_re,
+        )
+        self.highlight_thread.highlights_ready.connect(self._on_highlights_ready)
+        self.highlight_thread.start()
+
+    def _on_highlights_ready(self, generation, entries):
+        if generation == self.highlight_cache.generation:
+            self.highlight_cache.update(entries)
+            self.log_view.viewport().update()
+        # Rows may have scrolled in, or the cache been invalidated, meanwhile.
+        self._schedule_highlight_pass()
+
+    def _stop_highlight_worker(self):
+        self.highlight_timer.stop()
+        thread = self.highlight_thread
+        self.highlight_thread = None
+        if thread:
+            thread.stop()
+            if thread.isRunning():
+                thread.wait()
 
     def add_quick_filter(self):
         text = self.quick_input.text().strip()
@@ -781,81 +1200,347 @@ class LogAnalysisMainWindow(QMainWindow):
         self.find_dialog.raise_()
         self.find_dialog.activateWindow()
 
-    def find_in_files(self, text, forward=True, case=False, regex=False):
-        if not text:
-            return
-
+    def _prepare_find(self, text, case, regex):
+        """Make ``text`` the active search; returns False for an invalid regex."""
         if regex:
             regex_error = self._regex_error(text, case)
             if regex_error:
                 message = f"Invalid regex: {regex_error}"
-                if self.find_dialog:
-                    self.find_dialog.set_status(message)
+                self._set_find_status(message)
                 self.status_bar.showMessage(message, 5000)
-                return
-            
+                return False
+
         model = self.log_model
-        visited_count = 0
-        total = model.rowCount()
-        if total == 0:
+        if (text, case, regex) != (model.search_query, model.search_case, model.search_regex):
+            self.update_search_highlights(text, case, regex)
+        return True
+
+    def find_all(self, text, case=False, regex=False):
+        if not text or not self._prepare_find(text, case, regex):
+            return
+        self._report_search_hits()
+        self.find_results_dock.show()
+        self.find_results_dock.raise_()
+
+    def _jump_to_find_result(self, index):
+        line_index = self.find_results_model.line_index(index.row())
+        row = self._nearest_visible_row(line_index)
+        if row == -1:
+            return
+        index_obj = self.log_model.index(row, 0)
+        self.log_view.setCurrentIndex(index_obj)
+        self.log_view.scrollTo(index_obj, QAbstractItemView.PositionAtCenter)
+        if self.log_model.visible_indices[row] != line_index:
+            self.status_bar.showMessage(
+                f"Line {line_index + 1} is hidden by the current filters; showing the nearest visible line.",
+                5000,
+            )
+
+    def find_in_files(self, text, forward=True, case=False, regex=False):
+        if not text or not self._prepare_find(text, case, regex):
+            return
+        if self.log_model.rowCount() == 0:
+            return
+
+        hit_rows = self._find_hit_rows()
+        if hit_rows is None:
+            self.runtime.pending_find_forward = forward
+            self._start_find_index()
+            return
+        self._go_to_find_hit(hit_rows, forward)
+
+    def _set_find_status(self, text):
+        if self.find_dialog:
+            self.find_dialog.set_status(text)
+
+    def _go_to_find_hit(self, hit_rows, forward):
+        """Move to the next/previous hit after the current row, wrapping around."""
+        if not hit_rows:
+            self._set_find_status("Not found")
             return
 
         current_row = self.log_view.currentIndex().row()
-        if current_row < 0:
-            idx = -1 if forward else 0
+        if forward:
+            row = hit_rows[bisect.bisect_right(hit_rows, current_row) % len(hit_rows)]
         else:
-            idx = current_row
+            # Index -1 wraps to the last hit.
+            row = hit_rows[bisect.bisect_left(hit_rows, current_row) - 1]
+        index_obj = self.log_model.index(row, 0)
+        self.log_view.setCurrentIndex(index_obj)
+        self.log_view.scrollTo(index_obj, QAbstractItemView.PositionAtCenter)
+        self._set_find_status("")
+
+    def _find_hit_rows(self):
+        """Return the cached hit rows for the current view, or None if they need building.
+
+        Rows appended since the index was built are checked on the spot.
+        """
+        runtime = self.runtime
+        hit_rows = runtime.find_hit_rows
+        if hit_rows is None:
+            return None
+        model = self.log_model
+        row_count = model.rowCount()
+        if runtime.find_hit_row_count < row_count:
+            hit_rows.extend(search_hit_rows(
+                model.visible_indices,
+                model.all_lines,
+                model.search_re,
+                model.search_hits,
+                runtime.find_hit_row_count,
+                row_count,
+            ))
+            runtime.find_hit_row_count = row_count
+        return hit_rows
+
+    def _start_find_index(self):
+        if self.find_index_thread is not None and self.find_index_thread.isRunning():
+            return
 
-        while visited_count < total:
-            if forward:
-                idx = (idx + 1) % total
-            else:
-                idx = (idx - 1) % total
-            
-            real_idx = model.visible_indices[idx]
-            line = model.all_lines[real_idx]
-            
-            match = False
-            if regex:
-                flags = 0 if case else re.IGNORECASE
-                if re.search(text, line, flags):
-                    match = True
-            else:
-                if case:
-                    if text in line: match = True
-                else:
-                    if text.lower() in line.lower(): match = True
-            
-            if match:
-                index_obj = model.index(idx, 0)
-                self.log_view.setCurrentIndex(index_obj)
-                self.log_view.scrollTo(index_obj, QAbstractItemView.PositionAtCenter)
-                self.find_dialog.set_status("")
-                return
-            
-            visited_count += 1
-            
-        self.find_dialog.set_status("Not found")
+        model = self.log_model
+        runtime = self.runtime
+        row_count = model.rowCount()
+        # Rows appended while the index is built are added when it arrives;
+        # any other row change invalidates the request.
+        runtime.find_hit_row_count = row_count
+        if model.search_re is None:
+            self._on_find_index_ready(runtime.find_index_request_id, visible_index_array())
+            return
+        if row_count < FIND_INDEX_BACKGROUND_ROWS:
+            self._on_find_index_ready(
+                runtime.find_index_request_id,
+                search_hit_rows(model.visible_indices, model.all_lines, model.search_re, model.search_hits),
+            )
+            return
 
-    def copy_selection(self):
+        self.find_index_thread = FindIndexWorker(
+            runtime.find_index_request_id,
+            model.visible_indices[:row_count],
+            model.all_lines,
+            model.search_re,
+            model.search_hits,
+        )
+        self.find_index_thread.index_ready.connect(self._on_find_index_ready)
+        self.find_index_thread.start()
+        self._set_find_status("Searching...")
+
+    def _on_find_index_ready(self, request_id, hit_rows):
+        runtime = self.runtime
+        if request_id != runtime.find_index_request_id:
+            return
+        if self.sender() is self.find_index_thread and self.find_index_thread is not None:
+            self.find_index_thread.wait()
+            self.find_index_thread = None
+
+        runtime.find_hit_rows = hit_rows
+        forward = runtime.pending_find_forward
+        runtime.pending_find_forward = None
+        if forward is not None:
+            self._go_to_find_hit(self._find_hit_rows(), forward)
+
+    def _on_rows_changed_for_find(self, _parent, first, _last):
+        # Rows past the indexed ones are picked up by _find_hit_rows.
+        if first < self.runtime.find_hit_row_count:
+            self._invalidate_find_index()
+
+    def _invalidate_find_index(self):
+        runtime = self.runtime
+        runtime.find_hit_rows = None
+        runtime.find_hit_row_count = 0
+        runtime.find_index_request_id += 1
+        self._stop_find_index_worker()
+        if runtime.pending_find_forward is not None:
+            # A next/previous request is still waiting: index the new rows.
+            self._start_find_index()
+
+    def _set_search_index_enabled(self, enabled):
+        if not enabled:
+            self._stop_trigram_index_worker()
+            self.log_model.trigram_index = None
+        elif self.log_model.trigram_index is None:
+            self._start_trigram_index()
+
+    def _start_trigram_index(self):
+        file_path = self.runtime.loaded_file_path
+        if not file_path or self.runtime.is_monitoring or not self.log_model.all_lines:
+            return
+        if self.trigram_index_thread is not None and self.trigram_index_thread.isRunning():
+            return
+        self.trigram_index_thread = TrigramIndexWorker(file_path, self.log_model.all_lines)
+        self.trigram_index_thread.index_ready.connect(self._on_trigram_index_ready)
+        self.trigram_index_thread.start()
+
+    def _on_trigram_index_ready(self, file_path, index, loaded):
+        thread = self.trigram_index_thread
+        if thread is None or self.sender() is not thread:
+            return
+        thread.wait()
+        self.trigram_index_thread = None
+        model = self.log_model
+        # The file may have been closed or replaced while the index was built.
+        if file_path != self.runtime.loaded_file_path or index.line_count != len(model.all_lines):
+            return
+        if not self.search_index_action.isChecked():
+            return
+        model.trigram_index = index
+        source = "loaded" if loaded else "built"
+        self.status_bar.showMessage(f"Search index {source}: {len(index):,} trigrams", 5000)
+
+    def export_visible_lines(self):
+        if self.log_model.rowCount() == 0:
+            self.status_bar.showMessage("No visible lines to export", 3000)
+            return
+        self._export_lines("Export Visible Lines")
+
+    def _export_lines(self, title, line_indices=None):
+        """Ask for a file and export ``line_indices`` (default: every visible row) to it."""
+        if self.export_thread is not None:
+            self.status_bar.showMessage("An export is already running", 3000)
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            title,
+            "filtered.log",
+            "Log Files (*.log *.txt);;Gzip Compressed Logs (*.gz);;All Files (*)",
+        )
+        if not file_path:
+            return
+        if selected_filter.startswith("Gzip") and not file_path.lower().endswith(".gz"):
+            file_path += ".gz"
+        self._start_export(file_path, line_indices)
+
+    def _start_export(self, file_path, line_indices=None):
+        model = self.log_model
+        if line_indices is None:
+            line_indices = model.visible_indices[:model.rowCount()]
+        self.export_thread = ExportWorker(file_path, model.all_lines, line_indices)
+        self.export_thread.progress_updated.connect(self._on_export_progress)
+        self.export_thread.export_finished.connect(self._on_export_finished)
+        self.export_thread.export_failed.connect(self._on_export_failed)
+        self.export_progress.setRange(0, 100)
+        self.export_progress.setValue(0)
+        self.export_progress.setVisible(True)
+        self.cancel_export_action.setEnabled(True)
+        self.export_thread.start()
+
+    def _on_export_progress(self, rows_written, total_rows):
+        if self.sender() is not self.export_thread or self.export_thread is None:
+            return
+        self.export_progress.setValue(int(rows_written * 100 / max(total_rows, 1)))
+        self.status_bar.showMessage(f"Exporting... {rows_written:,} of {total_rows:,} lines")
+
+    def _on_export_finished(self, file_path, row_count):
+        if not self._finish_export():
+            return
+        self.status_bar.showMessage(f"Exported {row_count:,} lines to {file_path}", 5000)
+
+    def _on_export_failed(self, file_path, error):
+        if not self._finish_export():
+            return
+        self.status_bar.showMessage(f"Error exporting to {file_path}: {error}", 5000)
+
+    def _finish_export(self):
+        thread = self.export_thread
+        if thread is None or self.sender() is not thread:
+            return False
+        thread.wait()
+        self.export_thread = None
+        self.export_progress.setVisible(False)
+        self.cancel_export_action.setEnabled(False)
+        return True
+
+    def cancel_export(self):
+        if self.export_thread is None:
+            return
+        self._stop_export_worker()
+        self.status_bar.showMessage("Export cancelled", 3000)
+
+    def _stop_export_worker(self):
+        thread = self.export_thread
+        self.export_thread = None
+        self.export_progress.setVisible(False)
+        self.cancel_export_action.setEnabled(False)
+        if thread:
+            thread.stop()
+            if thread.isRunning():
+                thread.wait()
+
+    def _stop_trigram_index_worker(self):
+        thread = self.trigram_index_thread
+        self.trigram_index_thread = None
+        if thread:
+            thread.stop()
+            if thread.isRunning():
+                thread.wait()
+
+    def _stop_find_index_worker(self):
+        thread = self.find_index_thread
+        self.find_index_thread = None
+        if thread:
+            thread.stop()
+            if thread.isRunning():
+                thread.wait()
+
+    def _row_selection(self):
+        """Return the selected rows as intervals, without expanding them per row."""
         selection_model = self.log_view.selectionModel()
-        selected_indexes = selection_model.selectedRows()
-        
-        if not selected_indexes:
+        if selection_model is None:
+            return RowSelection()
+        return RowSelection.from_inclusive(
+            (selection_range.top(), selection_range.bottom()) for selection_range in selection_model.selection()
+        ).clipped(self.log_model.rowCount())
+
+    def copy_selection(self):
+        selection = self._row_selection()
+        row_count = len(selection)
+        if row_count == 0:
             return
 
-        selected_indexes.sort(key=lambda x: x.row())
-        
-        lines = []
-        for idx in selected_indexes:
-            text = self.log_model.data(idx, Qt.DisplayRole)
-            if text:
-                lines.append(text)
-        
-        if lines:
-            clipboard = QApplication.clipboard()
-            clipboard.setText("\n".join(lines))
-            self.status_bar.showMessage(f"Copied {len(lines)} lines to clipboard", 3000)
+        model = self.log_model
+        if row_count > COPY_CLIPBOARD_MAX_ROWS:
+            answer = QMessageBox.question(
+                self,
+                "Copy Selection",
+                f"The selection has {row_count:,} lines, which is too much for the clipboard.\n\n"
+                "Export them to a file instead?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.Yes,
+            )
+            if answer == QMessageBox.Yes:
+                self._export_lines("Export Selected Lines", selection.take(model.visible_indices))
+            return
+
+        line_indices = selection.take(model.visible_indices)
+        if row_count < COPY_BACKGROUND_ROWS:
+            text = display_lines_text(model.all_lines, line_indices, **model.display_text_options())
+            self._set_clipboard_text(text, row_count)
+            return
+
+        self._stop_copy_worker()
+        self.copy_thread = CopyTextWorker(model.all_lines, line_indices, model.display_text_options())
+        self.copy_thread.text_ready.connect(self._on_copy_text_ready)
+        self.copy_thread.start()
+        self.status_bar.showMessage(f"Copying {row_count:,} lines...")
+
+    def _on_copy_text_ready(self, text, row_count):
+        thread = self.copy_thread
+        if thread is None or self.sender() is not thread:
+            return
+        thread.wait()
+        self.copy_thread = None
+        self._set_clipboard_text(text, row_count)
+
+    def _set_clipboard_text(self, text, row_count):
+        QApplication.clipboard().setText(text)
+        self.status_bar.showMessage(f"Copied {row_count:,} lines to clipboard", 3000)
+
+    def _stop_copy_worker(self):
+        thread = self.copy_thread
+        self.copy_thread = None
+        if thread:
+            thread.stop()
+            if thread.isRunning():
+                thread.wait()
 
     def show_log_context_menu(self, position):
         menu = QMenu(self)
@@ -863,18 +1548,12 @@ class LogAnalysisMainWindow(QMainWindow):
         copy_act = menu.addAction("Copy Selection")
         copy_act.triggered.connect(self.copy_selection)
         
-        selection_model = self.log_view.selectionModel()
-        selected_indexes = selection_model.selectedRows()
-        
         selected_text = ""
-        if len(selected_indexes) == 1:
-            idx = selected_indexes[0]
-            if idx.isValid():
-                row = idx.row()
-                if row < len(self.log_model.visible_indices):
-                    real_idx = self.log_model.visible_indices[row]
-                    raw_text = self.log_model.all_lines[real_idx].rstrip('\r\n')
-                    selected_text = raw_text.strip()
+        row = self._row_selection().single_row()
+        if row >= 0:
+            real_idx = self.log_model.visible_indices[row]
+            raw_text = self.log_model.all_lines[real_idx].rstrip('\r\n')
+            selected_text = raw_text.strip()
         
         add_include_act = None
         add_exclude_act = None
@@ -917,17 +1596,57 @@ class LogAnalysisMainWindow(QMainWindow):
             self.runtime.loaded_file_path = None
             self._update_loaded_file_label()
             self.log_model.clear()
-            self.runtime.pending_chunks = []
+            self._restart_search_scan()
+            self._stop_trigram_index_worker()
+            self.runtime.pending_chunks.clear()
+            self._update_live_buffer_label()
+            self.runtime.live_merger.clear()
             self.log_model.filters = self._effective_model_filters()
+            self._invalidate_highlights()
             
-            serial = None
-            if self.device_selector.isEnabled() and self.device_selector.currentText() not in ["No Devices Found", "ADB Not Found", "Scan Error"]:
-                serial = self.device_selector.currentText()
-
-            self.adb_thread = AdbWorker(device_serial=serial)
-            self.adb_thread.chunk_ready.connect(self.on_adb_chunk)
-            self.adb_thread.error_occurred.connect(self.on_adb_error)
-            self.adb_thread.start()
+            self.log_model.source_labels = {}
+            self.log_model.hidden_sources = set()
+            self.runtime.logcat_filter_args = self._desired_logcat_filter_args()
+            if self.runtime.replay_source is not None:
+                file_path, mode, rate = self.runtime.replay_source
+                self.log_model.source_labels[0] = os.path.basename(file_path)
+                worker = ReplayWorker(file_path, mode, rate=rate, telemetry=self.runtime.telemetry)
+                worker.source_id = 0
+                worker.chunk_ready.connect(self.on_adb_chunk)
+                worker.error_occurred.connect(self.on_adb_error)
+                self.adb_threads.append(worker)
+                status_message = f"Replaying {os.path.basename(file_path)}..."
+            else:
+                serials = self._selected_device_serials()
+                buffers = self._selected_logcat_buffers()
+                streams = [(serial, buffer) for serial in serials for buffer in buffers]
+                for source_id, (serial, buffer) in enumerate(streams):
+                    label = serial or "default"
+                    if len(buffers) > 1:
+                        label = f"{label}/{buffer}" if len(serials) > 1 else buffer
+                    self.log_model.source_labels[source_id] = label
+                    self.adb_threads.append(self._create_adb_worker(source_id, serial, buffer))
+                if len(serials) > 1:
+                    status_message = f"Monitoring {len(serials)} ADB Devices..."
+                elif serials[0]:
+                    status_message = f"Monitoring ADB Device: {serials[0]}..."
+                else:
+                    status_message = "Monitoring ADB Logcat..."
+            self._rebuild_source_filter_menu()
+            if self.runtime.recording_directory:
+                session_path = os.path.join(
+                    self.runtime.recording_directory, time.strftime("session-%Y%m%d-%H%M%S")
+                )
+                try:
+                    self.runtime.recorder = SessionRecorder(
+                        session_path, source_labels=self.log_model.source_labels
+                    )
+                except OSError as error:
+                    QMessageBox.warning(self, "Recording Error", f"Cannot record to '{session_path}':\n\n{error}")
+                else:
+                    status_message += f" Recording to {session_path}"
+            for worker in self.adb_threads:
+                worker.start()
             
             self.runtime.is_monitoring = True
             self.runtime.is_paused = False
@@ -935,51 +1654,185 @@ class LogAnalysisMainWindow(QMainWindow):
             self.adb_monitor_action.setIcon(style.standardIcon(QStyle.SP_MediaStop))
             self.pause_action.setEnabled(True)
             self.pause_action.setChecked(False)
-            if serial:
-                self.status_bar.showMessage(f"Monitoring ADB Device: {serial}...")
-            else:
-                self.status_bar.showMessage("Monitoring ADB Logcat...")
+            self.status_bar.showMessage(status_message)
         else:
+            recorder = self.runtime.recorder
             self._stop_adb_worker()
+            self.runtime.replay_source = None
+            self.live_merge_timer.stop()
+            self._drain_live_merger(final=True)
             self.runtime.is_monitoring = False
             self.runtime.is_paused = False
             self.runtime.is_refiltering = False
             self.adb_monitor_action.setText("Start ADB Logcat")
             self.adb_monitor_action.setIcon(style.standardIcon(QStyle.SP_ComputerIcon))
             self.pause_action.setEnabled(False)
-            self.status_bar.showMessage(f"Monitoring stopped.")
+            self.source_filter_button.setEnabled(False)
+            if recorder is not None and recorder.error is not None:
+                self.status_bar.showMessage(f"Monitoring stopped. Recording failed: {recorder.error}")
+            elif recorder is not None:
+                self.status_bar.showMessage(
+                    f"Monitoring stopped. Recorded {recorder.lines_written:,} lines to {recorder.directory}"
+                )
+            else:
+                self.status_bar.showMessage(f"Monitoring stopped.")
             self.update_stats()
             self._flush_pending_chunks()
 
+    def start_replay(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Replay Log File", "", "Log/Text Files (*.log *.txt);;All Files (*)"
+        )
+        if not file_path:
+            return
+
+        pace, ok = QInputDialog.getItem(
+            self, "Replay Log File", "Pace:", list(REPLAY_PACE_CHOICES), 0, False
+        )
+        if not ok:
+            return
+
+        if self.runtime.is_monitoring:
+            self.toggle_adb_monitoring()
+        mode, rate = REPLAY_PACE_CHOICES[pace]
+        self.runtime.replay_source = (file_path, mode, rate)
+        self.toggle_adb_monitoring()
+
+    def _selected_logcat_buffers(self):
+        """Return the ``-b`` value of each logcat to run per device.
+
+        One logcat reads all checked buffers and interleaves them itself; the
+        default selection runs without ``-b`` at all. Only binary ``events``
+        needs its own stream, because it is decoded with the event-tag map.
+        """
+        buffers = [buffer for buffer, action in self.buffer_actions.items() if action.isChecked()]
+        if not buffers or set(buffers) == set(DEFAULT_LOGCAT_BUFFERS):
+            return [None]
+        if self.binary_logcat_action.isChecked() and "events" in buffers and len(buffers) > 1:
+            buffers.remove("events")
+            return [",".join(buffers), "events"]
+        return [",".join(buffers)]
+
+    def _create_adb_worker(self, source_id, serial, buffer=None, start_time=None, deduper=None):
+        worker = AdbWorker(
+            device_serial=serial,
+            binary=self.binary_logcat_action.isChecked(),
+            buffer=buffer,
+            filter_args=self.runtime.logcat_filter_args,
+            start_time=start_time,
+            telemetry=self.runtime.telemetry,
+            reconnect=True,
+            deduper=deduper,
+        )
+        worker.source_id = source_id
+        worker.chunk_ready.connect(self.on_adb_chunk)
+        worker.error_occurred.connect(self.on_adb_error)
+        worker.reconnecting.connect(self.on_adb_reconnecting)
+        return worker
+
+    def _desired_logcat_filter_args(self):
+        if not self.device_filter_action.isChecked():
+            return []
+        return logcat_filter_args(
+            self._effective_model_filters(), self.log_model.show_only_filtered
+        )
+
+    def _update_logcat_pushdown(self):
+        args = self._desired_logcat_filter_args()
+        if args == self.runtime.logcat_filter_args:
+            return
+        self.runtime.logcat_filter_args = args
+        if not self.runtime.is_monitoring:
+            return
+
+        # Restart each logcat with the new filterspec, resuming from the last
+        # line it delivered so the model keeps its history.
+        restarted = []
+        for worker in self.adb_threads:
+            if isinstance(worker, ReplayWorker):
+                restarted.append(worker)
+                continue
+            worker.stop()
+            if worker.isRunning():
+                worker.wait()
+            replacement = self._create_adb_worker(
+                worker.source_id,
+                worker.device_serial,
+                worker.buffer,
+                start_time=worker.last_timestamp,
+                deduper=worker.deduper,
+            )
+            restarted.append(replacement)
+        self.adb_threads = restarted
+        for worker in restarted:
+            worker.start()
+
+    def _selected_device_serials(self):
+        if not self.device_selector.isEnabled():
+            return [None]
+
+        current_text = self.device_selector.currentText()
+        if current_text == ALL_DEVICES_LABEL:
+            return list(self.discovered_devices) or [None]
+        if current_text in ["Scanning...", "No Devices Found", "ADB Not Found", "Scan Error"]:
+            return [None]
+        return [current_text]
+
+    def _rebuild_source_filter_menu(self):
+        menu = self.source_filter_button.menu()
+        menu.clear()
+        for source_id, label in sorted(self.log_model.source_labels.items()):
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(source_id not in self.log_model.hidden_sources)
+            action.toggled.connect(
+                lambda checked, source_id=source_id: self._set_source_visible(source_id, checked)
+            )
+        self.source_filter_button.setEnabled(len(self.log_model.source_labels) > 1)
+
+    def _set_source_visible(self, source_id, visible):
+        # Streams keep running; disabling a source only hides its lines.
+        if visible:
+            self.log_model.hidden_sources.discard(source_id)
+        else:
+            self.log_model.hidden_sources.add(source_id)
+        self.apply_filters()
+
     def refresh_adb_devices(self):
+        self.status_bar.showMessage("Scanning for ADB devices...", 3000)
+        self.device_watcher.refresh()
+
+    def _on_devices_changed(self, devices):
+        previous = self.device_selector.currentText()
+        self.discovered_devices = devices
+        self.device_selector.blockSignals(True)
         self.device_selector.clear()
-        try:
-            output = subprocess.check_output(['adb', 'devices'], universal_newlines=True, encoding='utf-8', errors='replace')
-            lines = output.strip().split('\n')
-            devices = []
-            for line in lines[1:]:
-                if not line.strip():
-                    continue
-                parts = line.split()
-                if len(parts) >= 2 and parts[1] == 'device':
-                    devices.append(parts[0])
-            
-            if devices:
-                self.device_selector.addItems(devices)
-                self.device_selector.setEnabled(True)
-                self.status_bar.showMessage(f"Found {len(devices)} ADB devices.", 3000)
-            else:
-                self.device_selector.addItem("No Devices Found")
-                self.device_selector.setEnabled(False)
-                self.status_bar.showMessage("No ADB devices connected.", 3000)
-        except FileNotFoundError:
-            self.device_selector.addItem("ADB Not Found")
-            self.device_selector.setEnabled(False)
-            self.status_bar.showMessage("ADB not found in system PATH.", 3000)
-        except Exception as e:
-            self.device_selector.addItem("Scan Error")
+        if devices:
+            self.device_selector.addItems(devices)
+            if len(devices) > 1:
+                self.device_selector.addItem(ALL_DEVICES_LABEL)
+            self.device_selector.setEnabled(True)
+            # Keep the user's choice when another device is plugged in.
+            if self.device_selector.findText(previous) >= 0:
+                self.device_selector.setCurrentText(previous)
+            self.status_bar.showMessage(f"Found {len(devices)} ADB devices.", 3000)
+        else:
+            self.device_selector.addItem("No Devices Found")
             self.device_selector.setEnabled(False)
-            self.status_bar.showMessage(f"ADB device scan error: {e}", 3000)
+            self.status_bar.showMessage("No ADB devices connected.", 3000)
+        self.device_selector.blockSignals(False)
+
+    def _on_device_scan_failed(self, message):
+        self.discovered_devices = []
+        self.device_selector.clear()
+        self.device_selector.addItem("ADB Not Found" if "not found" in message else "Scan Error")
+        self.device_selector.setEnabled(False)
+        self.status_bar.showMessage(message, 3000)
+
+    def _stop_device_watcher(self):
+        self.device_watcher.stop()
+        if self.device_watcher.isRunning():
+            self.device_watcher.wait()
     
     def clear_logs(self):
         self._cancel_file_load()
@@ -989,8 +1842,11 @@ class LogAnalysisMainWindow(QMainWindow):
         self.runtime.loaded_file_path = None
         self._update_loaded_file_label()
         self.log_model.clear()
+        self._restart_search_scan()
+        self._stop_trigram_index_worker()
         self._update_log_column_width()
-        self.runtime.pending_chunks = []
+        self.runtime.pending_chunks.clear()
+        self._update_live_buffer_label()
         self.update_stats()
         self._reset_filter_counts()
         self.update_filter_counts_ui()
@@ -1005,16 +1861,76 @@ class LogAnalysisMainWindow(QMainWindow):
             self._flush_pending_chunks()
 
     def on_adb_chunk(self, lines):
+        source_id = getattr(self.sender(), "source_id", 0)
+        if self.runtime.recorder is not None:
+            self.runtime.recorder.write(lines, source_id)
+        if len(self.adb_threads) > 1:
+            # Several devices: coalesce their chunks and merge them by timestamp
+            # so the UI thread appends once per interval, not once per chunk.
+            self.runtime.live_merger.push(source_id, lines)
+            if not self.live_merge_timer.isActive():
+                self.live_merge_timer.start()
+            return
+
+        self._ingest_live_lines(lines, source_id)
+
+    def _drain_live_merger(self, final=False):
+        merger = self.runtime.live_merger
+        if not merger:
+            return
+
+        # Lines another device may still precede wait for the next interval.
+        lines, sources = merger.drain() if final else merger.release()
+        if merger and not final and not self.live_merge_timer.isActive():
+            self.live_merge_timer.start()
+        if lines:
+            self._ingest_live_lines(lines, sources)
+
+    def _ingest_live_lines(self, lines, sources):
         if self.runtime.is_paused or self.runtime.is_refiltering:
-            self.runtime.pending_chunks.append(lines)
+            self.runtime.pending_chunks.append(lines, sources)
+            self._update_live_buffer_label()
             return
 
-        self._apply_chunk_to_model(lines)
+        self._apply_chunk_to_model(lines, sources)
+
+    def on_adb_reconnecting(self, attempt, delay):
+        # The model, filters and pending buffers are left alone; the worker
+        # resumes with -T and drops the overlap before emitting.
+        label = self.log_model.source_labels.get(getattr(self.sender(), "source_id", 0), "device")
+        self.status_bar.showMessage(
+            f"{label}: logcat disconnected, reconnecting in {delay:g}s (attempt {attempt})..."
+        )
 
     def on_adb_error(self, message):
+        worker = self.sender()
+        if worker in self.retired_adb_threads:
+            return
+        if worker in self.adb_threads and len(self.adb_threads) > 1:
+            # One device failing should not stop the streams of the others.
+            self._retire_adb_worker(worker)
+            label = self.log_model.source_labels.get(getattr(worker, "source_id", 0), "device")
+            self.status_bar.showMessage(f"{label}: {message}", 5000)
+            return
+
         self.toggle_adb_monitoring() 
         QMessageBox.critical(self, "ADB Error", message)
 
+    def _retire_adb_worker(self, worker):
+        # The worker has no parent; keep it referenced until its thread has
+        # finished so it is not destroyed while still running.
+        self.adb_threads.remove(worker)
+        worker.finished.connect(self._on_retired_adb_worker_finished)
+        worker.stop()
+        if worker.isRunning():
+            self.retired_adb_threads.append(worker)
+
+    def _on_retired_adb_worker_finished(self):
+        worker = self.sender()
+        if worker in self.retired_adb_threads:
+            worker.wait()
+            self.retired_adb_threads.remove(worker)
+
     def rename_filter_tab(self):
         idx = self.filter_tabs.currentIndex()
         self.rename_filter_tab_by_index(idx)
@@ -1038,6 +1954,7 @@ class LogAnalysisMainWindow(QMainWindow):
         QMessageBox.information(self, "Shortcuts",
                                 "<b>Keyboard Shortcuts</b><br><br>"
                                 "<b>Ctrl+O</b>: Open File<br>"
+                                "<b>Ctrl+E</b>: Export Visible Lines<br>"
                                 "<b>Ctrl+S</b>: Save Filters<br>"
                                 "<b>Ctrl+Shift+S</b>: Save Filters As<br>"
                                 "<b>Ctrl+C</b>: Copy Selection<br>"
@@ -1172,13 +2089,56 @@ class LogAnalysisMainWindow(QMainWindow):
         if file_path:
             self._start_file_load(file_path)
 
+    def open_recorded_session(self):
+        if self.runtime.is_monitoring:
+            self.toggle_adb_monitoring()
+
+        directory = QFileDialog.getExistingDirectory(
+            self, "Open Recorded Session", self.runtime.recording_directory or ""
+        )
+        if not directory:
+            return
+
+        try:
+            lines = RecordedSessionLines(directory)
+        except (OSError, ValueError, KeyError) as error:
+            self.status_bar.showMessage(f"Error opening recorded session: {error}", 5000)
+            QMessageBox.warning(
+                self,
+                "Open Recorded Session Error",
+                f"Cannot open '{directory}':\n\n{error}",
+            )
+            return
+
+        # Only the indexes and per-line columns are read here; lines are
+        # decoded block by block on demand.
+        self._cancel_file_load()
+        self.log_model.source_labels = lines.source_labels
+        self.log_model.hidden_sources = set()
+        self._rebuild_source_filter_menu()
+        self.on_file_loaded(
+            self._next_file_load_request_id(), directory, lines, lines.line_lengths, sources=lines.line_sources
+        )
+
+    def _set_session_recording(self, enabled):
+        if not enabled:
+            self.runtime.recording_directory = None
+            return
+
+        directory = QFileDialog.getExistingDirectory(self, "Record Live Sessions To")
+        if not directory:
+            self.record_sessions_action.setChecked(False)
+            return
+        self.runtime.recording_directory = directory
+        self.status_bar.showMessage(f"Live sessions will be recorded to {directory}", 5000)
+
     def on_file_load_progress(self, request_id, file_path, bytes_read, total_bytes, line_count):
         if request_id != self.runtime.file_load_request_id or not self.runtime.is_loading_file:
             return
 
         self._update_file_load_progress_ui(file_path, bytes_read, total_bytes, line_count)
 
-    def on_file_loaded(self, request_id, file_path, lines):
+    def on_file_loaded(self, request_id, file_path, lines, line_lengths=None, sources=None):
         if request_id != self.runtime.file_load_request_id:
             return
 
@@ -1188,7 +2148,11 @@ class LogAnalysisMainWindow(QMainWindow):
         self._finish_file_load_ui()
         self.runtime.loaded_file_path = file_path
         self._update_loaded_file_label()
-        self.log_model.set_lines(lines)
+        self.log_model.set_lines(lines, sources, line_lengths=line_lengths)
+        self._restart_search_scan()
+        self._stop_trigram_index_worker()
+        if self.search_index_action.isChecked():
+            self._start_trigram_index()
         self._update_log_column_width()
         self.update_stats()
         self.runtime.pending_status_message = f"Loaded: {file_path} ({len(lines):,} lines)"
@@ -1320,21 +2284,8 @@ class LogAnalysisMainWindow(QMainWindow):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     loaded = json.load(f)
                 
-                loaded_set = []
-                tab_name = None
-                tab_enabled = True
-                
-                if isinstance(loaded, dict):
-                    loaded_set = loaded.get('filters', [])
-                    tab_name = loaded.get('name')
-                    tab_enabled = loaded.get('enabled', True)
-                elif isinstance(loaded, list):
-                    if len(loaded) > 0 and isinstance(loaded[0], dict) and 'filters' in loaded[0]:
-                        loaded_set = loaded[0]['filters']
-                        tab_name = loaded[0].get('name')
-                    else:
-                        loaded_set = loaded
-                
+                loaded_set, tab_name, tab_enabled = parse_filter_set(loaded)
+
                 if not loaded_set and not isinstance(loaded_set, list):
                     self.status_bar.showMessage("Invalid filter file format.")
                     return
@@ -1391,6 +2342,8 @@ class LogAnalysisMainWindow(QMainWindow):
 
     def apply_filters(self):
         self.log_model.filters = self._effective_model_filters()
+        self._invalidate_highlights()
+        self._update_logcat_pushdown()
         self.runtime.filter_map_back = {}
         
         flat_idx = 0
@@ -1420,6 +2373,9 @@ class LogAnalysisMainWindow(QMainWindow):
             row = current_idx.row()
             if row < len(self.log_model.visible_indices):
                 self.runtime.target_source_idx = self.log_model.visible_indices[row]
+        focus_idx = self.runtime.target_source_idx
+        if focus_idx == -1:
+            focus_idx = max(self._viewport_anchor_source_idx(), 0)
 
         self.runtime.is_refiltering = self.runtime.is_monitoring
         if not self.runtime.is_monitoring:
@@ -1429,11 +2385,71 @@ class LogAnalysisMainWindow(QMainWindow):
             self.log_model.all_lines, 
             all_filters_to_count, 
             self.log_model.show_only_filtered,
-            request_id
+            request_id,
+            self.log_model.line_sources,
+            self.log_model.hidden_sources,
+            previous_indices=self.log_model.visible_indices,
+            line_lengths=self.log_model.line_lengths,
+            focus_index=focus_idx,
+            trigram_index=self.log_model.trigram_index,
         )
+        self.filter_thread.partial_filtering.connect(self.on_filtering_progress)
         self.filter_thread.finished_filtering.connect(self.on_filtering_finished)
         self.filter_thread.start()
 
+    def _viewport_anchor_source_idx(self):
+        """Return the line index of the top visible row, or -1."""
+        top_index = self.log_view.indexAt(QPoint(0, 0))
+        if not top_index.isValid() or top_index.row() >= len(self.log_model.visible_indices):
+            return -1
+        return self.log_model.visible_indices[top_index.row()]
+
+    def _nearest_visible_row(self, source_idx):
+        visible_indices = self.log_model.visible_indices
+        if source_idx == -1 or not visible_indices:
+            return -1
+        pos = bisect.bisect_left(visible_indices, source_idx)
+        if pos >= len(visible_indices):
+            return len(visible_indices) - 1
+        if pos > 0:
+            dist_curr = visible_indices[pos] - source_idx
+            dist_prev = source_idx - visible_indices[pos - 1]
+            return pos if dist_curr <= dist_prev else pos - 1
+        return pos
+
+    def _restore_target_row(self):
+        new_row = self._nearest_visible_row(self.runtime.target_source_idx)
+        if new_row != -1:
+            model_idx = self.log_model.index(new_row, 0)
+            self.log_view.setCurrentIndex(model_idx)
+            self.log_view.scrollTo(model_idx, QAbstractItemView.PositionAtCenter)
+
+    def _restore_viewport_anchor(self, source_idx):
+        row = self._nearest_visible_row(source_idx)
+        if row != -1:
+            self.log_view.scrollTo(self.log_model.index(row, 0), QAbstractItemView.PositionAtTop)
+
+    def on_filtering_progress(self, request_id, rows):
+        if request_id != self.runtime.filter_request_id:
+            return
+
+        if self.runtime.partial_filter_request_id != request_id:
+            # First partial result: the rows around the focus line. It replaces
+            # the view so that region renders before the rest of the pass.
+            anchor_idx = self._viewport_anchor_source_idx()
+            self.runtime.partial_filter_request_id = request_id
+            self.log_model.update_visible_indices(rows)
+            self.runtime.partial_filter_rows = self.log_model.visible_indices
+            if self.runtime.target_source_idx != -1:
+                self._restore_target_row()
+            else:
+                self._restore_viewport_anchor(anchor_idx)
+        else:
+            self.log_model.append_visible_rows(rows)
+
+        if not self.runtime.is_monitoring:
+            self.status_bar.showMessage(f"Refiltering... {self.log_model.rowCount():,} rows so far")
+
     def on_filtering_finished(
         self,
         request_id,
@@ -1441,6 +2457,7 @@ class LogAnalysisMainWindow(QMainWindow):
         match_count,
         filter_counts=None,
         widest_visible_text="",
+        visible_diff=None,
     ):
         if request_id != self.runtime.filter_request_id:
             return
@@ -1449,26 +2466,37 @@ class LogAnalysisMainWindow(QMainWindow):
             self.filter_thread = None
 
         self.runtime.is_refiltering = False
-        self.log_model.update_visible_indices(visible_indices, widest_visible_text)
-        self._update_log_column_width()
-        
-        if self.runtime.target_source_idx != -1 and visible_indices:
-            pos = bisect.bisect_left(visible_indices, self.runtime.target_source_idx)
-            new_row = -1
-            if pos < len(visible_indices):
-                if pos > 0:
-                    dist_curr = visible_indices[pos] - self.runtime.target_source_idx
-                    dist_prev = self.runtime.target_source_idx - visible_indices[pos-1]
-                    new_row = pos if dist_curr <= dist_prev else pos - 1
-                else:
-                    new_row = pos
+        showed_partial = self.runtime.partial_filter_request_id == request_id
+        if visible_diff is not None and visible_diff.base is None:
+            # A progressive pass diffs against the rows it published to the view.
+            partial_rows = self.runtime.partial_filter_rows
+            if showed_partial and partial_rows is not None:
+                visible_diff = replace(visible_diff, base=partial_rows)
             else:
-                new_row = len(visible_indices) - 1
-            
-            if new_row != -1:
-                model_idx = self.log_model.index(new_row, 0)
-                self.log_view.setCurrentIndex(model_idx)
-                self.log_view.scrollTo(model_idx, QAbstractItemView.PositionAtCenter)
+                visible_diff = None
+        self.runtime.partial_filter_rows = None
+        anchor_idx = self._viewport_anchor_source_idx()
+        # Small changes go through row removes/inserts, which keep the view's
+        # selection and scroll position; large ones reset the model.
+        diff_applied = visible_diff is not None and self.log_model.apply_visible_diff(
+            visible_diff, widest_visible_text
+        )
+        if not diff_applied:
+            if showed_partial:
+                # The user may have moved while partial results were shown.
+                current_idx = self.log_view.currentIndex()
+                if current_idx.isValid() and current_idx.row() < len(self.log_model.visible_indices):
+                    self.runtime.target_source_idx = self.log_model.visible_indices[current_idx.row()]
+            self.log_model.update_visible_indices(visible_indices, widest_visible_text)
+        self._update_log_column_width()
+
+        if diff_applied:
+            # Rows inserted or removed above the viewport would otherwise shift it.
+            self._restore_viewport_anchor(anchor_idx)
+        elif self.runtime.target_source_idx != -1:
+            self._restore_target_row()
+        elif showed_partial:
+            self._restore_viewport_anchor(anchor_idx)
 
         self.update_stats()
         
@@ -1550,11 +2578,25 @@ class LogAnalysisMainWindow(QMainWindow):
                 self._cancel_file_load()
                 self._stop_filter_worker()
                 self._stop_adb_worker()
+                self._stop_device_watcher()
+                self._stop_highlight_worker()
+                self._stop_search_worker()
+                self._stop_find_index_worker()
+                self._stop_trigram_index_worker()
+                self._stop_export_worker()
+                self._stop_copy_worker()
                 event.accept()
             elif res == QMessageBox.Discard:
                 self._cancel_file_load()
                 self._stop_filter_worker()
                 self._stop_adb_worker()
+                self._stop_device_watcher()
+                self._stop_highlight_worker()
+                self._stop_search_worker()
+                self._stop_find_index_worker()
+                self._stop_trigram_index_worker()
+                self._stop_export_worker()
+                self._stop_copy_worker()
                 event.accept()
             else:
                 event.ignore()
@@ -1562,6 +2604,13 @@ class LogAnalysisMainWindow(QMainWindow):
             self._cancel_file_load()
             self._stop_filter_worker()
             self._stop_adb_worker()
+            self._stop_device_watcher()
+            self._stop_highlight_worker()
+            self._stop_search_worker()
+            self._stop_find_index_worker()
+            self._stop_trigram_index_worker()
+            self._stop_export_worker()
+            self._stop_copy_worker()
             event.accept()
 
     def resizeEvent(self, event):
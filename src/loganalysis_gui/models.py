@@ -1,7 +1,14 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import compress
+
 from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
 from PyQt5.QtGui import QColor, QFont
 from .constants import COLOR_MAP, TEXT_COLOR_MAP
 from .filter_engine import evaluate_line, find_matching_filters, prepare_filters
+from .highlight import filter_colors, match_snippet, search_hit_block, search_pattern
+from .live_merge import source_column
 
 
 def display_log_line_text(line_text):
@@ -11,15 +18,94 @@ def display_log_line_text(line_text):
 def measured_log_line_text(line_text):
     return display_log_line_text(line_text).rstrip()
 
+
+def display_row_text(line_text, line_index, show_line_numbers, source_label=None):
+    """Return a log row as the view shows it and copying puts it on the clipboard."""
+    text = display_log_line_text(line_text)
+    if source_label is not None:
+        text = f"[{source_label}] {text}"
+    if show_line_numbers:
+        return f"{line_index + 1:6d} | {text}"
+    return text
+
+
+def display_lines_text(lines, line_indices, show_line_numbers=True, line_sources=None, source_labels=None):
+    """Join the rows of ``line_indices`` with newlines, formatted like ``display_row_text``.
+
+    Sources are labelled only when ``source_labels`` names more than one, as
+    in the view. Qt-free, so large copies can run in a worker.
+    """
+    if not source_labels or len(source_labels) <= 1:
+        return "\n".join(
+            display_row_text(lines[line_index], line_index, show_line_numbers) for line_index in line_indices
+        )
+    source_count = len(line_sources)
+    return "\n".join(
+        display_row_text(
+            lines[line_index],
+            line_index,
+            show_line_numbers,
+            _source_label(line_sources, source_labels, line_index, source_count),
+        )
+        for line_index in line_indices
+    )
+
+
+def _source_label(line_sources, source_labels, line_index, source_count):
+    source_id = line_sources[line_index] if line_index < source_count else 0
+    return source_labels.get(source_id, str(source_id))
+
+
+# Lines no filter matched are drawn dimmed.
+UNMATCHED_TEXT_COLOR = "#808080"
+
+
+# Visible rows are stored as 4-byte line indices instead of list entries, which
+# cost a pointer plus an int object each.
+VISIBLE_INDEX_TYPECODE = "I"
+
+
+def visible_index_array(indices=()):
+    """Return ``indices`` as a visible-row array, reusing it when it already is one."""
+    if isinstance(indices, array) and indices.typecode == VISIBLE_INDEX_TYPECODE:
+        return indices
+    return array(VISIBLE_INDEX_TYPECODE, indices)
+
+
+def measured_line_lengths(lines):
+    """Return the measured length of every line as ``LogModel.line_lengths`` stores it."""
+    # rstrip() drops the line ending together with trailing blanks, exactly
+    # like measured_log_line_text, but map keeps the loop in C.
+    return array("I", map(len, map(str.rstrip, lines)))
+
+
+def widest_line_index(line_lengths, indices):
+    """Return the entry of ``indices`` with the longest measured line, or -1."""
+    if not indices:
+        return -1
+    widths = array("I", map(line_lengths.__getitem__, indices))
+    return indices[widths.index(max(widths))]
+
+
 class LogModel(QAbstractListModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.all_lines = [] 
-        self.visible_indices = [] 
+        self.line_sources = array("H")
+        self.source_labels = {}
+        self.hidden_sources = set()
+        self.visible_indices = visible_index_array()
         self.filters = []
         self.show_line_numbers = True
         self.show_only_filtered = True
         self.font = QFont("Monospace", 10) # Default size 10
+        self.line_lengths = array("I")
+        # Lines that are longer than every line after them, as absolute line
+        # numbers (``_first_line_number`` is all_lines[0]). The front is the
+        # longest line, and trimming only pops from the front. None until a
+        # trim first needs it.
+        self._longest_lines = None
+        self._first_line_number = 0
         self.max_line_length = 0
         self.longest_line_text = ""
         self.visible_max_line_length = 0
@@ -27,6 +113,20 @@ class LogModel(QAbstractListModel):
         self.search_query = ""
         self.search_case = False
         self.search_regex = False
+        self.search_re = None
+        # One byte per stored line, 1 for find hits, filled by SearchWorker
+        # from the front; lines past its end have not been scanned yet.
+        self.search_hits = bytearray()
+        # Line indices of the hits in ``search_hits``, ascending (Find All).
+        self.search_hit_lines = array("I")
+        # Bumped whenever scanned hits stop being valid for the line store.
+        self.search_generation = 0
+        # When the query narrows a plain-text search, only the previous hits
+        # below ``search_candidate_stop`` can still match; see set_search.
+        self.search_candidates = None
+        self.search_candidate_stop = 0
+        # Optional TrigramIndex over exactly ``all_lines``; see trigram_index.py.
+        self.trigram_index = None
         self.is_dark_theme = True
 
     def _display_text(self, line_text):
@@ -40,46 +140,110 @@ class LogModel(QAbstractListModel):
             self.visible_max_line_length = len(measured_text)
             self.visible_longest_line_text = measured_text
 
-    def _update_longest_line(self, lines):
-        for line in lines:
-            measured_text = self._measured_text(line)
-            measured_length = len(measured_text)
-            if measured_length > self.max_line_length:
-                self.max_line_length = measured_length
-                self.longest_line_text = measured_text
+    def _set_longest_line(self, index):
+        if index < 0:
+            self.max_line_length = 0
+            self.longest_line_text = ""
+        else:
+            self.max_line_length = self.line_lengths[index]
+            self.longest_line_text = self._measured_text(self.all_lines[index])
+
+    def _track_longest_lines(self, start):
+        candidates = self._longest_lines
+        if candidates is None:
+            return
+        lengths = self.line_lengths
+        base = self._first_line_number
+        for index in range(start, len(lengths)):
+            length = lengths[index]
+            while candidates and lengths[candidates[-1] - base] <= length:
+                candidates.pop()
+            candidates.append(base + index)
+
+    def _ensure_longest_lines(self):
+        if self._longest_lines is None:
+            self._longest_lines = deque()
+            self._track_longest_lines(0)
+        return self._longest_lines
 
     def _find_longest_visible_text(self, indices):
-        longest_text = ""
-        longest_length = 0
-        for index in indices:
-            if index >= len(self.all_lines):
-                continue
-            measured_text = self._measured_text(self.all_lines[index])
-            measured_length = len(measured_text)
-            if measured_length > longest_length:
-                longest_length = measured_length
-                longest_text = measured_text
-        return longest_text
+        # Indices past the stored lines (stale callers) are ignored.
+        indices = indices[:bisect_left(indices, len(self.line_lengths))]
+        index = widest_line_index(self.line_lengths, indices)
+        return self._measured_text(self.all_lines[index]) if index >= 0 else ""
          
     def rowCount(self, parent=QModelIndex()):
         return len(self.visible_indices)
 
-    def _is_search_match(self, line):
-        if not self.search_query:
+    @property
+    def first_line_number(self):
+        """Absolute number of ``all_lines[0]``; grows as live trims drop lines."""
+        return self._first_line_number
+
+    def set_search(self, query, case, regex):
+        """Make ``query`` the find query and restart its hit scan.
+
+        A plain-text query that contains the previous plain-text query with the
+        same case setting keeps the previous hits as scan candidates, so typing
+        further into the Find box only rescans lines that already matched.
+        """
+        refines = (
+            self.search_re is not None
+            and not regex
+            and not self.search_regex
+            and case == self.search_case
+            and self.search_query in query
+        )
+        previous_hits = self.search_hit_lines
+        previous_scanned = len(self.search_hits)
+        self.search_query = query
+        self.search_case = case
+        self.search_regex = regex
+        self.search_re = search_pattern(query, case, regex)
+        self._reset_search_hits()
+        if refines and self.search_re is not None:
+            self.search_candidates = previous_hits
+            self.search_candidate_stop = previous_scanned
+
+    @property
+    def search_hit_count(self):
+        return len(self.search_hit_lines)
+
+    def _reset_search_hits(self):
+        self.search_generation += 1
+        self.search_hits = bytearray()
+        self.search_hit_lines = array("I")
+        self.search_candidates = None
+        self.search_candidate_stop = 0
+
+    def _append_search_hits(self, hits):
+        start = len(self.search_hits)
+        self.search_hits.extend(hits)
+        self.search_hit_lines.extend(compress(range(start, start + len(hits)), hits))
+
+    def search_scan_complete(self):
+        return self.search_re is None or len(self.search_hits) >= len(self.all_lines)
+
+    def add_search_hits(self, generation, first_line_number, hits):
+        """Append a block of scanned hits; returns False when it does not apply.
+
+        Blocks from an older search or line store are dropped, and the part of
+        a block that covers already-trimmed lines is skipped.
+        """
+        if generation != self.search_generation:
             return False
-        
-        if self.search_regex:
-            try:
-                from .filter_engine import get_compiled_regex
-                regex = get_compiled_regex(self.search_query, self.search_case)
-                return bool(regex.search(line))
-            except Exception:
-                return False
-        else:
-            if self.search_case:
-                return self.search_query in line
-            else:
-                return self.search_query.lower() in line.lower()
+        start = first_line_number - self._first_line_number
+        if start < 0:
+            hits = hits[-start:]
+            start = 0
+        if start != len(self.search_hits) or not hits:
+            return False
+        self._append_search_hits(hits)
+        return True
+
+    def is_search_hit(self, line_index):
+        hits = self.search_hits
+        return line_index < len(hits) and hits[line_index] == 1
 
     def data(self, index, role):
         if not index.isValid():
@@ -93,16 +257,14 @@ class LogModel(QAbstractListModel):
         line_text = self.all_lines[real_idx]
 
         if role == Qt.DisplayRole:
-            clean_text = self._display_text(line_text)
-            if self.show_line_numbers:
-                return f"{real_idx + 1:6d} | {clean_text}"
-            return clean_text
+            source_label = self._source_label(real_idx) if len(self.source_labels) > 1 else None
+            return display_row_text(line_text, real_idx, self.show_line_numbers, source_label)
 
         if role == Qt.FontRole:
             return self.font
 
         if role == Qt.BackgroundRole:
-            if self.search_query and self._is_search_match(line_text):
+            if self.search_query and self.is_search_hit(real_idx):
                 return QColor("#3E2723") if self.is_dark_theme else QColor("#FFF9C4")
             return self._get_color(line_text, role)
 
@@ -115,6 +277,8 @@ class LogModel(QAbstractListModel):
                 tip = "<b>Matching Filters:</b><br/>"
                 for m in matches:
                     prefix = "[REGEX]" if m["regex"] else "[TEXT]"
+                    if m.get("field", "line") != "line":
+                        prefix += f"[{m['field'].upper()}]"
                     options = []
                     if m["bg_color"] != "None": options.append(f"BG: {m['bg_color']}")
                     if m.get("text_color", "None") != "None": options.append(f"FG: {m['text_color']}")
@@ -127,6 +291,17 @@ class LogModel(QAbstractListModel):
 
         return None
 
+    def _source_label(self, real_idx):
+        return _source_label(self.line_sources, self.source_labels, real_idx, len(self.line_sources))
+
+    def display_text_options(self):
+        """Keyword arguments that make ``display_lines_text`` format rows like ``data``."""
+        return {
+            "show_line_numbers": self.show_line_numbers,
+            "line_sources": self.line_sources,
+            "source_labels": dict(self.source_labels),
+        }
+
     def _get_matching_filters(self, line):
         prepared_filters = prepare_filters(self.filters)
         return [matched.filter_data for matched in find_matching_filters(line, prepared_filters)]
@@ -135,27 +310,12 @@ class LogModel(QAbstractListModel):
         matches = self._get_matching_filters(line)
         if not matches:
             if role == Qt.ForegroundRole:
-                return QColor("#808080")
+                return QColor(UNMATCHED_TEXT_COLOR)
             return None
-            
-        bg_result = None
-        fg_result = None
-        
-        # Priority: Last active non-exclude filter wins for colors.
-        # If any match is an exclude, it might have been hidden by the worker, 
-        # but here we just return default if the highest priority match is an exclude.
-        for ftr in reversed(matches):
-            if ftr["exclude"]:
-                return None # Exclude wins priority
-            
-            if bg_result is None and ftr["bg_color"] != "None":
-                bg_result = ftr["bg_color"]
-            if fg_result is None and ftr.get("text_color", "None") != "None":
-                fg_result = ftr["text_color"]
-            
-            if bg_result and fg_result:
-                break
 
+        # Last active non-exclude filter wins for colors; an exclude at the top
+        # of the matches clears them.
+        bg_result, fg_result = filter_colors(matches)
         if role == Qt.BackgroundRole and bg_result:
             return QColor(COLOR_MAP.get(bg_result, bg_result))
         if role == Qt.ForegroundRole:
@@ -165,15 +325,48 @@ class LogModel(QAbstractListModel):
             
         return None
 
-    def set_lines(self, lines):
+    def set_lines(self, lines, sources=None, line_lengths=None):
         self.beginResetModel()
         self.all_lines = lines
-        self.visible_indices = list(range(len(lines)))
-        self.max_line_length = 0
-        self.longest_line_text = ""
-        self.visible_max_line_length = 0
-        self.visible_longest_line_text = ""
-        self._update_longest_line(lines)
+        self.line_sources = source_column(sources, len(lines))
+        self.line_lengths = line_lengths if line_lengths is not None else measured_line_lengths(lines)
+        self._longest_lines = None
+        self._first_line_number = 0
+        self.trigram_index = None
+        self._reset_search_hits()
+        self.visible_indices = visible_index_array(range(len(lines)))
+        self._set_longest_line(self.line_lengths.index(max(self.line_lengths)) if lines else -1)
+        self.visible_max_line_length = self.max_line_length
+        self.visible_longest_line_text = self.longest_line_text
+        self.endResetModel()
+
+    def trim_front(self, count):
+        """Drop the oldest ``count`` lines and show every remaining line.
+
+        The longest remaining line comes from the monotonic candidate queue,
+        so trimming never re-measures the buffer.
+        """
+        candidates = self._ensure_longest_lines()
+        self.beginResetModel()
+        # New containers rather than in-place deletes: a filter pass that is
+        # still winding down may hold the old ones.
+        self.all_lines = self.all_lines[count:]
+        self.line_sources = self.line_sources[count:]
+        self.line_lengths = self.line_lengths[count:]
+        self.trigram_index = None
+        self.search_hits = self.search_hits[count:]
+        self.search_hit_lines = array("I", (
+            line_index - count
+            for line_index in self.search_hit_lines[bisect_left(self.search_hit_lines, count):]
+        ))
+        # Scans that resume after a trim simply match every line again.
+        self.search_candidates = None
+        self.search_candidate_stop = 0
+        self._first_line_number += count
+        while candidates and candidates[0] < self._first_line_number:
+            candidates.popleft()
+        self.visible_indices = visible_index_array(range(len(self.all_lines)))
+        self._set_longest_line(candidates[0] - self._first_line_number if candidates else -1)
         self.visible_max_line_length = self.max_line_length
         self.visible_longest_line_text = self.longest_line_text
         self.endResetModel()
@@ -185,15 +378,62 @@ class LogModel(QAbstractListModel):
             widest_visible_text = self._measured_text(widest_visible_text)
 
         self.beginResetModel()
-        self.visible_indices = indices
+        self.visible_indices = visible_index_array(indices)
         self.visible_max_line_length = len(widest_visible_text)
         self.visible_longest_line_text = widest_visible_text
         self.endResetModel()
+
+    def append_visible_rows(self, indices):
+        """Append rows of a still-running refilter; widths follow with the final result."""
+        if not indices:
+            return
+        first_row = len(self.visible_indices)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(indices) - 1)
+        self.visible_indices.extend(indices)
+        self.endInsertRows()
+
+    def apply_visible_diff(self, visible_diff, widest_visible_text=None):
+        """Apply a ``VisibleDiff`` as row removes/inserts instead of a reset.
+
+        Views keep their selection, current index and scroll position. Returns
+        False without touching the model when the diff was computed against
+        rows that have changed since.
+        """
+        if (
+            visible_diff.base is not self.visible_indices
+            or visible_diff.base_count != len(self.visible_indices)
+        ):
+            return False
+
+        rows = self.visible_indices
+        parent = QModelIndex()
+        for first_row, last_row in reversed(visible_diff.removed):
+            self.beginRemoveRows(parent, first_row, last_row)
+            del rows[first_row:last_row + 1]
+            self.endRemoveRows()
+        for first_row, line_indices in visible_diff.inserted:
+            self.beginInsertRows(parent, first_row, first_row + len(line_indices) - 1)
+            rows[first_row:first_row] = visible_index_array(line_indices)
+            self.endInsertRows()
+
+        if widest_visible_text is None:
+            widest_visible_text = self._find_longest_visible_text(rows)
+        else:
+            widest_visible_text = self._measured_text(widest_visible_text)
+        self.visible_max_line_length = len(widest_visible_text)
+        self.visible_longest_line_text = widest_visible_text
+        return True
     
     def clear(self):
         self.beginResetModel()
         self.all_lines = []
-        self.visible_indices = []
+        self.line_sources = array("H")
+        self.line_lengths = array("I")
+        self._longest_lines = None
+        self._first_line_number = 0
+        self.trigram_index = None
+        self._reset_search_hits()
+        self.visible_indices = visible_index_array()
         self.max_line_length = 0
         self.longest_line_text = ""
         self.visible_max_line_length = 0
@@ -207,18 +447,29 @@ class LogModel(QAbstractListModel):
         self.font.setPointSize(size)
         self.layoutChanged.emit()
         
-    def append_chunk(self, lines):
+    def append_chunk(self, lines, sources=None):
         start_real_idx = len(self.all_lines)
+        sources = source_column(sources, len(lines))
         self.all_lines.extend(lines)
-        self._update_longest_line(lines)
+        self.line_sources.extend(sources)
+        self.line_lengths.extend(measured_line_lengths(lines))
+        self._track_longest_lines(start_real_idx)
+        if self.search_re is not None and len(self.search_hits) == start_real_idx:
+            # Caught up with the scan: live lines are checked as they arrive.
+            self._append_search_hits(search_hit_block(lines, self.search_re))
+        longest_new_idx = widest_line_index(self.line_lengths, range(start_real_idx, len(self.all_lines)))
+        if longest_new_idx >= 0 and self.line_lengths[longest_new_idx] > self.max_line_length:
+            self._set_longest_line(longest_new_idx)
+        hidden_sources = self.hidden_sources
         
         # Calculate visibility
         new_indices = []
-        widest_new_visible_text = ""
-        widest_new_visible_length = 0
         prepared_filters = prepare_filters(self.filters)
         
         for i, line in enumerate(lines):
+            if hidden_sources and sources[i] in hidden_sources:
+                continue
+
             real_idx = start_real_idx + i
             matching_filters, is_visible = evaluate_line(
                 line,
@@ -231,18 +482,63 @@ class LogModel(QAbstractListModel):
 
             if is_visible:
                 new_indices.append(real_idx)
-                measured_text = self._measured_text(line)
-                measured_length = len(measured_text)
-                if measured_length > widest_new_visible_length:
-                    widest_new_visible_length = measured_length
-                    widest_new_visible_text = measured_text
 
         if new_indices:
             first_row_idx = len(self.visible_indices)
             self.beginInsertRows(QModelIndex(), first_row_idx, first_row_idx + len(new_indices) - 1)
             self.visible_indices.extend(new_indices)
             self.endInsertRows()
-            if widest_new_visible_length:
-                self._update_visible_longest_line(widest_new_visible_text)
+            widest_new_idx = widest_line_index(self.line_lengths, new_indices)
+            if self.line_lengths[widest_new_idx] > self.visible_max_line_length:
+                self._update_visible_longest_line(self._measured_text(self.all_lines[widest_new_idx]))
             return True
         return False
+
+
+class FindResultsModel(QAbstractListModel):
+    """Find All results: one row per hit in ``LogModel.search_hit_lines``.
+
+    Rows store nothing but the line index; the snippet around the match is cut
+    when a row is displayed, so results cost four bytes per hit however long
+    the lines are. ``sync`` publishes hits that arrived since the last call.
+    """
+
+    def __init__(self, log_model, parent=None):
+        super().__init__(parent)
+        self.log_model = log_model
+        self.hit_lines = array("I")
+        self._row_count = 0
+        # Trims and new line stores invalidate every stored line index.
+        log_model.modelReset.connect(self.sync)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def sync(self):
+        hit_lines = self.log_model.search_hit_lines
+        if hit_lines is not self.hit_lines or len(hit_lines) < self._row_count:
+            self.beginResetModel()
+            self.hit_lines = hit_lines
+            self._row_count = len(hit_lines)
+            self.endResetModel()
+        elif len(hit_lines) > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, len(hit_lines) - 1)
+            self._row_count = len(hit_lines)
+            self.endInsertRows()
+
+    def line_index(self, row):
+        return self.hit_lines[row] if 0 <= row < self._row_count else -1
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+        line_index = self.line_index(index.row())
+        if line_index < 0 or line_index >= len(self.log_model.all_lines):
+            return None
+
+        if role == Qt.DisplayRole:
+            snippet = match_snippet(self.log_model.all_lines[line_index], self.log_model.search_re)
+            return f"{line_index + 1:8d} | {snippet}"
+        if role == Qt.FontRole:
+            return self.log_model.font
+        return None
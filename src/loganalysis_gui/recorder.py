@@ -0,0 +1,332 @@
+"""Rolling on-disk recording of live sessions.
+
+A session directory holds ``index.json`` (format version and source labels)
+and gzip segments. Every segment is a series of independently compressed gzip
+members ("blocks"); concatenated members are still a valid ``.gz`` file. Each
+segment has its own ``.json`` index with every block's compressed offset, so a
+reader can decode one block without touching the rest, plus ``.sources`` and
+``.lengths`` files with the source id and measured length of every line.
+"""
+import bisect
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+
+from .live_merge import source_column, threadtime_sort_key
+from .models import measured_line_lengths
+
+RECORDING_INDEX_NAME = "index.json"
+RECORDING_INDEX_VERSION = 2
+RECORDING_SEGMENT_LINES = 200000
+RECORDING_BLOCK_LINES = 10000
+# A slow stream still reaches the disk after this many idle seconds.
+RECORDING_FLUSH_SECONDS = 2.0
+UNREADABLE_LINE = "<unreadable recorded block>\n"
+
+_STOP = object()
+
+
+def _segment_name(number):
+    return f"segment-{number:05d}.log.gz"
+
+
+def _segment_path(directory, file_name, suffix):
+    """Path of a segment's side file (``.json`` index, ``.sources`` or ``.lengths``)."""
+    return os.path.join(directory, file_name[:-len(".log.gz")] + suffix)
+
+
+def _write_json(path, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=1)
+    os.replace(temp_path, path)
+
+
+def _read_column(path, typecode, count):
+    """Read up to ``count`` entries of a side file; fewer if it is short or missing."""
+    column = array(typecode)
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read(count * column.itemsize)
+    except OSError:
+        data = b""
+    column.frombytes(data[:len(data) - len(data) % column.itemsize])
+    return column
+
+
+class SessionRecorder:
+    """Writes live lines to rolling compressed segments on a background thread.
+
+    ``write`` only enqueues the chunk, so ingestion never waits on compression
+    or disk I/O. Each flushed block rewrites only its own segment's index, so
+    the cost of a flush does not grow with the length of the session.
+    """
+
+    def __init__(
+        self,
+        directory,
+        *,
+        segment_lines=RECORDING_SEGMENT_LINES,
+        block_lines=RECORDING_BLOCK_LINES,
+        flush_seconds=RECORDING_FLUSH_SECONDS,
+        source_labels=None,
+    ):
+        self.directory = directory
+        self.segment_lines = max(segment_lines, 1)
+        self.block_lines = max(min(block_lines, self.segment_lines), 1)
+        self.flush_seconds = flush_seconds
+        self.error = None
+        self.lines_written = 0
+
+        os.makedirs(directory, exist_ok=True)
+        _write_json(
+            os.path.join(directory, RECORDING_INDEX_NAME),
+            {
+                "version": RECORDING_INDEX_VERSION,
+                "sources": {str(source_id): label for source_id, label in (source_labels or {}).items()},
+            },
+        )
+        self._queue = queue.SimpleQueue()
+        self._segment_count = 0
+        self._segment = None
+        self._segment_file = None
+        self._sources_file = None
+        self._lengths_file = None
+        self._block = []
+        self._block_sources = array("H")
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    def write(self, lines, sources=None):
+        """Queue ``lines``; ``sources`` is one source id or one per line, as for ``LogModel``."""
+        if lines:
+            # Every stored line ends with a newline so blocks split back exactly.
+            self._queue.put(
+                (
+                    [line if line.endswith("\n") else line + "\n" for line in lines],
+                    source_column(sources, len(lines)),
+                )
+            )
+
+    def close(self):
+        """Flush everything queued so far and finish the current segment."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                chunk = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                if self.error is None:
+                    try:
+                        self._flush_block()
+                    except OSError as error:
+                        self.error = error
+                continue
+            if chunk is _STOP:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self._append(*chunk)
+            except OSError as error:
+                self.error = error
+        try:
+            self._flush_block()
+            self._close_segment()
+        except OSError as error:
+            self.error = self.error or error
+
+    def _append(self, lines, sources):
+        position = 0
+        while position < len(lines):
+            segment = self._current_segment()
+            room = min(
+                self.block_lines - len(self._block),
+                self.segment_lines - segment["line_count"] - len(self._block),
+            )
+            self._block.extend(lines[position:position + room])
+            self._block_sources.extend(sources[position:position + room])
+            position += room
+            if len(self._block) >= self.block_lines or (
+                segment["line_count"] + len(self._block) >= self.segment_lines
+            ):
+                self._flush_block()
+            if self._segment["line_count"] >= self.segment_lines:
+                self._close_segment()
+
+    def _current_segment(self):
+        if self._segment_file is None:
+            file_name = _segment_name(self._segment_count)
+            self._segment_count += 1
+            self._segment_file = open(os.path.join(self.directory, file_name), "wb")
+            self._sources_file = open(_segment_path(self.directory, file_name, ".sources"), "wb")
+            self._lengths_file = open(_segment_path(self.directory, file_name, ".lengths"), "wb")
+            self._segment = {
+                "file": file_name,
+                "first_line": self.lines_written,
+                "line_count": 0,
+                "first_timestamp": None,
+                "last_timestamp": None,
+                # [line within segment, compressed offset, compressed length]
+                "blocks": [],
+            }
+        return self._segment
+
+    def _flush_block(self):
+        if not self._block:
+            return
+        segment = self._current_segment()
+        lines = self._block
+        sources = self._block_sources
+        self._block = []
+        self._block_sources = array("H")
+
+        payload = "".join(lines).encode("utf-8", errors="replace")
+        data = gzip.compress(payload, compresslevel=1)
+        offset = self._segment_file.tell()
+        self._segment_file.write(data)
+        self._segment_file.flush()
+        self._sources_file.write(sources.tobytes())
+        self._sources_file.flush()
+        # Measured here so reopening the session does not decode every line.
+        self._lengths_file.write(measured_line_lengths(lines).tobytes())
+        self._lengths_file.flush()
+
+        segment["blocks"].append([segment["line_count"], offset, len(data)])
+        segment["line_count"] += len(lines)
+        self.lines_written += len(lines)
+        timestamps = [stamp for stamp in map(threadtime_sort_key, (lines[0], lines[-1])) if stamp]
+        if timestamps:
+            if segment["first_timestamp"] is None:
+                segment["first_timestamp"] = timestamps[0]
+            segment["last_timestamp"] = timestamps[-1]
+        self._write_segment_index()
+
+    def _close_segment(self):
+        if self._segment_file is None:
+            return
+        self._segment_file.close()
+        self._sources_file.close()
+        self._lengths_file.close()
+        self._segment_file = None
+        self._sources_file = None
+        self._lengths_file = None
+        self._write_segment_index()
+
+    def _write_segment_index(self):
+        segment = self._segment
+        _write_json(_segment_path(self.directory, segment["file"], ".json"), segment)
+
+
+class RecordedSessionLines:
+    """Read-only, lazily decoded sequence over a recorded session.
+
+    Opening only reads the index files and the per-line source ids and
+    lengths. Lines are decoded one block at a time on access, with a small
+    cache shared by the UI and worker threads.
+    """
+
+    def __init__(self, directory, *, cache_blocks=8):
+        self.directory = directory
+        with open(os.path.join(directory, RECORDING_INDEX_NAME), "r", encoding="utf-8") as handle:
+            index = json.load(handle)
+        if index.get("version") != RECORDING_INDEX_VERSION:
+            raise ValueError(f"Unsupported recording index version: {index.get('version')}")
+
+        self.source_labels = {int(source_id): label for source_id, label in index.get("sources", {}).items()}
+        self.segments = []
+        for path in glob.glob(os.path.join(glob.escape(directory), "segment-*.json")):
+            with open(path, "r", encoding="utf-8") as handle:
+                self.segments.append(json.load(handle))
+        self.segments.sort(key=lambda segment: segment["first_line"])
+
+        # (first line, segment file, compressed offset, compressed length) per block.
+        self._blocks = []
+        self._block_starts = []
+        for segment in self.segments:
+            for line_in_segment, offset, length in segment["blocks"]:
+                first_line = segment["first_line"] + line_in_segment
+                self._block_starts.append(first_line)
+                self._blocks.append((first_line, segment["file"], offset, length))
+        self._length = sum(segment["line_count"] for segment in self.segments)
+        self._cache = OrderedDict()
+        self._cache_blocks = max(cache_blocks, 1)
+        self._lock = threading.Lock()
+
+        # Per-line columns for LogModel.set_lines, read without decoding a block.
+        self.line_sources = array("H")
+        self.line_lengths = array("I")
+        for segment in self.segments:
+            count = segment["line_count"]
+            sources = _read_column(_segment_path(directory, segment["file"], ".sources"), "H", count)
+            self.line_sources.extend(sources)
+            self.line_sources.extend(array("H", [0]) * (count - len(sources)))
+            lengths = _read_column(_segment_path(directory, segment["file"], ".lengths"), "I", count)
+            if len(lengths) < count:
+                # A damaged segment is measured from whatever still decodes.
+                first_line = segment["first_line"]
+                lengths = measured_line_lengths(self[first_line:first_line + count])
+            self.line_lengths.extend(lengths)
+
+    def __len__(self):
+        return self._length
+
+    def _decode_block(self, block_number):
+        first_line, file_name, offset, length = self._blocks[block_number]
+        if block_number + 1 < len(self._block_starts):
+            line_count = self._block_starts[block_number + 1] - first_line
+        else:
+            line_count = self._length - first_line
+        try:
+            with open(os.path.join(self.directory, file_name), "rb") as handle:
+                handle.seek(offset)
+                data = handle.read(length)
+            text = zlib.decompressobj(wbits=31).decompress(data).decode("utf-8", errors="replace")
+        except (OSError, zlib.error):
+            text = ""
+        lines = [line + "\n" for line in text.split("\n")[:-1]]
+        if len(lines) != line_count:
+            # A deleted or damaged segment must not shift the lines after it.
+            lines = (lines + [UNREADABLE_LINE] * line_count)[:line_count]
+        return lines
+
+    def _block_lines(self, block_number):
+        with self._lock:
+            lines = self._cache.get(block_number)
+            if lines is not None:
+                self._cache.move_to_end(block_number)
+                return lines
+        lines = self._decode_block(block_number)
+        with self._lock:
+            self._cache[block_number] = lines
+            while len(self._cache) > self._cache_blocks:
+                self._cache.popitem(last=False)
+        return lines
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("recorded line index out of range")
+        block_number = bisect.bisect_right(self._block_starts, index) - 1
+        return self._block_lines(block_number)[index - self._blocks[block_number][0]]
+
+    def __iter__(self):
+        # Full passes (filtering, width scans) stream block by block and leave
+        # the random-access cache to the view.
+        for block_number in range(len(self._blocks)):
+            yield from self._decode_block(block_number)
+
+    def __bool__(self):
+        return self._length > 0
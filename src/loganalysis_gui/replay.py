@@ -0,0 +1,231 @@
+"""Replays a recorded log file as if it were a live ``adb logcat`` stream.
+
+The pacing here is Qt-free so it can drive both ``ReplayWorker`` (in-process,
+through the same ``chunk_ready`` signal as ``AdbWorker``) and the ``adb``
+stand-in script in ``scripts/adb``, which lets the real ``AdbWorker`` read a
+replayed stream through a pipe.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+REPLAY_REALTIME = "realtime"
+REPLAY_RATE = "rate"
+REPLAY_FAST = "fast"
+REPLAY_MODES = (REPLAY_REALTIME, REPLAY_RATE, REPLAY_FAST)
+REPLAY_SERIAL = "replay"
+# The recorded file stands in for the main buffer; these -b values include it.
+_REPLAYED_BUFFERS = frozenset(("main", "default", "all"))
+
+# Days before each month in a leap year; threadtime stamps carry no year, and
+# only the differences between consecutive lines matter for pacing.
+_MONTH_OFFSETS = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+
+
+def threadtime_seconds(line):
+    """Return seconds since Jan 1 for a ``-v threadtime`` line, or None."""
+    if len(line) < 18 or line[2] != "-" or line[5] != " " or line[14] != ".":
+        return None
+    try:
+        month = int(line[0:2])
+        day = int(line[3:5])
+        hours = int(line[6:8])
+        minutes = int(line[9:11])
+        seconds = int(line[12:14])
+        millis = int(line[15:18])
+    except ValueError:
+        return None
+    if not 1 <= month <= 12:
+        return None
+    days = _MONTH_OFFSETS[month - 1] + day - 1
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds + millis / 1000.0
+
+
+class ReplayPacer:
+    """Turns an iterable of lines into paced chunks.
+
+    ``realtime`` schedules each line at its logcat timestamp (scaled by
+    ``speed``), ``rate`` schedules ``rate`` lines per second and ``fast`` does
+    not wait at all. Lines that are already due when the pacer wakes up are
+    batched together, up to ``chunk_size``, so a rate above what the consumer
+    sustains turns into bigger chunks instead of an ever-growing lag.
+    """
+
+    def __init__(
+        self,
+        mode=REPLAY_FAST,
+        *,
+        rate=1000.0,
+        speed=1.0,
+        chunk_size=100,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if mode == REPLAY_RATE and rate <= 0:
+            raise ValueError("Replay rate must be positive.")
+        if mode == REPLAY_REALTIME and speed <= 0:
+            raise ValueError("Replay speed must be positive.")
+        self.mode = mode
+        self.rate = rate
+        self.speed = speed
+        self.chunk_size = max(chunk_size, 1)
+        self.clock = clock
+        self.sleep = sleep
+
+    def _due_times(self, lines, start):
+        if self.mode == REPLAY_FAST:
+            for line in lines:
+                yield None, line
+        elif self.mode == REPLAY_RATE:
+            interval = 1.0 / self.rate
+            for index, line in enumerate(lines):
+                yield start + index * interval, line
+        else:
+            first = None
+            last = None
+            for line in lines:
+                stamp = threadtime_seconds(line)
+                if stamp is None or (last is not None and stamp < last):
+                    # Continuation lines and clock steps backwards replay immediately.
+                    stamp = last
+                if stamp is not None and first is None:
+                    first = stamp
+                last = stamp
+                yield (None if stamp is None else start + (stamp - first) / self.speed), line
+
+    def chunks(self, lines):
+        chunk = []
+        clock = self.clock
+        for due, line in self._due_times(lines, clock()):
+            if due is not None and due > clock():
+                if chunk:
+                    yield chunk
+                    chunk = []
+                delay = due - clock()
+                if delay > 0:
+                    self.sleep(delay)
+            chunk.append(line)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_log_lines(file_path, loops=1):
+    """Yield the lines of ``file_path`` ``loops`` times (0 repeats forever)."""
+    repeats = itertools.count() if loops <= 0 else range(loops)
+    for _ in repeats:
+        with open(file_path, "r", encoding="utf-8", errors="replace", newline="") as handle:
+            yield from handle
+
+
+def lines_from(lines, start_time):
+    """Skip ``lines`` until the first one stamped at or after ``start_time``, like ``logcat -T``."""
+    start = threadtime_seconds(start_time)
+    if start is None:
+        return lines
+    return itertools.dropwhile(lambda line: (threadtime_seconds(line) or -1.0) < start, lines)
+
+
+def replays_buffers(buffers):
+    """True when ``-b`` values (repeated or comma separated) select the main buffer."""
+    if not buffers:
+        return True
+    return any(name in _REPLAYED_BUFFERS for value in buffers for name in value.split(","))
+
+
+def wait_until_killed():
+    # logcat keeps its pipe open waiting for new lines until it is terminated.
+    while True:
+        time.sleep(3600)
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog="adb",
+        description="Stand-in for adb that replays a recorded log as 'adb logcat' output.",
+    )
+    parser.add_argument("--file", default=os.environ.get("LOGANALYSIS_REPLAY_FILE"))
+    parser.add_argument(
+        "--mode", choices=REPLAY_MODES, default=os.environ.get("LOGANALYSIS_REPLAY_MODE", REPLAY_REALTIME)
+    )
+    parser.add_argument("--rate", type=float, default=_env_float("LOGANALYSIS_REPLAY_RATE", 1000.0))
+    parser.add_argument("--speed", type=float, default=_env_float("LOGANALYSIS_REPLAY_SPEED", 1.0))
+    parser.add_argument("--loops", type=int, default=int(_env_float("LOGANALYSIS_REPLAY_LOOPS", 1)))
+    parser.add_argument("-s", dest="serial")
+    parser.add_argument("command", choices=("devices", "track-devices", "logcat"))
+    parser.add_argument("logcat_args", nargs=argparse.REMAINDER)
+    return parser
+
+
+def build_logcat_parser():
+    # -b, -T <timestamp> and -d are honored; other logcat options (-v, filterspecs,
+    # -e, --pid) are accepted and ignored, the viewer's local filter pass
+    # still decides what is shown.
+    parser = argparse.ArgumentParser(prog="adb logcat", add_help=False)
+    parser.add_argument("-b", dest="buffers", action="append", default=[])
+    parser.add_argument("-T", dest="start_time")
+    parser.add_argument("-d", dest="dump", action="store_true")
+    parser.add_argument("-B", dest="binary", action="store_true")
+    return parser
+
+
+def main(argv=None, stdout=None):
+    args = build_argument_parser().parse_args(argv)
+    stdout = stdout or sys.stdout
+
+    try:
+        if args.command == "devices":
+            stdout.write(f"List of devices attached\n{REPLAY_SERIAL}\tdevice\n\n")
+            return 0
+        if args.command == "track-devices":
+            # One length-prefixed list, then the device never goes away.
+            devices = f"{REPLAY_SERIAL}\tdevice\n"
+            stdout.write(f"{len(devices):04x}{devices}")
+            stdout.flush()
+            wait_until_killed()
+            return 0
+
+        logcat_args, _ignored = build_logcat_parser().parse_known_args(args.logcat_args)
+        if logcat_args.binary:
+            sys.stderr.write("replay: binary logcat output (-B) is not supported\n")
+            return 1
+        if not args.file:
+            sys.stderr.write("replay: set LOGANALYSIS_REPLAY_FILE or pass --file\n")
+            return 1
+
+        if not replays_buffers(logcat_args.buffers):
+            # An empty buffer: nothing to print, but logcat still waits.
+            if not logcat_args.dump:
+                wait_until_killed()
+            return 0
+
+        pacer = ReplayPacer(args.mode, rate=args.rate, speed=args.speed)
+        lines = iter_log_lines(args.file, args.loops)
+        if logcat_args.start_time:
+            lines = lines_from(lines, logcat_args.start_time)
+        for chunk in pacer.chunks(lines):
+            stdout.writelines(chunk)
+            stdout.flush()
+        if not logcat_args.dump:
+            wait_until_killed()
+    except (BrokenPipeError, KeyboardInterrupt):
+        return 0
+    except (OSError, ValueError) as error:
+        sys.stderr.write(f"replay: {error}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
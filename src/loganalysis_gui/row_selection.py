@@ -0,0 +1,71 @@
+"""Selected view rows as row intervals rather than per-row indexes.
+
+``QItemSelectionModel`` already stores a selection as ranges (Ctrl+A is one
+range), but ``selectedRows()`` expands it into one ``QModelIndex`` per row.
+``RowSelection`` keeps the ranges, so counting, slicing out line indices and
+copying are proportional to the number of intervals plus the rows actually
+read. Everything here is Qt-free.
+"""
+from array import array
+
+
+class RowSelection:
+    """Sorted, disjoint ``[start, stop)`` row intervals.
+
+    Overlapping or touching intervals are merged on construction.
+    """
+
+    __slots__ = ("_ranges",)
+
+    def __init__(self, ranges=()):
+        merged = []
+        for start, stop in sorted((start, stop) for start, stop in ranges if start < stop):
+            if merged and start <= merged[-1][1]:
+                if stop > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], stop)
+            else:
+                merged.append((start, stop))
+        self._ranges = tuple(merged)
+
+    @classmethod
+    def from_inclusive(cls, ranges):
+        """Build from ``(top, bottom)`` pairs as ``QItemSelectionRange`` reports them."""
+        return cls((top, bottom + 1) for top, bottom in ranges)
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self):
+        return sum(stop - start for start, stop in self._ranges)
+
+    def __bool__(self):
+        return bool(self._ranges)
+
+    def __eq__(self, other):
+        return isinstance(other, RowSelection) and self._ranges == other._ranges
+
+    def __repr__(self):
+        return f"RowSelection({list(self._ranges)!r})"
+
+    def single_row(self):
+        """Return the row when exactly one row is selected, else -1."""
+        if len(self._ranges) == 1:
+            start, stop = self._ranges[0]
+            if stop - start == 1:
+                return start
+        return -1
+
+    def clipped(self, row_count):
+        """Return the intervals that lie below ``row_count``."""
+        return RowSelection((start, min(stop, row_count)) for start, stop in self._ranges)
+
+    def take(self, values):
+        """Concatenate ``values[start:stop]`` for every interval into an ``array('I')``.
+
+        Used on ``visible_indices`` to get the selected line indices in row
+        order; each interval is one slice copy when ``values`` is an ``array('I')``.
+        """
+        taken = array("I")
+        for start, stop in self._ranges:
+            taken.extend(values[start:stop])
+        return taken
@@ -0,0 +1,165 @@
+"""Rolling measurements of the live ingest pipeline.
+
+Workers and the UI thread record samples into a shared ``LiveTelemetry``.
+Callers check ``enabled`` before timing anything, so while the stats panel is
+hidden the pipeline pays one attribute lookup per chunk.
+"""
+import bisect
+import csv
+import threading
+import time
+from collections import deque
+
+TELEMETRY_WINDOW_SECONDS = 10.0
+TELEMETRY_MAX_SAMPLES = 100000
+
+METRIC_READ_LINES = "read_lines"
+METRIC_READ_LATENCY = "read_to_emit_ms"
+METRIC_APPEND = "append_chunk_ms"
+METRIC_APPLY = "apply_chunk_ms"
+METRIC_QUEUE_DEPTH = "queue_depth"
+METRIC_TRIMMED = "trimmed_lines"
+METRIC_DROPPED = "dropped_lines"
+TELEMETRY_METRICS = (
+    METRIC_READ_LINES,
+    METRIC_READ_LATENCY,
+    METRIC_APPEND,
+    METRIC_APPLY,
+    METRIC_QUEUE_DEPTH,
+    METRIC_TRIMMED,
+    METRIC_DROPPED,
+)
+LATENCY_METRICS = (METRIC_READ_LATENCY, METRIC_APPEND, METRIC_APPLY)
+
+# Upper bucket bounds in milliseconds; the last bucket collects everything slower.
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def latency_histogram(values, bounds=LATENCY_BUCKETS_MS):
+    counts = [0] * (len(bounds) + 1)
+    for value in values:
+        counts[bisect.bisect_left(bounds, value)] += 1
+    return counts
+
+
+class LiveTelemetry:
+    """Time-windowed samples per metric, plus lifetime totals for counters."""
+
+    def __init__(self, window=TELEMETRY_WINDOW_SECONDS, *, max_samples=TELEMETRY_MAX_SAMPLES, clock=time.monotonic):
+        self.enabled = False
+        self.window = window
+        self.clock = clock
+        self._max_samples = max_samples
+        # Workers record from their own threads.
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._samples = {
+                metric: deque(maxlen=self._max_samples) for metric in TELEMETRY_METRICS
+            }
+            self.totals = {METRIC_READ_LINES: 0, METRIC_TRIMMED: 0, METRIC_DROPPED: 0}
+            self._started = self.clock()
+
+    def record(self, metric, value):
+        now = self.clock()
+        with self._lock:
+            self._samples[metric].append((now, value))
+            if metric in self.totals:
+                self.totals[metric] += value
+
+    def _prune(self, now):
+        cutoff = now - self.window
+        for samples in self._samples.values():
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def summary(self):
+        """Return per-metric statistics over the rolling window."""
+        now = self.clock()
+        with self._lock:
+            self._prune(now)
+            windows = {metric: [value for _, value in samples] for metric, samples in self._samples.items()}
+            totals = dict(self.totals)
+        elapsed = max(min(now - self._started, self.window), 1e-9)
+
+        summary = {}
+        for metric, values in windows.items():
+            ordered = sorted(values)
+            stats = {
+                "count": len(values),
+                "sum": sum(values),
+                "last": values[-1] if values else 0,
+                "p50": _percentile(ordered, 0.5),
+                "p95": _percentile(ordered, 0.95),
+                "max": ordered[-1] if ordered else 0,
+            }
+            stats["per_second"] = stats["sum"] / elapsed
+            if metric in LATENCY_METRICS:
+                stats["histogram"] = latency_histogram(values)
+            if metric in totals:
+                stats["total"] = totals[metric]
+            summary[metric] = stats
+        return summary
+
+    def write_csv(self, file_path):
+        """Dump every sample still in the window as ``metric,seconds,value`` rows."""
+        with self._lock:
+            rows = [
+                (metric, f"{timestamp - self._started:.6f}", value)
+                for metric, samples in self._samples.items()
+                for timestamp, value in samples
+            ]
+        rows.sort(key=lambda row: float(row[1]))
+        with open(file_path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["metric", "seconds", "value"])
+            writer.writerows(rows)
+        return len(rows)
+
+
+def format_status(summary):
+    return (
+        f"Ingest: {summary[METRIC_READ_LINES]['per_second']:,.0f} lines/s"
+        f" | Apply p95: {summary[METRIC_APPLY]['p95']:.1f} ms"
+        f" | Queue: {summary[METRIC_QUEUE_DEPTH]['last']:,}"
+        f" | Trimmed: {summary[METRIC_TRIMMED]['total']:,}"
+        f" | Dropped: {summary[METRIC_DROPPED]['total']:,}"
+    )
+
+
+def format_report(summary, bar_width=30):
+    read = summary[METRIC_READ_LINES]
+    queue = summary[METRIC_QUEUE_DEPTH]
+    lines = [
+        f"Read rate:      {read['per_second']:,.0f} lines/s ({read['total']:,} total)",
+        f"Queue depth:    {queue['last']:,} now, {queue['max']:,} max",
+        f"Trimmed lines:  {summary[METRIC_TRIMMED]['total']:,}",
+        f"Dropped lines:  {summary[METRIC_DROPPED]['total']:,}",
+    ]
+    labels = [f"<={bound:g}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]:g}"]
+    titles = {
+        METRIC_READ_LATENCY: "Read -> chunk_ready",
+        METRIC_APPEND: "append_chunk",
+        METRIC_APPLY: "_apply_chunk_to_model",
+    }
+    for metric in LATENCY_METRICS:
+        stats = summary[metric]
+        lines.append("")
+        lines.append(
+            f"{titles[metric]} (ms): n={stats['count']:,} p50={stats['p50']:.2f} "
+            f"p95={stats['p95']:.2f} max={stats['max']:.2f}"
+        )
+        peak = max(stats["histogram"]) or 1
+        for label, count in zip(labels, stats["histogram"]):
+            if count:
+                lines.append(f"  {label:>6} {'#' * max(1, count * bar_width // peak):<{bar_width}} {count:,}")
+    return "\n".join(lines)
@@ -0,0 +1,256 @@
+"""Trigram posting lists over a loaded log for indexed find and filtering.
+
+Postings are kept per block of ``INDEX_BLOCK_LINES`` lines rather than per
+line, which keeps the index a small fraction of the log. A query returns the
+lines of every block that contains all of its trigrams; callers still verify
+each candidate with the real matcher, so the index only has to guarantee that
+no matching line is left out.
+
+Lines are indexed lower-cased with non-ASCII characters replaced by ``?``, and
+queries only use trigrams made of ASCII characters. Everything here is
+Qt-free.
+"""
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+INDEX_BLOCK_LINES = 64
+TRIGRAM_INDEX_SUFFIX = ".trigrams"
+# Only the rarest trigrams of a query are intersected; the rest cannot shrink
+# the candidate set enough to pay for decoding their postings.
+MAX_QUERY_TRIGRAMS = 4
+
+_MAGIC = b"LGTRIDX1"
+# Log file size, mtime in ns, line count, block lines, trigram count.
+_HEADER = struct.Struct("<QqIII")
+_POSTING_TYPECODE = "I"
+# ASCII letters that case-insensitive regexes also match against non-ASCII
+# characters lower-casing differently (dotless i, long s).
+_UNSAFE_IGNORECASE = frozenset("is")
+
+
+def _indexed_text(text):
+    return text.lower().encode("ascii", "replace")
+
+
+def literal_trigrams(text, regex_ignorecase=False):
+    """Return the trigrams every line containing ``text`` is indexed under.
+
+    ``regex_ignorecase`` is for literals matched by an ``re.IGNORECASE``
+    pattern, whose case folding is wider than ``str.lower``.
+    """
+    lowered = text.lower()
+    trigrams = set()
+    for start in range(len(lowered) - 2):
+        trigram = lowered[start:start + 3]
+        if not trigram.isascii():
+            continue
+        if regex_ignorecase and not _UNSAFE_IGNORECASE.isdisjoint(trigram):
+            continue
+        trigrams.add(trigram.encode("ascii"))
+    return trigrams
+
+
+def regex_trigrams(pattern, case_sensitive):
+    """Return trigrams of the literal runs every match of ``pattern`` contains.
+
+    Only top-level literal sequences are used, so alternations, optional parts
+    and classes never contribute; returns an empty set when nothing usable is
+    left or the pattern does not parse.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, 0 if case_sensitive else re.IGNORECASE)
+    except (re.error, OverflowError, RecursionError):
+        return set()
+
+    # Inline flags such as (?i) end up in the parse state.
+    state = getattr(parsed, "state", None) or parsed.pattern
+    ignore_case = bool(state.flags & re.IGNORECASE)
+    trigrams = set()
+    run = []
+    for op, value in list(parsed) + [(None, None)]:
+        if op is sre_parse.LITERAL:
+            run.append(chr(value))
+            continue
+        if len(run) >= 3:
+            trigrams |= literal_trigrams("".join(run), regex_ignorecase=ignore_case)
+        run = []
+    return trigrams
+
+
+def search_trigrams(query, case_sensitive, regex):
+    """Trigrams for a find query as ``search_pattern`` compiles it."""
+    if regex:
+        return regex_trigrams(query, case_sensitive)
+    return literal_trigrams(query, regex_ignorecase=not case_sensitive)
+
+
+def filter_trigrams(filter_data):
+    """Trigrams a line must contain to match ``filter_data``, or an empty set."""
+    field = filter_data.get("field", "line")
+    if field in ("level", "pid"):
+        return set()
+    text = filter_data["text"]
+    if filter_data["regex"]:
+        return regex_trigrams(text, filter_data["case_sensitive"])
+    # Plain filters compare with str.lower, exactly like the index.
+    return literal_trigrams(text.strip() if field == "tag" else text)
+
+
+def _contains(sorted_values, value):
+    position = bisect_left(sorted_values, value)
+    return position < len(sorted_values) and sorted_values[position] == value
+
+
+class TrigramIndex:
+    """Block-level trigram postings for a fixed list of lines."""
+
+    def __init__(self, line_count, block_lines, keys, counts, deltas):
+        self.line_count = line_count
+        self.block_lines = block_lines
+        # Postings are delta-encoded block numbers stored back to back.
+        self._deltas = deltas
+        self._entries = {}
+        offset = 0
+        for key, count in zip(keys, counts):
+            self._entries[key] = (offset, count)
+            offset += count
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def build(cls, lines, block_lines=INDEX_BLOCK_LINES, should_continue=None):
+        """Index ``lines``; returns None when ``should_continue`` turns false."""
+        block_lines = max(block_lines, 1)
+        postings = {}
+        line_count = len(lines)
+        for block, block_start in enumerate(range(0, line_count, block_lines)):
+            if should_continue is not None and not should_continue():
+                return None
+            trigrams = set()
+            for line in lines[block_start:block_start + block_lines]:
+                data = _indexed_text(line)
+                trigrams.update({data[start:start + 3] for start in range(len(data) - 2)})
+            for trigram in trigrams:
+                posting = postings.get(trigram)
+                if posting is None:
+                    postings[trigram] = array(_POSTING_TYPECODE, (block,))
+                else:
+                    posting.append(block)
+
+        keys = sorted(postings)
+        counts = array(_POSTING_TYPECODE)
+        deltas = array(_POSTING_TYPECODE)
+        for key in keys:
+            posting = postings[key]
+            counts.append(len(posting))
+            deltas.append(posting[0])
+            deltas.extend(map(int.__sub__, posting[1:], posting))
+        return cls(line_count, block_lines, keys, counts, deltas)
+
+    def _posting(self, trigram):
+        offset, count = self._entries[trigram]
+        return array(_POSTING_TYPECODE, accumulate(self._deltas[offset:offset + count]))
+
+    def candidate_blocks(self, trigrams):
+        """Return the ascending blocks that contain every trigram."""
+        entries = []
+        for trigram in trigrams:
+            entry = self._entries.get(trigram)
+            if entry is None:
+                return array(_POSTING_TYPECODE)
+            entries.append((entry[1], trigram))
+        entries.sort()
+
+        blocks = None
+        for _count, trigram in entries[:MAX_QUERY_TRIGRAMS]:
+            posting = self._posting(trigram)
+            if blocks is None:
+                blocks = posting
+                continue
+            blocks = array(_POSTING_TYPECODE, (block for block in blocks if _contains(posting, block)))
+            if not blocks:
+                break
+        return blocks if blocks is not None else array(_POSTING_TYPECODE)
+
+    def lines_in_blocks(self, blocks):
+        """Expand ascending block numbers into ascending line indices."""
+        lines = array(_POSTING_TYPECODE)
+        block_lines = self.block_lines
+        for block in blocks:
+            start = block * block_lines
+            lines.extend(range(start, min(start + block_lines, self.line_count)))
+        return lines
+
+    def candidate_lines(self, trigrams):
+        return self.lines_in_blocks(self.candidate_blocks(trigrams))
+
+    def save(self, path, file_size, mtime_ns):
+        """Write the index compressed to ``path`` for a log of the given size and mtime."""
+        keys = sorted(self._entries)
+        counts = array(_POSTING_TYPECODE, (self._entries[key][1] for key in keys))
+        deltas = array(_POSTING_TYPECODE)
+        for key in keys:
+            offset, count = self._entries[key]
+            deltas.extend(self._deltas[offset:offset + count])
+        if sys.byteorder != "little":
+            counts.byteswap()
+            deltas.byteswap()
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(_HEADER.pack(file_size, mtime_ns, self.line_count, self.block_lines, len(keys)))
+            handle.write(b"".join(keys))
+            handle.write(counts.tobytes())
+            handle.write(zlib.compress(deltas.tobytes(), 1))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, file_size, mtime_ns, line_count):
+        """Read an index saved for exactly this log, or return None."""
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        if not data.startswith(_MAGIC) or len(data) < len(_MAGIC) + _HEADER.size:
+            return None
+
+        offset = len(_MAGIC)
+        saved_size, saved_mtime, saved_lines, block_lines, key_count = _HEADER.unpack_from(data, offset)
+        if (saved_size, saved_mtime, saved_lines) != (file_size, mtime_ns, line_count) or block_lines < 1:
+            return None
+        offset += _HEADER.size
+        keys_end = offset + key_count * 3
+        counts_end = keys_end + key_count * array(_POSTING_TYPECODE).itemsize
+        if counts_end > len(data):
+            return None
+        keys = [data[start:start + 3] for start in range(offset, keys_end, 3)]
+        counts = array(_POSTING_TYPECODE, data[keys_end:counts_end])
+        try:
+            deltas = array(_POSTING_TYPECODE, zlib.decompress(data[counts_end:]))
+        except zlib.error:
+            return None
+        if sys.byteorder != "little":
+            counts.byteswap()
+            deltas.byteswap()
+        if sum(counts) != len(deltas):
+            return None
+        return cls(line_count, block_lines, keys, counts, deltas)
+
+
+def index_path_for(log_path):
+    """Return where the index of ``log_path`` is stored, next to the log."""
+    return log_path + TRIGRAM_INDEX_SUFFIX
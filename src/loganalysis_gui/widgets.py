@@ -1,10 +1,16 @@
+from collections import OrderedDict
+
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QCheckBox, QLabel
 from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QFontInfo, QFontMetrics, QFontMetricsF
 from .constants import COLOR_MAP, TEXT_COLOR_MAP
 
 
 def describe_filter_text(filter_data):
     text = filter_data["text"]
+    field = filter_data.get("field", "line")
+    if field != "line":
+        text = f"{field.upper()}: {text}"
     if filter_data["exclude"]:
         text = f"NOT: {text}"
     if filter_data["regex"]:
@@ -14,6 +20,48 @@ def describe_filter_text(filter_data):
     return text
 
 
+class TextWidthCache:
+    """Pixel widths of rendered text, cached per font.
+
+    With a fixed-pitch font, printable ASCII is measured as characters times
+    the font's advance without shaping. Other text goes through QFontMetrics
+    once per distinct ``(prefix, text)``.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max(max_entries, 1)
+        self._font_key = None
+        self._metrics = None
+        self._advance = None
+        self._widths = OrderedDict()
+
+    def _use_font(self, font):
+        font_key = font.key()
+        if font_key == self._font_key:
+            return
+        self._font_key = font_key
+        self._metrics = QFontMetrics(font)
+        self._advance = QFontMetricsF(font).horizontalAdvance("x") if QFontInfo(font).fixedPitch() else None
+        self._widths.clear()
+
+    def width(self, font, text, prefix=""):
+        """Return the advance of ``prefix + text`` without building it when possible."""
+        self._use_font(font)
+        if self._advance is not None and text.isascii() and text.isprintable() and prefix.isascii():
+            return round((len(prefix) + len(text)) * self._advance)
+
+        key = (prefix, text)
+        width = self._widths.get(key)
+        if width is None:
+            width = self._metrics.horizontalAdvance(prefix + text)
+            self._widths[key] = width
+            if len(self._widths) > self.max_entries:
+                self._widths.popitem(last=False)
+        else:
+            self._widths.move_to_end(key)
+        return width
+
+
 class FilterItemWidget(QWidget):
     filter_toggled = pyqtSignal(dict, bool)
 
@@ -1,8 +1,14 @@
+from array import array
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 from PyQt5.QtWidgets import QCheckBox, QLineEdit, QListWidget, QWidget
 
+from .live_buffer import PendingChunkBuffer
+from .live_merge import LiveStreamMerger
+from .recorder import SessionRecorder
+from .telemetry import LiveTelemetry
+
 
 @dataclass
 class FilterTabState:
@@ -23,11 +29,28 @@ class MainWindowRuntimeState:
     is_refiltering: bool = False
     is_loading_file: bool = False
     loaded_file_path: Optional[str] = None
-    pending_chunks: List[List[str]] = field(default_factory=list)
+    pending_chunks: PendingChunkBuffer = field(default_factory=PendingChunkBuffer)
+    live_merger: LiveStreamMerger = field(default_factory=LiveStreamMerger)
+    logcat_filter_args: List[str] = field(default_factory=list)
+    replay_source: Optional[Tuple[str, str, int]] = None
+    telemetry: LiveTelemetry = field(default_factory=LiveTelemetry)
+    recording_directory: Optional[str] = None
+    recorder: Optional[SessionRecorder] = None
     filter_request_id: int = 0
+    # Request whose partial (viewport-first) results are currently shown.
+    partial_filter_request_id: int = -1
+    # The model's rows for that request, the base of its final VisibleDiff.
+    partial_filter_rows: Optional[array] = None
     file_load_request_id: int = 0
     filter_map_back: Dict[int, Tuple[int, int]] = field(default_factory=dict)
     target_source_idx: int = -1
     scroll_to_bottom_after_refilter: bool = False
     loading_file_path: Optional[str] = None
     pending_status_message: Optional[str] = None
+    # Sorted visible rows that are find hits, covering the first
+    # ``find_hit_row_count`` rows; None while stale or being built.
+    find_hit_rows: Optional[array] = None
+    find_hit_row_count: int = 0
+    find_index_request_id: int = 0
+    # Direction of a next/previous request waiting for the hit index.
+    pending_find_forward: Optional[bool] = None
@@ -1,14 +1,90 @@
+import gzip
 import mmap
 import os
+import re
 import subprocess
+import threading
+import time
+from bisect import bisect_left
+from itertools import islice
 from PyQt5.QtCore import QThread, pyqtSignal
-from .filter_engine import evaluate_line, prepare_filters
-from .models import measured_log_line_text
+from .filter_engine import VisibleDiff, diff_visible_indices, evaluate_line, prepare_filters
+from .constants import (
+    ADB_RECONNECT_INITIAL_DELAY,
+    ADB_RECONNECT_MAX_DELAY,
+    COPY_BACKGROUND_ROWS,
+    EXPORT_BLOCK_ROWS,
+    EXPORT_BUFFER_BYTES,
+    FILTER_FOCUS_LINES,
+    FILTER_PROGRESS_LINES,
+    PROGRESSIVE_FILTER_MIN_LINES,
+    SEARCH_SCAN_BLOCK_LINES,
+)
+from .highlight import compute_row_highlight, search_hit_block, search_hit_rows
+from .live_merge import RecentLineDeduper, threadtime_sort_key
+from .logcat import BinaryLogcatDecoder, parse_event_log_tags
+from .models import display_lines_text, measured_line_lengths, measured_log_line_text, visible_index_array, widest_line_index
+from .replay import ReplayPacer, iter_log_lines
+from .telemetry import METRIC_READ_LATENCY, METRIC_READ_LINES
+from .trigram_index import TrigramIndex, filter_trigrams, index_path_for
+
+
+EVENT_LOG_TAGS_PATH = "/system/etc/event-log-tags"
+# What logcat prints when it does not understand an argument, as opposed to
+# adb's "device offline" / "device not found" style failures.
+_LOGCAT_ARGUMENT_ERROR = re.compile(
+    r"unknown option|unrecognized option|invalid option|invalid argument|invalid filter|usage:",
+    re.IGNORECASE,
+)
+_STDERR_TAIL_CHARS = 4096
+# Event tag maps per device serial; fetched once and shared by every worker.
+_event_tag_cache = {}
+_event_tag_cache_lock = threading.Lock()
+
+
+def load_event_tags(device_serial=None, timeout=5.0):
+    with _event_tag_cache_lock:
+        cached = _event_tag_cache.get(device_serial)
+    if cached is not None:
+        return cached
+
+    cmd = ['adb']
+    if device_serial:
+        cmd.extend(['-s', device_serial])
+    cmd.extend(['shell', 'cat', EVENT_LOG_TAGS_PATH])
+    try:
+        output = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            encoding='utf-8',
+            errors='replace',
+            timeout=timeout,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        # Without the map events still decode, just with numeric tags; retry next time.
+        return {}
+
+    tags = parse_event_log_tags(output)
+    with _event_tag_cache_lock:
+        _event_tag_cache[device_serial] = tags
+    return tags
+
+
+def last_threadtime_stamp(lines):
+    for line in reversed(lines):
+        timestamp = threadtime_sort_key(line)
+        if timestamp is not None:
+            return timestamp
+    return None
 
 
 class FileLoadWorker(QThread):
     progress_updated = pyqtSignal(int, str, int, int, int)
-    finished_loading = pyqtSignal(int, str, list)
+    # request id, path, lines, measured line lengths (see LogModel.line_lengths)
+    finished_loading = pyqtSignal(int, str, list, object)
     load_failed = pyqtSignal(int, str, str)
 
     def __init__(self, file_path, request_id, *, chunk_size=262144, progress_step=1048576):
@@ -32,7 +108,7 @@ class FileLoadWorker(QThread):
                     0,
                     0,
                 )
-                self.finished_loading.emit(self.request_id, self.file_path, [])
+                self.finished_loading.emit(self.request_id, self.file_path, [], measured_line_lengths([]))
                 return
 
             bytes_read = 0
@@ -68,7 +144,8 @@ class FileLoadWorker(QThread):
                 total_bytes,
                 len(lines),
             )
-            self.finished_loading.emit(self.request_id, self.file_path, lines)
+            # Measured here so the UI thread never walks the file for widths.
+            self.finished_loading.emit(self.request_id, self.file_path, lines, measured_line_lengths(lines))
         except FileNotFoundError:
             self.load_failed.emit(self.request_id, self.file_path, "File not found.")
         except OSError as error:
@@ -80,45 +157,105 @@ class FileLoadWorker(QThread):
 class AdbWorker(QThread):
     chunk_ready = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
+    reconnecting = pyqtSignal(int, float)
 
-    def __init__(self, device_serial=None):
+    def __init__(
+        self,
+        device_serial=None,
+        binary=False,
+        *,
+        buffer=None,
+        filter_args=(),
+        start_time=None,
+        read_size=65536,
+        telemetry=None,
+        reconnect=False,
+        deduper=None,
+    ):
         super().__init__()
         self.is_running = True
         self.process = None
+        self.reconnect = reconnect
+        # Shared with a replacement worker so its -T overlap is dropped too.
+        self.deduper = deduper or RecentLineDeduper()
+        self._stop_event = threading.Event()
         self.device_serial = device_serial
+        self.binary = binary
+        self.buffer = buffer
+        self.filter_args = list(filter_args)
+        self.start_time = start_time
+        self.read_size = read_size
+        self.telemetry = telemetry
+        self.last_timestamp = None
+        self.lines_emitted = 0
+        self.stderr_tail = ""
+        self._stderr_thread = None
+
+    def logcat_command(self):
+        cmd = ['adb']
+        if self.device_serial:
+            cmd.extend(['-s', self.device_serial])
+        cmd.append('logcat')
+        if self.buffer:
+            cmd.extend(['-b', self.buffer])
+        if self.binary:
+            cmd.append('-B')
+        else:
+            cmd.extend(['-v', 'threadtime'])
+        if self.start_time:
+            cmd.extend(['-T', self.start_time])
+        cmd.extend(self.filter_args)
+        return cmd
 
     def run(self):
+        attempt = 0
+        if self.start_time:
+            self.deduper.begin_resume()
         try:
-            cmd = ['adb']
-            if self.device_serial:
-                cmd.extend(['-s', self.device_serial])
-            cmd.extend(['logcat', '-v', 'threadtime'])
-
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True, 
-                encoding='utf-8', 
-                errors='replace'
-            )
-            proc = self.process
-            
-            buffer = []
             while self.is_running:
-                line = proc.stdout.readline()
-                if not line and proc.poll() is not None:
+                lines_before = self.lines_emitted
+                cmd = self.logcat_command()
+                # stderr is only needed to recognise a rejected filterspec.
+                stderr = subprocess.PIPE if self.filter_args else subprocess.DEVNULL
+                if self.binary:
+                    self.process = subprocess.Popen(
+                        cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=stderr,
+                    )
+                    self._start_stderr_drain(self.process)
+                    self._stream_binary(self.process)
+                else:
+                    self.process = subprocess.Popen(
+                        cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=stderr,
+                        universal_newlines=True, 
+                        encoding='utf-8', 
+                        errors='replace'
+                    )
+                    self._start_stderr_drain(self.process)
+                    self._stream_text(self.process)
+
+                if self._pushdown_rejected():
+                    # Older logcat builds reject --pid/-e; fall back to local-only filtering.
+                    self.filter_args = []
+                    self.terminate_process()
+                    continue
+                if not self.reconnect or not self.is_running:
                     break
-                
-                if line:
-                    buffer.append(line)
-                
-                if len(buffer) >= 100 or (buffer and not line):
-                    self.chunk_ready.emit(buffer)
-                    buffer = []
-            
-            if buffer:
-                self.chunk_ready.emit(buffer)
+
+                # logcat ended on its own (USB drop, adbd restart): resume from the
+                # last delivered line, backing off while the device stays away.
+                self.terminate_process()
+                attempt = 1 if self.lines_emitted > lines_before else attempt + 1
+                delay = min(ADB_RECONNECT_INITIAL_DELAY * 2 ** (attempt - 1), ADB_RECONNECT_MAX_DELAY)
+                self.reconnecting.emit(attempt, delay)
+                if self._stop_event.wait(delay):
+                    break
+                if self.last_timestamp:
+                    self.start_time = self.last_timestamp
+                    self.deduper.begin_resume()
                 
         except FileNotFoundError:
             self.error_occurred.emit("ADB not found. Please ensure 'adb' is in your PATH.")
@@ -127,8 +264,94 @@ class AdbWorker(QThread):
         finally:
             self.terminate_process()
 
+    def _stream_text(self, proc):
+        buffer = []
+        read_started = 0.0
+        while self.is_running:
+            line = proc.stdout.readline()
+            if not line and proc.poll() is not None:
+                break
+            
+            if line:
+                if not buffer:
+                    read_started = time.perf_counter()
+                buffer.append(line)
+            
+            if len(buffer) >= 100 or (buffer and not line):
+                self._emit_chunk(buffer, read_started)
+                buffer = []
+        
+        if buffer:
+            self._emit_chunk(buffer, read_started)
+
+    def _stream_binary(self, proc):
+        # read1 returns whatever the pipe has (up to read_size) so a slow device
+        # still produces small, timely chunks while a busy one yields large batches.
+        event_tags = load_event_tags(self.device_serial) if self.buffer == 'events' else None
+        decoder = BinaryLogcatDecoder(event_tags)
+        while self.is_running:
+            data = proc.stdout.read1(self.read_size)
+            if not data:
+                break
+
+            read_started = time.perf_counter()
+            records = decoder.feed(data)
+            if records:
+                # The rendered stamps use the host's timezone; resume from the
+                # entry's own epoch time instead.
+                self._emit_chunk(records.render_threadtime(), read_started, records.last_epoch_time())
+
+    def _emit_chunk(self, lines, read_started=None, resume_time=None):
+        lines = self.deduper.filter(lines)
+        if not lines:
+            return
+        # Remember where the stream is so a restarted logcat can resume with -T.
+        self.last_timestamp = resume_time or last_threadtime_stamp(lines) or self.last_timestamp
+        self.lines_emitted += len(lines)
+        telemetry = self.telemetry
+        if telemetry is not None and telemetry.enabled:
+            telemetry.record(METRIC_READ_LINES, len(lines))
+            if read_started is not None:
+                telemetry.record(METRIC_READ_LATENCY, (time.perf_counter() - read_started) * 1000)
+        self.chunk_ready.emit(lines)
+
+    def _start_stderr_drain(self, proc):
+        # Read stderr as it comes so a chatty logcat never blocks on a full
+        # pipe; only the tail is kept.
+        self.stderr_tail = ""
+        self._stderr_thread = None
+        if not self.filter_args or proc.stderr is None:
+            return
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, args=(proc.stderr,), daemon=True)
+        self._stderr_thread.start()
+
+    def _drain_stderr(self, stream):
+        try:
+            for line in stream:
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8", "replace")
+                self.stderr_tail = (self.stderr_tail + line)[-_STDERR_TAIL_CHARS:]
+        except (OSError, ValueError):
+            pass
+
+    def _pushdown_rejected(self):
+        """True when logcat exited before any line because it did not accept ``filter_args``.
+
+        A lost device also exits non-zero, so the decision is made from
+        logcat's usage error on stderr rather than from the exit code alone.
+        """
+        process = self.process
+        if not self.is_running or not self.filter_args or self.lines_emitted or process is None:
+            return False
+        if process.poll() in (None, 0):
+            return False
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1)
+        return bool(_LOGCAT_ARGUMENT_ERROR.search(self.stderr_tail))
+
     def stop(self):
         self.is_running = False
+        self._stop_event.set()
         self.terminate_process()
     
     def terminate_process(self):
@@ -156,34 +379,545 @@ class AdbWorker(QThread):
                 self.error_occurred.emit(f"ADB Error: {error}")
 
 
+class ReplayWorker(QThread):
+    """Plays a recorded log file through the same signals as ``AdbWorker``."""
+
+    chunk_ready = pyqtSignal(list)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(
+        self, file_path, mode, *, rate=1000.0, speed=1.0, loops=1, chunk_size=100, telemetry=None
+    ):
+        super().__init__()
+        self.file_path = file_path
+        self.telemetry = telemetry
+        self.device_serial = None
+        self.loops = loops
+        self.last_timestamp = None
+        self.lines_emitted = 0
+        self.is_running = True
+        self._stop_event = threading.Event()
+        # Waiting on the event instead of sleeping lets stop() cut a long
+        # real-time gap short.
+        self.pacer = ReplayPacer(
+            mode, rate=rate, speed=speed, chunk_size=chunk_size, sleep=self._stop_event.wait
+        )
+
+    def run(self):
+        try:
+            for chunk in self.pacer.chunks(iter_log_lines(self.file_path, self.loops)):
+                if not self.is_running:
+                    break
+                self.last_timestamp = last_threadtime_stamp(chunk) or self.last_timestamp
+                self.lines_emitted += len(chunk)
+                telemetry = self.telemetry
+                if telemetry is not None and telemetry.enabled:
+                    telemetry.record(METRIC_READ_LINES, len(chunk))
+                self.chunk_ready.emit(chunk)
+        except OSError as error:
+            self.error_occurred.emit(f"Replay Error: {error}")
+
+    def stop(self):
+        self.is_running = False
+        self._stop_event.set()
+
+
+def parse_adb_devices(text):
+    """Return the serials in ``adb devices`` / ``track-devices`` output that are ready."""
+    devices = []
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == "device":
+            devices.append(parts[0])
+    return devices
+
+
+class DeviceWatcher(QThread):
+    """Keeps the connected device list current without blocking the UI thread.
+
+    ``adb track-devices`` pushes a new list whenever a device comes or goes. If
+    the local adb cannot track, the watcher falls back to polling ``adb devices``.
+    """
+
+    devices_changed = pyqtSignal(list)
+    scan_failed = pyqtSignal(str)
+
+    def __init__(self, *, poll_interval=2.0, poll_timeout=5.0):
+        super().__init__()
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.use_tracking = True
+        self.is_running = True
+        self.process = None
+        self._last_devices = None
+        self._wake = threading.Event()
+
+    def run(self):
+        while self.is_running:
+            try:
+                if self.use_tracking:
+                    if not self._track():
+                        self.use_tracking = False
+                        continue
+                else:
+                    self._poll_once()
+            except FileNotFoundError:
+                self.scan_failed.emit("ADB not found in system PATH.")
+                return
+            except (OSError, ValueError, subprocess.SubprocessError) as error:
+                self.scan_failed.emit(f"ADB device scan error: {error}")
+            self._wait(self.poll_interval)
+
+    def _wait(self, seconds):
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def _track(self):
+        self.process = subprocess.Popen(
+            ["adb", "track-devices"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        delivered = False
+        try:
+            stdout = self.process.stdout
+            while self.is_running:
+                # Each update is a 4 digit hex length followed by "serial\tstate\n" lines.
+                header = stdout.read(4)
+                if len(header) < 4:
+                    break
+                payload = stdout.read(int(header, 16)) if header != b"0000" else b""
+                self._emit_devices(parse_adb_devices(payload.decode("utf-8", errors="replace")))
+                delivered = True
+        finally:
+            self._terminate_process()
+        return delivered or not self.is_running
+
+    def _poll_once(self):
+        output = subprocess.run(
+            ["adb", "devices"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=self.poll_timeout,
+            check=True,
+        ).stdout
+        # Skip the "List of devices attached" header.
+        self._emit_devices(parse_adb_devices(output.partition("\n")[2]))
+
+    def _emit_devices(self, devices):
+        if devices != self._last_devices:
+            self._last_devices = devices
+            self.devices_changed.emit(devices)
+
+    def refresh(self):
+        """Re-read the device list now and emit it even if it did not change."""
+        self._last_devices = None
+        self._wake.set()
+        # Restarting track-devices makes adb resend the full current list.
+        self._terminate_process()
+
+    def stop(self):
+        self.is_running = False
+        self._wake.set()
+        self._terminate_process()
+
+    def _terminate_process(self):
+        process = self.process
+        self.process = None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.terminate()
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        except OSError:
+            pass
+
+
+class HighlightWorker(QThread):
+    """Computes ``RowHighlight`` entries for a batch of rows the view is about to paint."""
+
+    highlights_ready = pyqtSignal(int, object)
+
+    def __init__(self, generation, numbered_lines, filters, search_re=None):
+        super().__init__()
+        self.generation = generation
+        self.numbered_lines = numbered_lines
+        self.filters = filters
+        self.search_re = search_re
+        self.is_running = True
+
+    def run(self):
+        prepared_filters = prepare_filters(self.filters)
+        entries = {}
+        for line_index, line in self.numbered_lines:
+            if not self.is_running:
+                return
+            entries[line_index] = compute_row_highlight(line, prepared_filters, self.search_re)
+        self.highlights_ready.emit(self.generation, entries)
+
+    def stop(self):
+        self.is_running = False
+
+
+class SearchWorker(QThread):
+    """Scans the line store for find hits and reports them block by block.
+
+    Lines from ``start`` to the end of ``lines`` at the time the scan starts
+    are checked; ``first_line_number`` is the absolute number of ``lines[0]``
+    so the model can place blocks correctly after a live trim. Below
+    ``candidate_stop`` only the ascending line indices in ``candidates`` are
+    matched (the previous hits of a narrowed query). Past it, with a
+    ``trigram_index`` covering every line, only the candidates for
+    ``trigrams`` are matched. All other lines are misses.
+    """
+
+    # generation, absolute number of the block's first line, hit bytes
+    hits_ready = pyqtSignal(int, int, object)
+    search_finished = pyqtSignal(int)
+
+    def __init__(
+        self,
+        generation,
+        lines,
+        search_re,
+        start=0,
+        first_line_number=0,
+        block_lines=SEARCH_SCAN_BLOCK_LINES,
+        *,
+        trigram_index=None,
+        trigrams=(),
+        candidates=None,
+        candidate_stop=0,
+    ):
+        super().__init__()
+        self.generation = generation
+        self.lines = lines
+        self.search_re = search_re
+        self.start_index = start
+        self.first_line_number = first_line_number
+        self.block_lines = max(block_lines, 1)
+        self.trigram_index = trigram_index
+        self.trigrams = trigrams
+        self.candidates = candidates
+        self.candidate_stop = candidate_stop if candidates is not None else 0
+        self.is_running = True
+
+    def run(self):
+        lines = self.lines
+        stop = len(lines)
+        candidate_stop = min(self.candidate_stop, stop)
+        indexed = None
+        if self.trigram_index is not None and self.trigrams and self.trigram_index.line_count == stop:
+            indexed = self.trigram_index.candidate_lines(self.trigrams)
+        for block_start in range(self.start_index, stop, self.block_lines):
+            if not self.is_running:
+                return
+            block_stop = min(block_start + self.block_lines, stop)
+            split = min(max(candidate_stop, block_start), block_stop)
+            block = bytearray()
+            if block_start < split:
+                block += self._candidate_hit_block(self.candidates, block_start, split)
+            if split < block_stop:
+                if indexed is None:
+                    block += search_hit_block(lines[split:block_stop], self.search_re)
+                else:
+                    block += self._candidate_hit_block(indexed, split, block_stop)
+            self.hits_ready.emit(self.generation, self.first_line_number + block_start, block)
+        if self.is_running:
+            self.search_finished.emit(self.generation)
+
+    def _candidate_hit_block(self, candidates, block_start, block_stop):
+        block = bytearray(block_stop - block_start)
+        search = self.search_re.search
+        lines = self.lines
+        first = bisect_left(candidates, block_start)
+        for line_index in islice(candidates, first, bisect_left(candidates, block_stop, first)):
+            if search(lines[line_index]):
+                block[line_index - block_start] = 1
+        return block
+
+    def stop(self):
+        self.is_running = False
+
+
+class FindIndexWorker(QThread):
+    """Collects the visible rows that are find hits for next/previous navigation.
+
+    ``visible_indices`` must not change while the worker runs; pass a copy.
+    """
+
+    index_ready = pyqtSignal(int, object)
+
+    def __init__(self, request_id, visible_indices, lines, search_re, search_hits=b"", block_rows=SEARCH_SCAN_BLOCK_LINES):
+        super().__init__()
+        self.request_id = request_id
+        self.visible_indices = visible_indices
+        self.lines = lines
+        self.search_re = search_re
+        self.search_hits = search_hits
+        self.block_rows = max(block_rows, 1)
+        self.is_running = True
+
+    def run(self):
+        rows = visible_index_array()
+        row_count = len(self.visible_indices)
+        for start_row in range(0, row_count, self.block_rows):
+            if not self.is_running:
+                return
+            rows.extend(search_hit_rows(
+                self.visible_indices,
+                self.lines,
+                self.search_re,
+                self.search_hits,
+                start_row,
+                min(start_row + self.block_rows, row_count),
+            ))
+        if self.is_running:
+            self.index_ready.emit(self.request_id, rows)
+
+    def stop(self):
+        self.is_running = False
+
+
+class TrigramIndexWorker(QThread):
+    """Loads the trigram index saved next to a log file, or builds and saves it."""
+
+    # file path, TrigramIndex, True when it was read from disk
+    index_ready = pyqtSignal(str, object, bool)
+
+    def __init__(self, file_path, lines):
+        super().__init__()
+        self.file_path = file_path
+        self.lines = lines
+        self.is_running = True
+
+    def run(self):
+        index_path = index_path_for(self.file_path)
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            stat = None
+
+        index = None
+        if stat is not None:
+            index = TrigramIndex.load(index_path, stat.st_size, stat.st_mtime_ns, len(self.lines))
+        loaded = index is not None
+        if index is None:
+            index = TrigramIndex.build(self.lines, should_continue=lambda: self.is_running)
+            if index is None:
+                return
+            if stat is not None:
+                try:
+                    index.save(index_path, stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    # A read-only log directory only costs the next rebuild.
+                    pass
+        if self.is_running:
+            self.index_ready.emit(self.file_path, index, loaded)
+
+    def stop(self):
+        self.is_running = False
+
+
+class ExportWorker(QThread):
+    """Writes the lines at ``visible_indices`` to a file, gzip-compressed for ``.gz`` paths.
+
+    ``visible_indices`` must not change while the worker runs; pass a copy.
+    Output goes to a temporary file that replaces ``file_path`` only once
+    every row is written, so a cancelled or failed export leaves nothing
+    behind.
+    """
+
+    # rows written, total rows
+    progress_updated = pyqtSignal(int, int)
+    # path, rows written
+    export_finished = pyqtSignal(str, int)
+    export_failed = pyqtSignal(str, str)
+
+    def __init__(self, file_path, lines, visible_indices, block_rows=EXPORT_BLOCK_ROWS):
+        super().__init__()
+        self.file_path = file_path
+        self.lines = lines
+        self.visible_indices = visible_indices
+        self.block_rows = max(block_rows, 1)
+        self.is_running = True
+
+    def run(self):
+        temp_path = f"{self.file_path}.part"
+        try:
+            completed = self._write(temp_path)
+            if completed:
+                os.replace(temp_path, self.file_path)
+        except OSError as error:
+            completed = False
+            self.export_failed.emit(self.file_path, str(error))
+        if not completed:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self.export_finished.emit(self.file_path, len(self.visible_indices))
+
+    def _write(self, temp_path):
+        indices = self.visible_indices
+        total = len(indices)
+        get_line = self.lines.__getitem__
+        with open(temp_path, "wb", buffering=EXPORT_BUFFER_BYTES) as raw:
+            handle = raw
+            if self.file_path.lower().endswith(".gz"):
+                handle = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1)
+            with handle:
+                for start in range(0, total, self.block_rows):
+                    if not self.is_running:
+                        return False
+                    stop = min(start + self.block_rows, total)
+                    handle.write("".join(map(get_line, indices[start:stop])).encode("utf-8"))
+                    self.progress_updated.emit(stop, total)
+        return self.is_running
+
+    def stop(self):
+        self.is_running = False
+
+
+class CopyTextWorker(QThread):
+    """Formats the rows of ``line_indices`` into clipboard text off the UI thread.
+
+    ``format_options`` are ``LogModel.display_text_options()``.
+    """
+
+    # text, row count
+    text_ready = pyqtSignal(str, int)
+
+    def __init__(self, lines, line_indices, format_options):
+        super().__init__()
+        self.lines = lines
+        self.line_indices = line_indices
+        self.format_options = format_options
+        self.is_running = True
+
+    def run(self):
+        indices = self.line_indices
+        parts = []
+        for start in range(0, len(indices), COPY_BACKGROUND_ROWS):
+            if not self.is_running:
+                return
+            parts.append(display_lines_text(
+                self.lines, indices[start:start + COPY_BACKGROUND_ROWS], **self.format_options
+            ))
+        if self.is_running:
+            self.text_ready.emit("\n".join(parts), len(indices))
+
+    def stop(self):
+        self.is_running = False
+
+
 class FilterWorker(QThread):
-    finished_filtering = pyqtSignal(int, list, int, list, str)
+    # request id, visible line indices for the next rows; see _run_progressive.
+    partial_filtering = pyqtSignal(int, object)
+    # Row arrays travel as ``object`` so the GUI receives the worker's buffer
+    # instead of a converted copy.
+    finished_filtering = pyqtSignal(int, object, int, list, str, object)
     
-    def __init__(self, lines, filters, show_only_filtered, request_id):
+    def __init__(
+        self,
+        lines,
+        filters,
+        show_only_filtered,
+        request_id,
+        line_sources=None,
+        hidden_sources=frozenset(),
+        previous_indices=None,
+        *,
+        line_lengths=None,
+        focus_index=None,
+        progressive_min_lines=PROGRESSIVE_FILTER_MIN_LINES,
+        focus_lines=FILTER_FOCUS_LINES,
+        progress_lines=FILTER_PROGRESS_LINES,
+        trigram_index=None,
+    ):
         super().__init__()
         self.lines = lines
+        # The model's current rows; the length is captured now because live
+        # appends may extend the list while this worker runs.
+        self.previous_indices = previous_indices
+        self.previous_count = len(previous_indices) if previous_indices is not None else 0
+        self.line_sources = line_sources
+        self.line_lengths = line_lengths
+        self.hidden_sources = frozenset(hidden_sources) if line_sources is not None else frozenset()
         self.filters = filters
         self.show_only_filtered = show_only_filtered
         self.request_id = request_id
+        self.focus_index = focus_index
+        self.progressive_min_lines = progressive_min_lines
+        self.focus_lines = max(focus_lines, 1)
+        self.progress_lines = max(progress_lines, 1)
+        self.trigram_index = trigram_index
         self.is_running = True
 
     def run(self):
-        visible_indices = []
-        match_count = 0
-        widest_visible_text = ""
-        widest_visible_length = 0
-        
+        self.match_count = 0
         # Initialize counts for ALL filters passed in
-        filter_counts = [0] * len(self.filters)
-        
-        prepared_filters = prepare_filters(self.filters)
+        self.filter_counts = [0] * len(self.filters)
+        self.prepared_filters = prepare_filters(self.filters)
 
+        # The snapshot length keeps live appends out of this pass.
         count = len(self.lines)
-        for i in range(count):
-            if not self.is_running:
+        candidates = self._indexed_candidates(count)
+        if candidates is not None or self.focus_index is None or count < self.progressive_min_lines:
+            if candidates is not None:
+                numbered_lines = ((i, self.lines[i]) for i in candidates)
+            else:
+                # Iterate rather than index so lazily stored lines decode block by block.
+                numbered_lines = enumerate(islice(self.lines, count))
+            visible_indices = self._evaluate(numbered_lines)
+            if visible_indices is None:
+                return
+            visible_diff = None
+            if self.previous_indices is not None:
+                visible_diff = diff_visible_indices(
+                    self.previous_indices, visible_indices, self.previous_count
+                )
+        else:
+            visible_indices, visible_diff = self._run_progressive(count)
+            if visible_indices is None:
                 return
 
-            line = self.lines[i]
+        widest_visible_text = ""
+        widest_idx = widest_line_index(self._line_lengths(count), visible_indices)
+        if widest_idx >= 0:
+            widest_visible_text = measured_log_line_text(self.lines[widest_idx])
+        
+        self.finished_filtering.emit(
+            self.request_id,
+            visible_indices,
+            self.match_count,
+            self.filter_counts,
+            widest_visible_text,
+            visible_diff,
+        )
+
+    def _evaluate(self, numbered_lines):
+        """Return the visible indices among ``(index, line)`` pairs, or None if stopped."""
+        visible_indices = visible_index_array()
+        prepared_filters = self.prepared_filters
+        filter_counts = self.filter_counts
+        line_sources = self.line_sources
+        hidden_sources = self.hidden_sources
+
+        for i, line in numbered_lines:
+            if not self.is_running:
+                return None
+
+            # Lines from disabled sources are filtered out before any filter sees them.
+            if hidden_sources and line_sources[i] in hidden_sources:
+                continue
 
             matching_filters, is_visible = evaluate_line(
                 line,
@@ -194,23 +928,80 @@ class FilterWorker(QThread):
                 filter_counts[matched_filter.original_index] += 1
 
             if matching_filters and not matching_filters[-1].filter_data["exclude"]:
-                match_count += 1
+                self.match_count += 1
 
             if is_visible:
                 visible_indices.append(i)
-                measured_text = measured_log_line_text(line)
-                measured_length = len(measured_text)
-                if measured_length > widest_visible_length:
-                    widest_visible_length = measured_length
-                    widest_visible_text = measured_text
-        
-        self.finished_filtering.emit(
-            self.request_id,
-            visible_indices,
-            match_count,
-            filter_counts,
-            widest_visible_text,
-        )
+        return visible_indices
+
+    def _indexed_candidates(self, count):
+        """Return the only lines that can match a filter, or None to check every line.
+
+        Needs an index over exactly ``count`` lines and, since lines without
+        matches must stay hidden and uncounted, only-filtered mode with a
+        trigram for every active filter.
+        """
+        index = self.trigram_index
+        if index is None or index.line_count != count or not self.show_only_filtered or not self.prepared_filters:
+            return None
+        blocks = set()
+        for prepared_filter in self.prepared_filters:
+            trigrams = filter_trigrams(prepared_filter.filter_data)
+            if not trigrams:
+                return None
+            blocks.update(index.candidate_blocks(trigrams))
+        return index.lines_in_blocks(sorted(blocks))
+
+    def _line_lengths(self, count):
+        # The model measures every line once when it is stored; only callers
+        # without that column pay for measuring here.
+        if self.line_lengths is not None and len(self.line_lengths) >= count:
+            return self.line_lengths
+        return measured_line_lengths(islice(self.lines, count))
+
+    def _evaluate_range(self, start, stop):
+        return self._evaluate(enumerate(self.lines[start:stop], start))
+
+    def _run_progressive(self, count):
+        """Filter the lines around ``focus_index`` first, then the rest.
+
+        The focus window is published at once and every following block of
+        ``progress_lines`` is published as rows to append, so the view can show
+        the user's region while the pass continues. Lines before the window
+        come last and reach the view through the final diff, which prepends
+        them to the rows published so far.
+        """
+        focus = min(max(self.focus_index, 0), count - 1)
+        start = max(focus - self.focus_lines // 2, 0)
+        stop = min(start + self.focus_lines, count)
+
+        published = self._evaluate_range(start, stop)
+        if published is None:
+            return None, None
+        # The view keeps and extends what it is sent, so it gets its own copy.
+        self.partial_filtering.emit(self.request_id, published[:])
+
+        position = stop
+        while position < count:
+            end = min(position + self.progress_lines, count)
+            rows = self._evaluate_range(position, end)
+            if rows is None:
+                return None, None
+            if rows:
+                published.extend(rows)
+                self.partial_filtering.emit(self.request_id, rows)
+            position = end
+
+        leading = visible_index_array()
+        for position in range(0, start, self.progress_lines):
+            rows = self._evaluate_range(position, min(position + self.progress_lines, start))
+            if rows is None:
+                return None, None
+            leading.extend(rows)
+
+        # No base: the diff applies to the rows the view built from partial_filtering.
+        visible_diff = VisibleDiff(None, len(published), [], [(0, leading)] if leading else [])
+        return leading + published, visible_diff
 
     def stop(self):
         self.is_running = False
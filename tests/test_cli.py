@@ -0,0 +1,151 @@
+import bz2
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC)
+
+from loganalysis_gui.cli import FilterFileError, color_marker, load_filter_files, main
+from loganalysis_gui.filter_engine import prepare_filters
+
+
+LINES = [
+    "01-02 03:04:05.000  100  200 I Wifi    : scan started\n",
+    "01-02 03:04:05.100  100  200 E Wifi    : scan failed\n",
+    "01-02 03:04:05.200  300  301 D Net     : idle\n",
+    "01-02 03:04:05.300  300  301 W Net     : scan noise\n",
+]
+
+
+def make_filter(text, **options):
+    filter_data = {
+        "text": text,
+        "case_sensitive": False,
+        "regex": False,
+        "exclude": False,
+        "bg_color": "None",
+        "text_color": "None",
+        "active": True,
+    }
+    filter_data.update(options)
+    return filter_data
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_filters(self, name, filters, enabled=True):
+        path = self.path(name)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"name": name, "enabled": enabled, "filters": filters}, handle)
+        return path
+
+    def write_logs(self):
+        plain = self.path("one.log")
+        with open(plain, "w", encoding="utf-8") as handle:
+            handle.writelines(LINES)
+        with gzip.open(self.path("two.log.gz"), "wt", encoding="utf-8") as handle:
+            handle.writelines(LINES[:2])
+        with bz2.open(self.path("three.log.bz2"), "wt", encoding="utf-8") as handle:
+            handle.write(LINES[3].rstrip("\n"))
+        return [plain, self.path("two.log.gz"), self.path("three.log.bz2")]
+
+    def test_filters_inputs_in_order_and_reports_counts(self):
+        filters = self.write_filters("triage.json", [
+            make_filter("scan"),
+            make_filter("failed", exclude=True),
+            make_filter("wifi", field="tag", active=False),
+        ])
+        disabled = self.write_filters("off.json", [make_filter("idle")], enabled=False)
+        counts_path = self.path("counts.json")
+        stdout = io.StringIO()
+
+        status = main(["-f", filters, "-f", disabled, "-j", "2", "--counts", counts_path, *self.write_logs()],
+                      stdout=stdout)
+
+        self.assertEqual(status, 0)
+        self.assertEqual(stdout.getvalue(), LINES[0] + LINES[3] + LINES[0] + LINES[3])
+        with open(counts_path, encoding="utf-8") as handle:
+            counts = json.load(handle)
+        self.assertEqual([entry["filter_counts"] for entry in counts["files"]], [[3, 1, 0], [2, 1, 0], [1, 0, 0]])
+        self.assertEqual([entry["visible"] for entry in counts["files"]], [2, 1, 1])
+        self.assertEqual([entry["count"] for entry in counts["filters"]], [6, 2, 0])
+
+    def test_single_job_streams_without_temporary_parts(self):
+        filters = self.write_filters("triage.json", [make_filter("scan")])
+        output_path = self.path("out.log")
+
+        with patch("loganalysis_gui.cli.tempfile.mkdtemp", side_effect=AssertionError("temp part")):
+            status = main(["-f", filters, "-j", "1", "-o", output_path, *self.write_logs()])
+
+        self.assertEqual(status, 0)
+        with open(output_path, encoding="utf-8") as handle:
+            self.assertEqual(handle.read(), LINES[0] + LINES[1] + LINES[3] + LINES[0] + LINES[1] + LINES[3])
+
+    def test_output_dir_line_numbers_and_show_all(self):
+        filters = self.write_filters("triage.json", [make_filter("E", field="level")])
+        inputs = self.write_logs()[:2]
+
+        status = main(["-f", filters, "--output-dir", self.path("out"), "--show-all", "-n", "-j", "1", *inputs])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(os.listdir(self.path("out"))), ["one.log.filtered", "two.log.filtered"])
+        with open(os.path.join(self.path("out"), "two.log.filtered"), encoding="utf-8") as handle:
+            self.assertEqual(handle.read(), f"     1 | {LINES[0]}     2 | {LINES[1]}")
+
+    def test_color_markers_follow_the_winning_filter(self):
+        prepared = prepare_filters([
+            make_filter("scan", bg_color="Yellow"),
+            make_filter("failed", text_color="Red"),
+        ])
+        self.assertEqual(color_marker(prepared), "\x1b[38;2;255;0;0;48;2;255;255;0m")
+        self.assertEqual(color_marker(prepared[:1]), "\x1b[48;2;255;255;0m")
+
+        filters = self.write_filters("triage.json", [make_filter("failed", text_color="Red")])
+        stdout = io.StringIO()
+        main(["-f", filters, "--color", "always", self.write_logs()[0]], stdout=stdout)
+        self.assertEqual(stdout.getvalue(), f"\x1b[38;2;255;0;0m{LINES[1].rstrip()}\x1b[0m\n")
+
+    def test_invalid_filters_and_unreadable_inputs_fail(self):
+        broken = self.write_filters("broken.json", [make_filter("(", regex=True)])
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(main(["-f", broken, "missing.log"]), 2)
+        self.assertIn("broken.json", stderr.getvalue())
+        with self.assertRaises(FilterFileError):
+            load_filter_files([self.path("missing.json")])
+        # Files that parse to no filters would pass every line through.
+        for name, content in (("scalar.json", 5), ("typo.json", {"filter": [make_filter("scan")]}), ("empty.json", [])):
+            with open(self.path(name), "w", encoding="utf-8") as handle:
+                json.dump(content, handle)
+            with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                self.assertEqual(main(["-f", self.path(name), self.write_logs()[0]], stdout=io.StringIO()), 2)
+            self.assertIn(name, stderr.getvalue())
+
+        filters = self.write_filters("triage.json", [make_filter("scan")])
+        stdout = io.StringIO()
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            status = main(["-f", filters, self.path("missing.log"), self.write_logs()[0]], stdout=stdout)
+        self.assertEqual(status, 1)
+        self.assertIn("missing.log", stderr.getvalue())
+        self.assertEqual(stdout.getvalue(), LINES[0] + LINES[1] + LINES[3])
+
+    def test_imports_without_pyqt(self):
+        code = "import sys; sys.modules['PyQt5'] = None; import loganalysis_gui.cli"
+        env = dict(os.environ, PYTHONPATH=SRC)
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+if __name__ == "__main__":
+    unittest.main()
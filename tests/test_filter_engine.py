@@ -4,11 +4,23 @@ import unittest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
-from loganalysis_gui.filter_engine import evaluate_line, filter_matches_line, find_matching_filters, prepare_filters
+from loganalysis_gui.filter_engine import (
+    diff_visible_indices,
+    evaluate_line,
+    filter_field_error,
+    filter_matches_line,
+    find_matching_filters,
+    prepare_filters,
+)
+from loganalysis_gui.logcat import logcat_filter_args
 
 
-def make_filter(text, *, active=True, regex=False, case_sensitive=False, exclude=False):
+THREADTIME_LINE = "01-02 03:04:05.678  1234  1240 W ActivityManager: Slow operation took 42ms\n"
+
+
+def make_filter(text, *, active=True, regex=False, case_sensitive=False, exclude=False, field="line"):
     return {
+        "field": field,
         "text": text,
         "case_sensitive": case_sensitive,
         "regex": regex,
@@ -83,6 +95,77 @@ class FilterEngineTests(unittest.TestCase):
         self.assertIs(regex1, regex2)
         self.assertEqual(len(_REGEX_CACHE), 1)
 
+    def test_field_filters_match_parsed_threadtime_columns(self):
+        self.assertTrue(filter_matches_line(THREADTIME_LINE, make_filter("ActivityManager", field="tag")))
+        self.assertFalse(filter_matches_line(THREADTIME_LINE, make_filter("Activity", field="tag")))
+        self.assertTrue(filter_matches_line(THREADTIME_LINE, make_filter("^Activity", field="tag", regex=True)))
+        self.assertTrue(filter_matches_line(THREADTIME_LINE, make_filter("I", field="level")))
+        self.assertFalse(filter_matches_line(THREADTIME_LINE, make_filter("E", field="level")))
+        self.assertTrue(filter_matches_line(THREADTIME_LINE, make_filter("1234", field="pid")))
+        self.assertTrue(filter_matches_line(THREADTIME_LINE, make_filter("slow", field="message")))
+        self.assertFalse(filter_matches_line(THREADTIME_LINE, make_filter("ActivityManager", field="message")))
+        self.assertFalse(filter_matches_line("not a logcat line\n", make_filter("I", field="level")))
+
+    def test_filter_field_error_validates_level_and_pid(self):
+        self.assertIsNone(filter_field_error(make_filter("w", field="level")))
+        self.assertIsNotNone(filter_field_error(make_filter("warn", field="level")))
+        self.assertIsNotNone(filter_field_error(make_filter("12a", field="pid")))
+        self.assertIsNotNone(filter_field_error(make_filter("x", field="bogus")))
+
+    def test_logcat_filter_args_only_translates_exact_include_sets(self):
+        self.assertEqual(
+            logcat_filter_args(
+                [make_filter("ActivityManager", field="tag"), make_filter("E", field="level")],
+                show_only_filtered=True,
+            ),
+            ["ActivityManager:V", "*:E"],
+        )
+        self.assertEqual(
+            logcat_filter_args([make_filter("Wifi", field="tag")], show_only_filtered=True),
+            ["Wifi:V", "*:S"],
+        )
+        self.assertEqual(
+            logcat_filter_args([make_filter("a.b", field="message")], show_only_filtered=True),
+            ["-e", "[aA]\\.[bB]"],
+        )
+        self.assertEqual(
+            logcat_filter_args([make_filter("1234", field="pid")], show_only_filtered=True),
+            ["--pid=1234"],
+        )
+        # Mixed fields, whole-line filters and disabled show-only-filtered keep everything.
+        self.assertEqual(
+            logcat_filter_args(
+                [make_filter("Wifi", field="tag"), make_filter("boom", field="message")],
+                show_only_filtered=True,
+            ),
+            [],
+        )
+        self.assertEqual(logcat_filter_args([make_filter("alpha")], show_only_filtered=True), [])
+        self.assertEqual(
+            logcat_filter_args([make_filter("Wifi", field="tag")], show_only_filtered=False), []
+        )
+
+    def test_diff_visible_indices_replays_to_new_rows(self):
+        old = [0, 1, 2, 5, 6, 9, 10]
+        new = [1, 2, 3, 4, 6, 9, 11, 12]
+
+        diff = diff_visible_indices(old, new)
+
+        self.assertEqual(diff.removed, [(0, 0), (3, 3), (6, 6)])
+        self.assertEqual(diff.inserted, [(2, [3, 4]), (6, [11, 12])])
+        rows = list(old)
+        for first_row, last_row in reversed(diff.removed):
+            del rows[first_row:last_row + 1]
+        for first_row, line_indices in diff.inserted:
+            rows[first_row:first_row] = line_indices
+        self.assertEqual(rows, new)
+
+    def test_diff_visible_indices_respects_snapshot_count_and_range_limit(self):
+        diff = diff_visible_indices([0, 2, 4, 6], [0, 2], old_count=2)
+        self.assertEqual((diff.removed, diff.inserted), ([], []))
+
+        self.assertIsNone(diff_visible_indices(list(range(0, 20, 2)), list(range(1, 20, 2)), max_ranges=4))
+
 
 if __name__ == "__main__":
     unittest.main()
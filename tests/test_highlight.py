@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.filter_engine import prepare_filters
+from loganalysis_gui.highlight import (
+    SEARCH_SPAN,
+    HighlightCache,
+    compute_row_highlight,
+    filter_colors,
+    match_snippet,
+    search_hit_rows,
+    search_pattern,
+)
+
+
+THREADTIME_LINE = "01-02 03:04:05.678  1234  1240 W Wifi    : scan wifi done\n"
+
+
+def make_filter(text, *, regex=False, case_sensitive=False, exclude=False, field="line", bg_color="None"):
+    return {
+        "field": field,
+        "text": text,
+        "case_sensitive": case_sensitive,
+        "regex": regex,
+        "exclude": exclude,
+        "bg_color": bg_color,
+        "text_color": "None",
+        "active": True,
+    }
+
+
+class HighlightTests(unittest.TestCase):
+    def test_spans_cover_every_match_of_line_filters_and_search(self):
+        filters = prepare_filters([make_filter("o", bg_color="Red"), make_filter(r"\d+", regex=True)])
+
+        entry = compute_row_highlight("foo 42 boo\n", filters, search_pattern("BOO", False, False))
+
+        self.assertEqual((entry.background, entry.foreground, entry.matched), ("Red", None, True))
+        self.assertEqual(
+            entry.spans,
+            [(1, 2, 0), (2, 3, 0), (4, 6, 1), (7, 10, SEARCH_SPAN), (8, 9, 0), (9, 10, 0)],
+        )
+
+    def test_field_filters_highlight_only_their_part_of_the_line(self):
+        filters = prepare_filters([make_filter("wifi", field="message"), make_filter("Wifi", field="tag")])
+
+        entry = compute_row_highlight(THREADTIME_LINE, filters)
+
+        message_start = THREADTIME_LINE.index("scan")
+        tag_start = THREADTIME_LINE.index("Wifi")
+        self.assertEqual(
+            entry.spans,
+            [(tag_start, tag_start + 4, 1), (message_start + 5, message_start + 9, 0)],
+        )
+
+    def test_unmatched_and_excluded_lines_have_no_colors(self):
+        self.assertFalse(compute_row_highlight("plain\n", prepare_filters([make_filter("x")])).matched)
+        self.assertEqual(
+            filter_colors([make_filter("a", bg_color="Red"), make_filter("a", exclude=True)]),
+            (None, None),
+        )
+        self.assertIsNone(search_pattern("(", False, True))
+
+    def test_cache_evicts_least_recently_used_rows_and_tracks_generation(self):
+        cache = HighlightCache(capacity=2)
+        cache.update({1: "one", 2: "two"})
+        cache.get(1)
+        cache.update({3: "three"})
+
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+
+        generation = cache.generation
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.generation), (0, generation + 1))
+
+    def test_hit_rows_use_scanned_bytes_then_match_the_rest(self):
+        lines = ["alpha\n", "beta\n", "alpha\n", "gamma\n", "alpha\n", "alpha\n"]
+        visible = [0, 2, 3, 4, 5]
+        # Line 2 is deliberately wrong in the bitmap to show it is trusted.
+        scanned = bytearray([1, 0, 0])
+
+        rows = search_hit_rows(visible, lines, search_pattern("alpha", False, False), scanned)
+
+        self.assertEqual(rows.tolist(), [0, 3, 4])
+        self.assertEqual(
+            search_hit_rows(visible, lines, search_pattern("alpha", False, False), scanned, 2, 4).tolist(),
+            [3],
+        )
+
+    def test_snippet_keeps_context_around_first_match(self):
+        line = "x" * 300 + "needle" + "y" * 300 + "\n"
+
+        snippet = match_snippet(line, search_pattern("needle", False, False), width=40)
+
+        self.assertEqual(snippet, "..." + "x" * 10 + "needle" + "y" * 24 + "...")
+        self.assertEqual(match_snippet("short\n", None), "short")
+        self.assertEqual(match_snippet("abcdef", None, width=3), "abc...")
+
+
+if __name__ == "__main__":
+    unittest.main()
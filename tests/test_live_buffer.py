@@ -0,0 +1,129 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.live_buffer import PendingChunkBuffer
+from loganalysis_gui.live_merge import LiveStreamMerger, RecentLineDeduper
+
+
+class PendingChunkBufferTests(unittest.TestCase):
+    def test_overflow_spills_to_disk_and_drains_in_order(self):
+        buffer = PendingChunkBuffer(memory_limit=3)
+
+        buffer.append(["a\n", "b\n"])
+        buffer.append(["c\n", "d\n", "e\n"])
+        buffer.append(["f\n"])
+
+        self.assertEqual(buffer.buffered_count, 3)
+        self.assertEqual(buffer.spilled_count, 3)
+        lines, sources = buffer.drain()
+        self.assertEqual(lines, ["a\n", "b\n", "c\n", "d\n", "e\n", "f\n"])
+        self.assertEqual(list(sources), [0] * 6)
+        self.assertEqual(len(buffer), 0)
+
+    def test_bounded_drain_keeps_newest_lines(self):
+        buffer = PendingChunkBuffer(memory_limit=2)
+        buffer.append(["1\n", "2\n", "3\n"], 1)
+        buffer.append(["4\n", "5\n"], [2, 3])
+        buffer.append(["6\n", "7 é\n"], 4)
+
+        lines, sources = buffer.drain(max_lines=3)
+        self.assertEqual(lines, ["5\n", "6\n", "7 é\n"])
+        self.assertEqual(list(sources), [3, 4, 4])
+
+    def test_lines_without_newline_round_trip_through_spill(self):
+        buffer = PendingChunkBuffer(memory_limit=0)
+        buffer.append(["partial", "next\r\n"])
+
+        self.assertEqual(buffer.drain()[0], ["partial", "next\r\n"])
+
+    def test_clear_discards_spill_file(self):
+        buffer = PendingChunkBuffer(memory_limit=1)
+        buffer.append(["a\n", "b\n"])
+
+        buffer.clear()
+
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.drain()[0], [])
+
+
+class LiveStreamMergerTests(unittest.TestCase):
+    def test_untimestamped_lines_stay_with_their_source(self):
+        merger = LiveStreamMerger()
+        merger.push(0, ["01-01 00:00:02.000 a\n"])
+        merger.push(1, ["01-01 00:00:01.000 b\n", "--------- beginning of crash\n", "01-01 00:00:03.000 c\n"])
+
+        lines, sources = merger.drain()
+
+        self.assertEqual(
+            lines,
+            [
+                "01-01 00:00:01.000 b\n",
+                "--------- beginning of crash\n",
+                "01-01 00:00:02.000 a\n",
+                "01-01 00:00:03.000 c\n",
+            ],
+        )
+        self.assertEqual(list(sources), [1, 1, 0, 1])
+        self.assertEqual(len(merger), 0)
+
+    def test_release_keeps_order_across_drains_until_a_source_goes_idle(self):
+        merger = LiveStreamMerger(hold_drains=2)
+        merger.push(0, ["01-01 00:00:01.000 a1\n", "01-01 00:00:05.000 a5\n"])
+        merger.push(1, ["01-01 00:00:02.000 b2\n"])
+
+        self.assertEqual(merger.release()[0], ["01-01 00:00:01.000 a1\n", "01-01 00:00:02.000 b2\n"])
+        merger.push(1, ["01-01 00:00:03.000 b3\n"])
+        lines, sources = merger.release()
+        self.assertEqual(lines, ["01-01 00:00:03.000 b3\n"])
+        self.assertEqual(list(sources), [1])
+        self.assertEqual(len(merger), 1)
+
+        # a5 has waited hold_drains releases now, so it goes out regardless.
+        self.assertEqual(merger.release()[0], ["01-01 00:00:05.000 a5\n"])
+        self.assertEqual(len(merger), 0)
+
+    def test_release_bounds_the_hold_when_device_clocks_are_skewed(self):
+        merger = LiveStreamMerger(hold_drains=2)
+        released = []
+        for second in range(10):
+            # Both devices stay busy; device 1's clock runs an hour behind.
+            merger.push(0, [f"01-01 01:00:{second:02d}.000 a{second}\n"])
+            merger.push(1, [f"01-01 00:00:{second:02d}.000 b{second}\n"])
+            released.append(merger.release()[0])
+            self.assertLessEqual(len(merger), 3)
+
+        out = [line for lines in released for line in lines]
+        self.assertEqual([line for line in out if " a" in line], [f"01-01 01:00:{second:02d}.000 a{second}\n" for second in range(8)])
+        # Each device line shows up hold_drains releases after it arrived.
+        self.assertEqual(released[3], ["01-01 00:00:03.000 b3\n", "01-01 01:00:01.000 a1\n"])
+        self.assertEqual(len(merger.drain()[0]), 2)
+
+    def test_deduper_drops_only_the_resumed_overlap(self):
+        deduper = RecentLineDeduper(capacity=3)
+        self.assertEqual(deduper.filter(["a\n", "x\n", "x\n", "b\n"]), ["a\n", "x\n", "x\n", "b\n"])
+
+        deduper.begin_resume()
+        # "a" fell out of the window; the repeated "x" is dropped twice, the third is new.
+        self.assertEqual(deduper.filter(["x\n", "x\n"]), [])
+        self.assertTrue(deduper.resuming)
+        self.assertEqual(deduper.filter(["b\n", "x\n", "c\n"]), ["x\n", "c\n"])
+        self.assertFalse(deduper.resuming)
+        self.assertEqual(deduper.filter(["b\n"]), ["b\n"])
+
+    def test_deduper_skips_logcat_banner_at_start_of_resume(self):
+        seen = [f"01-02 03:04:0{index}.000  1  1 I T: m{index}\n" for index in range(7)]
+        deduper = RecentLineDeduper()
+        deduper.filter(seen)
+
+        deduper.begin_resume()
+        resumed = ["--------- beginning of main\n", seen[5], seen[6], "01-02 03:04:07.000  1  1 I T: m7\n"]
+        self.assertEqual(deduper.filter(resumed), resumed[3:])
+        self.assertFalse(deduper.resuming)
+        self.assertEqual(deduper.filter(["--------- beginning of system\n"]), ["--------- beginning of system\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from PyQt5.QtCore import QAbstractListModel, QItemSelectionModel, QModelIndex, QPoint, QRect
+from PyQt5.QtWidgets import QAbstractItemView, QApplication
+
+from loganalysis_gui.log_view import DEFAULT_CONTENT_WIDTH, LogView
+
+
+class CountingModel(QAbstractListModel):
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def data(self, index, role):
+        return None
+
+
+class LogViewTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.view = LogView()
+        self.view.resize(300, 200)
+
+    def tearDown(self):
+        self.view.deleteLater()
+
+    def make_model(self, rows):
+        model = CountingModel(rows)
+        self.view.setModel(model)
+        self.view.show()
+        self.app.processEvents()
+        return model
+
+    def test_vertical_scroll_range_counts_rows_for_huge_models(self):
+        self.make_model(200_000_000)
+        scrollbar = self.view.verticalScrollBar()
+
+        self.assertEqual(scrollbar.maximum(), 200_000_000 - self.view._page_rows())
+        self.view.scrollToBottom()
+        self.assertEqual(self.view.indexAt(QPoint(0, 0)).row(), scrollbar.maximum())
+
+    def test_index_at_and_visual_rect_agree(self):
+        self.make_model(1000)
+        self.view.verticalScrollBar().setValue(40)
+        row_height = self.view.rowHeight()
+
+        index = self.view.indexAt(QPoint(5, row_height * 3 + 1))
+
+        self.assertEqual(index.row(), 43)
+        self.assertEqual(self.view.visualRect(index).top(), row_height * 3)
+        self.assertFalse(self.view.indexAt(QPoint(0, -row_height * 50)).isValid())
+
+    def test_scroll_to_honours_hints(self):
+        model = self.make_model(1000)
+        page = self.view._page_rows()
+        scrollbar = self.view.verticalScrollBar()
+
+        self.view.scrollTo(model.index(500, 0))
+        self.assertEqual(scrollbar.value(), 500 - page + 1)
+        self.view.scrollTo(model.index(500, 0))
+        self.assertEqual(scrollbar.value(), 500 - page + 1)
+        self.view.scrollTo(model.index(10, 0))
+        self.assertEqual(scrollbar.value(), 10)
+        self.view.scrollTo(model.index(500, 0), QAbstractItemView.PositionAtTop)
+        self.assertEqual(scrollbar.value(), 500)
+        self.view.scrollTo(model.index(500, 0), QAbstractItemView.PositionAtCenter)
+        self.assertEqual(scrollbar.value(), 500 - page // 2)
+
+    def test_rubber_band_selection_selects_row_ranges(self):
+        self.make_model(1000)
+        self.view.verticalScrollBar().setValue(100)
+        row_height = self.view.rowHeight()
+
+        self.view.setSelection(
+            QRect(0, row_height * 2, 10, row_height * 2),
+            QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows,
+        )
+
+        rows = [index.row() for index in self.view.selectionModel().selectedRows()]
+        self.assertEqual(sorted(rows), [102, 103])
+
+    def test_content_width_drives_horizontal_range(self):
+        self.make_model(10)
+        viewport_width = self.view.viewport().width()
+
+        self.assertEqual(self.view.contentWidth(), DEFAULT_CONTENT_WIDTH)
+        self.view.setContentWidth(viewport_width + 250)
+
+        self.assertEqual(self.view.horizontalScrollBar().maximum(), 250)
+        self.view.horizontalScrollBar().setValue(100)
+        self.assertEqual(self.view.visualRect(self.view.model().index(0, 0)).left(), -100)
+
+    def test_row_changes_update_scroll_range(self):
+        model = self.make_model(10)
+        page = self.view._page_rows()
+
+        model.beginInsertRows(QModelIndex(), 10, 10 + page + 4)
+        model.rows += page + 5
+        model.endInsertRows()
+
+        self.assertEqual(self.view.verticalScrollBar().maximum(), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import gzip
 import json
 import os
 import sys
@@ -11,9 +12,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 
 from PyQt5.QtCore import QPoint, Qt
 from PyQt5.QtGui import QFontMetrics
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWidgets import QApplication, QMessageBox
 
-from loganalysis_gui.dialogs import FilterDialog
+from loganalysis_gui.dialogs import FilterDialog, FindDialog
 from loganalysis_gui.main_window import LogAnalysisMainWindow
 
 
@@ -36,6 +37,9 @@ class DummyFindDialog:
     def set_status(self, text):
         self.status = text
 
+    def set_hit_count(self, count, scanning=False):
+        self.hit_count = (count, scanning)
+
 
 class LogAnalysisMainWindowTests(unittest.TestCase):
     @classmethod
@@ -44,11 +48,20 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
 
     def setUp(self):
         self.window = LogAnalysisMainWindow()
+        # Keep real adb scans from racing the status-bar assertions.
+        self.window._stop_device_watcher()
 
     def tearDown(self):
         self.window._cancel_file_load()
         self.window._stop_filter_worker()
         self.window._stop_adb_worker()
+        self.window._stop_device_watcher()
+        self.window._stop_highlight_worker()
+        self.window._stop_search_worker()
+        self.window._stop_find_index_worker()
+        self.window._stop_trigram_index_worker()
+        self.window._stop_export_worker()
+        self.window._stop_copy_worker()
         self.window.deleteLater()
         self.app.processEvents()
 
@@ -133,6 +146,41 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         self.assertEqual(self.window.log_view.currentIndex().row(), 0)
         self.assertEqual(self.window.find_dialog.status, "")
 
+    def test_find_navigates_cached_hit_rows_with_wrap_around(self):
+        self.window.find_dialog = DummyFindDialog()
+        self.window.log_model.set_lines(["alpha\n", "beta\n", "Alpha\n", "beta\n"])
+
+        self.window.find_in_files("alpha", forward=False)
+        self.assertEqual(self.window.log_view.currentIndex().row(), 2)
+
+        with patch("loganalysis_gui.main_window.search_hit_rows", side_effect=AssertionError):
+            self.window.find_in_files("alpha", forward=True)
+            self.assertEqual(self.window.log_view.currentIndex().row(), 0)
+            self.window.find_in_files("alpha", forward=False)
+            self.assertEqual(self.window.log_view.currentIndex().row(), 2)
+
+        # Appended rows extend the index; other row changes rebuild it.
+        self.window.log_model.append_chunk(["alpha again\n"])
+        self.window.find_in_files("alpha", forward=True)
+        self.assertEqual(self.window.log_view.currentIndex().row(), 4)
+        self.window.log_model.update_visible_indices([1, 3])
+        self.window.find_in_files("alpha", forward=True)
+        self.assertEqual(self.window.find_dialog.status, "Not found")
+
+    def test_find_builds_large_hit_index_in_background(self):
+        self.window.find_dialog = DummyFindDialog()
+        self.window.log_model.set_lines([f"line {index}\n" for index in range(50)] + ["needle\n"])
+
+        with patch("loganalysis_gui.main_window.FIND_INDEX_BACKGROUND_ROWS", 10):
+            self.window.find_in_files("needle", forward=True)
+        self.assertEqual(self.window.find_dialog.status, "Searching...")
+        self.window.find_index_thread.wait()
+        self.app.processEvents()
+
+        self.assertEqual(self.window.log_view.currentIndex().row(), 50)
+        self.assertEqual(self.window.find_dialog.status, "")
+        self.assertIsNone(self.window.runtime.pending_find_forward)
+
     def test_tab_checkbox_stays_aligned_after_tab_deletion(self):
         self.window.add_filter_tab()
 
@@ -170,7 +218,7 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
 
         self.window.on_filtering_finished(1, [], 0, [0])
 
-        self.assertEqual(self.window.log_model.visible_indices, [0])
+        self.assertEqual(list(self.window.log_model.visible_indices), [0])
 
     def test_file_load_progress_updates_status_and_progress_bar(self):
         self.window.runtime.file_load_request_id = 1
@@ -272,23 +320,280 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         expected_width = self.expected_full_line_width("short")
         self.window.on_filtering_finished(1, [1], 0, [0], "x" * 500)
 
-        self.assertEqual(self.window.log_model.visible_indices, [0])
-        self.assertEqual(self.window.log_view.header().sectionSize(0), expected_width)
+        self.assertEqual(list(self.window.log_model.visible_indices), [0])
+        self.assertEqual(self.window.log_view.contentWidth(), expected_width)
 
     def test_live_chunks_buffer_during_refilter_and_flush_afterward(self):
         self.window.runtime.is_monitoring = True
         self.window.runtime.is_refiltering = True
 
         self.window.on_adb_chunk(["alpha\n"])
-        self.assertEqual(self.window.runtime.pending_chunks, [["alpha\n"]])
+        self.assertEqual(len(self.window.runtime.pending_chunks), 1)
         self.assertEqual(self.window.log_model.all_lines, [])
+        self.assertEqual(self.window.live_buffer_label.text(), "Buffered: 1 | Spilled: 0")
 
         self.window.runtime.is_refiltering = False
         self.window._flush_pending_chunks()
 
-        self.assertEqual(self.window.runtime.pending_chunks, [])
+        self.assertEqual(len(self.window.runtime.pending_chunks), 0)
+        self.assertTrue(self.window.live_buffer_label.isHidden())
         self.assertEqual(self.window.log_model.all_lines, ["alpha\n"])
-        self.assertEqual(self.window.log_model.visible_indices, [0])
+        self.assertEqual(list(self.window.log_model.visible_indices), [0])
+
+    def test_paused_overflow_spills_and_replays_as_single_append(self):
+        self.window.runtime.is_monitoring = True
+        self.window.runtime.is_paused = True
+        self.window.runtime.pending_chunks.memory_limit = 2
+
+        self.window.on_adb_chunk(["1\n", "2\n"])
+        self.window.on_adb_chunk(["3\n", "4\n"])
+        self.assertEqual(self.window.live_buffer_label.text(), "Buffered: 2 | Spilled: 2")
+
+        self.window.runtime.is_paused = False
+        with patch.object(
+            self.window,
+            "_apply_chunk_to_model",
+            wraps=self.window._apply_chunk_to_model,
+        ) as apply_chunk:
+            self.window._flush_pending_chunks()
+
+        apply_chunk.assert_called_once()
+        self.assertEqual(apply_chunk.call_args[0][0], ["1\n", "2\n", "3\n", "4\n"])
+        self.assertEqual(self.window.log_model.all_lines, ["1\n", "2\n", "3\n", "4\n"])
+
+    def test_multi_device_chunks_merge_by_timestamp_and_sources_filter(self):
+        self.window.runtime.is_monitoring = True
+        self.window.adb_threads = [Mock(source_id=0), Mock(source_id=1)]
+        self.window.log_model.source_labels = {0: "phone-a", 1: "phone-b"}
+
+        with patch.object(self.window, "sender", return_value=self.window.adb_threads[0]):
+            self.window.on_adb_chunk(["01-01 10:00:00.000 1 1 I A: a1\n", "01-01 10:00:02.000 1 1 I A: a2\n"])
+        with patch.object(self.window, "sender", return_value=self.window.adb_threads[1]):
+            self.window.on_adb_chunk(["01-01 10:00:01.000 2 2 I B: b1\n"])
+
+        self.assertEqual(self.window.log_model.all_lines, [])
+        self.window.live_merge_timer.stop()
+        self.window._drain_live_merger()
+
+        # a2 waits: phone-b has only reached 10:00:01 and may still send older lines.
+        self.assertEqual([line.rsplit(": ", 1)[1] for line in self.window.log_model.all_lines], ["a1\n", "b1\n"])
+        self.assertTrue(self.window.live_merge_timer.isActive())
+        with patch.object(self.window, "sender", return_value=self.window.adb_threads[1]):
+            self.window.on_adb_chunk(["01-01 10:00:01.500 2 2 I B: b2\n", "01-01 10:00:03.000 2 2 I B: b3\n"])
+        self.window.live_merge_timer.stop()
+        self.window._drain_live_merger()
+        self.window._drain_live_merger(final=True)
+
+        self.assertEqual(
+            [line.rsplit(": ", 1)[1] for line in self.window.log_model.all_lines],
+            ["a1\n", "b1\n", "b2\n", "a2\n", "b3\n"],
+        )
+        self.assertEqual(list(self.window.log_model.line_sources), [0, 1, 1, 0, 1])
+        self.assertTrue(
+            self.window.log_model.data(self.window.log_model.index(1, 0), Qt.DisplayRole).startswith(
+                "     2 | [phone-b] "
+            )
+        )
+
+        self.window.adb_threads = []
+        self.window.runtime.is_monitoring = False
+        self.window._set_source_visible(1, False)
+        self.wait_for_filtering()
+
+        self.assertEqual(list(self.window.log_model.visible_indices), [0, 3])
+
+    def test_failed_device_stream_is_kept_until_its_thread_finishes(self):
+        failed, healthy = Mock(source_id=0), Mock(source_id=1)
+        failed.isRunning.return_value = True
+        self.window.adb_threads = [failed, healthy]
+        self.window.log_model.source_labels = {0: "phone-a", 1: "phone-b"}
+
+        with patch.object(self.window, "sender", return_value=failed):
+            self.window.on_adb_error("device offline")
+            # A late error from the retired worker is ignored.
+            self.window.on_adb_error("device offline")
+
+        failed.stop.assert_called_once()
+        self.assertEqual(self.window.adb_threads, [healthy])
+        self.assertEqual(self.window.retired_adb_threads, [failed])
+        failed.finished.connect.assert_called_once_with(self.window._on_retired_adb_worker_finished)
+
+        with patch.object(self.window, "sender", return_value=failed):
+            self.window._on_retired_adb_worker_finished()
+
+        failed.wait.assert_called_once()
+        self.assertEqual(self.window.retired_adb_threads, [])
+        self.window.adb_threads = []
+
+    def test_retired_search_scan_is_dropped_once_it_finishes(self):
+        thread = Mock()
+        thread.isRunning.return_value = True
+        self.window.search_thread = thread
+
+        self.window._retire_search_worker()
+
+        # finished is connected before stop() so a scan that ends right
+        # after the isRunning() check still reaches the handler.
+        self.assertEqual(
+            [name for name, _args, _kwargs in thread.mock_calls][:2], ["finished.connect", "stop"]
+        )
+        self.assertEqual(self.window.retired_search_threads, [thread])
+
+        with patch.object(self.window, "sender", return_value=thread):
+            self.window._on_retired_search_worker_finished()
+
+        thread.wait.assert_called_once()
+        self.assertEqual(self.window.retired_search_threads, [])
+
+    def test_field_filters_push_down_and_restart_logcat_from_last_line(self):
+        old_worker = Mock(
+            source_id=0, device_serial="phone-a", buffer="main", last_timestamp="01-02 03:04:05.678"
+        )
+        old_worker.isRunning.return_value = False
+        self.window.adb_threads = [old_worker]
+        self.window.runtime.is_monitoring = True
+        self.window.log_model.show_only_filtered = True
+        tag_filter = make_filter("Wifi")
+        tag_filter["field"] = "tag"
+        self.tab_state(0).filters.append(tag_filter)
+
+        with patch("loganalysis_gui.main_window.AdbWorker") as worker_class:
+            self.window._update_logcat_pushdown()
+
+        old_worker.stop.assert_called_once()
+        worker_class.assert_called_once_with(
+            device_serial="phone-a",
+            binary=False,
+            buffer="main",
+            filter_args=["Wifi:V", "*:S"],
+            start_time="01-02 03:04:05.678",
+            telemetry=self.window.runtime.telemetry,
+            reconnect=True,
+            deduper=old_worker.deduper,
+        )
+        self.assertEqual(self.window.adb_threads, [worker_class.return_value])
+        worker_class.return_value.start.assert_called_once()
+
+        self.window.adb_threads = []
+        self.window.device_filter_action.setChecked(False)
+        self.assertEqual(self.window.runtime.logcat_filter_args, [])
+        self.window.runtime.is_monitoring = False
+
+    def test_replay_starts_monitoring_with_replay_worker(self):
+        with patch(
+            "loganalysis_gui.main_window.QFileDialog.getOpenFileName",
+            return_value=("/tmp/session.log", ""),
+        ), patch(
+            "loganalysis_gui.main_window.QInputDialog.getItem",
+            return_value=("10,000 lines/s", True),
+        ), patch("loganalysis_gui.main_window.ReplayWorker") as worker_class:
+            self.window.start_replay()
+
+        worker_class.assert_called_once_with(
+            "/tmp/session.log", "rate", rate=10000, telemetry=self.window.runtime.telemetry
+        )
+        self.assertEqual(self.window.adb_threads, [worker_class.return_value])
+        worker_class.return_value.start.assert_called_once()
+        self.assertTrue(self.window.runtime.is_monitoring)
+        self.assertEqual(self.window.log_model.source_labels, {0: "session.log"})
+
+        self.window.toggle_adb_monitoring()
+
+        worker_class.return_value.stop.assert_called_once()
+        self.assertIsNone(self.window.runtime.replay_source)
+        self.assertFalse(self.window.runtime.is_monitoring)
+
+    def test_live_telemetry_records_only_while_panel_is_enabled(self):
+        telemetry = self.window.runtime.telemetry
+        self.window._apply_chunk_to_model(["a\n"])
+        self.assertEqual(telemetry.summary()["apply_chunk_ms"]["count"], 0)
+
+        self.window._set_telemetry_enabled(True)
+        self.window._apply_chunk_to_model(["b\n", "c\n"])
+
+        summary = telemetry.summary()
+        self.assertEqual(summary["append_chunk_ms"]["count"], 1)
+        self.assertEqual(summary["apply_chunk_ms"]["count"], 1)
+        self.assertTrue(self.window.telemetry_timer.isActive())
+        self.window._refresh_telemetry()
+        self.assertTrue(self.window.telemetry_label.text().startswith("Ingest: "))
+        self.assertIn("append_chunk", self.window.telemetry_view.toPlainText())
+
+        self.window._set_telemetry_enabled(False)
+        self.assertFalse(telemetry.enabled)
+        self.assertFalse(self.window.telemetry_timer.isActive())
+
+    def test_recorded_live_session_reopens_with_trimmed_lines(self):
+        lines = [f"01-02 03:04:05.{index:03d}  1  1 I T: line {index}\n" for index in range(6)]
+        with tempfile.TemporaryDirectory() as directory:
+            with patch(
+                "loganalysis_gui.main_window.QFileDialog.getExistingDirectory",
+                return_value=directory,
+            ):
+                self.window.record_sessions_action.setChecked(True)
+            self.assertEqual(self.window.runtime.recording_directory, directory)
+            for buffer, action in self.window.buffer_actions.items():
+                action.setChecked(buffer == "main")
+
+            with patch("loganalysis_gui.main_window.AdbWorker"):
+                self.window.toggle_adb_monitoring()
+            recorder = self.window.runtime.recorder
+            self.assertIsNotNone(recorder)
+            with patch("loganalysis_gui.main_window.MAX_MONITOR_LINES", 2):
+                self.window.on_adb_chunk(lines)
+            self.wait_for_filtering()
+            self.assertEqual(len(self.window.log_model.all_lines), 2)
+
+            self.window.toggle_adb_monitoring()
+            self.assertIsNone(self.window.runtime.recorder)
+            self.assertEqual(recorder.lines_written, 6)
+
+            with patch(
+                "loganalysis_gui.main_window.QFileDialog.getExistingDirectory",
+                return_value=recorder.directory,
+            ):
+                self.window.open_recorded_session()
+            self.wait_for_filtering()
+
+        self.assertEqual(len(self.window.log_model.all_lines), 6)
+        self.assertEqual(list(self.window.log_model.visible_indices), list(range(6)))
+        self.assertEqual(self.window.runtime.loaded_file_path, recorder.directory)
+        self.assertEqual(self.window.log_model.source_labels, {0: "default"})
+        self.assertEqual(list(self.window.log_model.line_sources), [0] * 6)
+
+    def test_selected_buffers_share_one_logcat_per_device(self):
+        with patch("loganalysis_gui.main_window.AdbWorker") as worker_class:
+            worker_class.side_effect = lambda **kwargs: Mock(**kwargs)
+            # logcat's own default buffers: a single stream without -b.
+            self.window.toggle_adb_monitoring()
+            self.assertEqual([worker.buffer for worker in self.window.adb_threads], [None])
+            self.assertEqual(self.window.log_model.source_labels, {0: "default"})
+            self.window.toggle_adb_monitoring()
+
+            for buffer, action in self.window.buffer_actions.items():
+                action.setChecked(buffer in ("main", "radio", "events"))
+            self.window.toggle_adb_monitoring()
+            self.assertEqual([worker.buffer for worker in self.window.adb_threads], ["main,events,radio"])
+            self.assertFalse(self.window.source_filter_button.isEnabled())
+            self.window.toggle_adb_monitoring()
+
+    def test_binary_events_buffer_streams_as_its_own_source(self):
+        for buffer, action in self.window.buffer_actions.items():
+            action.setChecked(buffer in ("main", "events"))
+        self.window.binary_logcat_action.setChecked(True)
+
+        with patch("loganalysis_gui.main_window.AdbWorker") as worker_class:
+            worker_class.side_effect = lambda **kwargs: Mock(**kwargs)
+            self.window.toggle_adb_monitoring()
+
+        self.assertEqual([worker.buffer for worker in self.window.adb_threads], ["main", "events"])
+        self.assertEqual(self.window.log_model.source_labels, {0: "main", 1: "events"})
+        self.assertTrue(self.window.source_filter_button.isEnabled())
+        self.assertEqual(
+            [action.text() for action in self.window.source_filter_button.menu().actions()],
+            ["main", "events"],
+        )
+        self.window.toggle_adb_monitoring()
 
     def test_monitoring_trims_old_lines_after_limit(self):
         self.window.runtime.is_monitoring = True
@@ -306,12 +611,12 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
 
         self.assertEqual(self.window.log_view.textElideMode(), Qt.ElideRight)
         self.assertEqual(
-            self.window.log_view.header().sectionSize(0),
+            self.window.log_view.contentWidth(),
             self.window.log_view.viewport().width(),
         )
 
     def test_view_menu_action_enables_full_line_display(self):
-        initial_width = self.window.log_view.header().sectionSize(0)
+        initial_width = self.window.log_view.contentWidth()
 
         self.window.full_line_display_action.trigger()
         self.window.on_adb_chunk(["x" * 500 + "\n"])
@@ -319,7 +624,7 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         self.assertTrue(self.window.full_line_display_enabled)
         self.assertTrue(self.window.full_line_display_action.isChecked())
         self.assertEqual(self.window.log_view.textElideMode(), Qt.ElideNone)
-        self.assertGreater(self.window.log_view.header().sectionSize(0), initial_width)
+        self.assertGreater(self.window.log_view.contentWidth(), initial_width)
 
     def test_view_menu_action_restores_compact_mode(self):
         self.window.full_line_display_action.trigger()
@@ -331,7 +636,7 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         self.assertFalse(self.window.full_line_display_action.isChecked())
         self.assertEqual(self.window.log_view.textElideMode(), Qt.ElideRight)
         self.assertEqual(
-            self.window.log_view.header().sectionSize(0),
+            self.window.log_view.contentWidth(),
             self.window.log_view.viewport().width(),
         )
 
@@ -342,7 +647,7 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
 
         expected_width = self.expected_full_line_width(content)
 
-        self.assertEqual(self.window.log_view.header().sectionSize(0), expected_width)
+        self.assertEqual(self.window.log_view.contentWidth(), expected_width)
 
     def test_full_line_display_uses_widest_visible_filtered_line(self):
         hidden_line = "x" * 400
@@ -355,12 +660,86 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         self.window.apply_filters()
         self.wait_for_filtering()
 
-        self.assertEqual(self.window.log_model.visible_indices, [0])
+        self.assertEqual(list(self.window.log_model.visible_indices), [0])
         self.assertEqual(
-            self.window.log_view.header().sectionSize(0),
+            self.window.log_view.contentWidth(),
             self.expected_full_line_width(visible_line),
         )
 
+    def test_small_refilter_keeps_selection_with_row_updates(self):
+        lines = [f"{'keep' if index % 3 else 'drop'} {index}\n" for index in range(30)]
+        self.window.log_model.set_lines(lines)
+        self.window.log_view.setCurrentIndex(self.window.log_model.index(20, 0))
+        resets = []
+        removed = []
+        self.window.log_model.modelReset.connect(lambda: resets.append(True))
+        self.window.log_model.rowsRemoved.connect(lambda _parent, first, last: removed.append((first, last)))
+
+        self.tab_state(0).filters.append(make_filter("keep"))
+        self.window.apply_filters()
+        self.wait_for_filtering()
+
+        self.assertEqual(list(self.window.log_model.visible_indices), [i for i in range(30) if i % 3])
+        self.assertEqual(resets, [])
+        self.assertEqual(len(removed), 10)
+        current_row = self.window.log_view.currentIndex().row()
+        self.assertEqual(self.window.log_model.visible_indices[current_row], 20)
+
+    def test_large_refilter_falls_back_to_model_reset(self):
+        self.window.log_model.set_lines([f"line {index}\n" for index in range(400)])
+        resets = []
+        self.window.log_model.modelReset.connect(lambda: resets.append(True))
+
+        self.tab_state(0).filters.append(dict(make_filter(r"[02468]$"), regex=True))
+        self.window.apply_filters()
+        self.wait_for_filtering()
+
+        self.assertEqual(resets, [True])
+        self.assertEqual(list(self.window.log_model.visible_indices), list(range(0, 400, 2)))
+
+    def test_partial_filter_results_render_focus_region_before_final_result(self):
+        from loganalysis_gui.filter_engine import VisibleDiff
+        from loganalysis_gui.models import visible_index_array
+
+        self.window.log_model.set_lines([f"line {index}\n" for index in range(100)])
+        self.window.log_view.setCurrentIndex(self.window.log_model.index(60, 0))
+        self.window.runtime.target_source_idx = 60
+        request_id = self.window._next_filter_request_id()
+
+        shown = visible_index_array([58, 60, 62])
+        self.window.on_filtering_progress(request_id, shown)
+        self.assertEqual(list(self.window.log_model.visible_indices), [58, 60, 62])
+        self.assertEqual(self.window.log_view.currentIndex().row(), 1)
+
+        self.window.on_filtering_progress(request_id, visible_index_array([64, 66]))
+        self.assertEqual(self.window.log_model.rowCount(), 5)
+        # A result for an older request never touches the partial rows.
+        self.window.on_filtering_progress(request_id - 1, [1])
+        self.window.on_filtering_finished(request_id - 1, [1], 0, [0])
+        self.assertEqual(self.window.log_model.rowCount(), 5)
+
+        final = visible_index_array([0, 2, 58, 60, 62, 64, 66])
+        self.window.on_filtering_finished(request_id, final, 7, [7], "", VisibleDiff(None, 5, [], [(0, final[:2])]))
+
+        # The published rows were extended in place rather than replaced.
+        self.assertIs(self.window.log_model.visible_indices, shown)
+        self.assertEqual(self.window.log_model.visible_indices, final)
+        self.assertEqual(self.window.log_view.currentIndex().row(), 3)
+
+    def test_trimming_tracks_longest_line_without_remeasuring(self):
+        model = self.window.log_model
+        model.append_chunk(["x" * 30 + "\n", "y" * 10 + "\n", "z" * 20 + "  \n", "w" * 5 + "\n"])
+        self.assertEqual((model.max_line_length, model.longest_line_text), (30, "x" * 30))
+
+        with patch("loganalysis_gui.models.measured_line_lengths") as measure:
+            model.trim_front(1)
+            self.assertEqual((model.max_line_length, model.longest_line_text), (20, "z" * 20))
+            model.trim_front(2)
+            measure.assert_not_called()
+        self.assertEqual((model.max_line_length, model.longest_line_text), (5, "w" * 5))
+        self.assertEqual(model.all_lines, ["w" * 5 + "\n"])
+        self.assertEqual(list(model.visible_indices), [0])
+
     def test_live_append_ignores_hidden_long_lines_for_full_line_width(self):
         visible_line = "keep visible"
         hidden_line = "x" * 500
@@ -373,17 +752,255 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         self.wait_for_filtering()
 
         initial_width = self.expected_full_line_width(visible_line)
-        self.assertEqual(self.window.log_view.header().sectionSize(0), initial_width)
+        self.assertEqual(self.window.log_view.contentWidth(), initial_width)
 
         self.window.on_adb_chunk([f"{hidden_line}\n"])
-        self.assertEqual(self.window.log_view.header().sectionSize(0), initial_width)
+        self.assertEqual(self.window.log_view.contentWidth(), initial_width)
 
+        # The second append lands inside the throttle interval and resizes
+        # when the trailing timer fires.
         self.window.on_adb_chunk([f"{wider_visible_line}\n"])
+        self.assertEqual(self.window.log_view.contentWidth(), initial_width)
+        self.assertTrue(self.window.column_width_timer.isActive())
+        self.window.last_column_width_update -= 1
+        self.window.column_width_timer.timeout.emit()
         self.assertEqual(
-            self.window.log_view.header().sectionSize(0),
+            self.window.log_view.contentWidth(),
             self.expected_full_line_width(wider_visible_line),
         )
 
+    def test_text_width_cache_matches_font_metrics(self):
+        from loganalysis_gui.widgets import TextWidthCache
+
+        cache = TextWidthCache()
+        font = self.window.log_model.font
+        metrics = QFontMetrics(font)
+        for prefix, text in (("     3 | ", "x" * 700), ("", "tab\tand \u00e9\u4e2d")):
+            self.assertEqual(cache.width(font, text, prefix), metrics.horizontalAdvance(prefix + text))
+
+        with patch.object(QFontMetrics, "horizontalAdvance", side_effect=AssertionError):
+            cache.width(font, "tab\tand \u00e9\u4e2d")
+
+        font.setPointSize(font.pointSize() + 4)
+        self.assertEqual(cache.width(font, "abc"), QFontMetrics(font).horizontalAdvance("abc"))
+
+    def test_highlight_pass_fills_cache_for_rows_around_viewport(self):
+        self.window.resize(800, 600)
+        self.window.log_model.set_lines([f"line {index} alpha\n" for index in range(50)])
+        self.window.update_search_highlights("alpha", False, False)
+
+        self.window._start_highlight_pass()
+        self.window.highlight_thread.wait()
+        self.app.processEvents()
+
+        entry = self.window.highlight_cache.get(0)
+        self.assertEqual(entry.spans, [(7, 12, -1)])
+        # Painting reads the cache instead of the model's display data.
+        with patch.object(self.window.log_model, "data", side_effect=AssertionError):
+            self.window.log_view.viewport().grab()
+
+        self.window.clear_search_highlights()
+        self.assertEqual(len(self.window.highlight_cache), 0)
+
+    def test_search_hits_stream_into_model_and_follow_live_lines(self):
+        self.window.find_dialog = DummyFindDialog()
+        self.window.log_model.set_lines([f"line {index} {'alpha' if index % 2 else 'beta'}\n" for index in range(10)])
+
+        # Drive the scan by hand instead of through a SearchWorker.
+        self.window.log_model.set_search("ALPHA", False, False)
+        self.window._report_search_hits()
+        self.assertEqual(self.window.find_dialog.hit_count, (0, True))
+
+        self.window._on_search_hits(self.window.log_model.search_generation, 0, bytearray([0, 1] * 5))
+        # Blocks of an older search are dropped on arrival.
+        self.window._on_search_hits(self.window.log_model.search_generation - 1, 10, bytearray([1]))
+        self.assertEqual(self.window.find_dialog.hit_count, (5, False))
+        self.assertTrue(self.window.log_model.is_search_hit(3))
+        self.assertFalse(self.window.log_model.is_search_hit(4))
+
+        self.window.log_model.append_chunk(["alpha again\n", "gamma\n"])
+        self.assertEqual(self.window.log_model.search_hit_count, 6)
+        self.window.log_model.trim_front(4)
+        self.assertEqual(self.window.log_model.search_hit_count, 4)
+        self.assertEqual(list(self.window.log_model.search_hits), [0, 1, 0, 1, 0, 1, 1, 0])
+
+        self.window.clear_search_highlights()
+        self.assertEqual(self.window.find_dialog.hit_count, (None, False))
+
+    def test_narrowed_query_rescans_only_previous_hits(self):
+        lines = [f"line {index} {'alpha' if index % 3 == 0 else 'alps'} {'x' if index % 2 else 'y'}\n"
+                 for index in range(12)]
+        self.window.log_model.set_lines(lines)
+        model = self.window.log_model
+        model.set_search("alp", False, False)
+        self.window._on_search_hits(model.search_generation, 0, bytearray([1] * 12))
+        previous_hits = model.search_hit_lines
+
+        self.window.update_search_highlights("alpha", False, False)
+        worker = self.window.search_thread
+        self.assertIs(worker.candidates, previous_hits)
+        self.assertEqual(worker.candidate_stop, 12)
+        worker.wait()
+        self.app.processEvents()
+        self.assertEqual(list(model.search_hit_lines), [0, 3, 6, 9])
+
+        previous_hits = model.search_hit_lines
+        self.window.update_search_highlights("alpha x", False, False)
+        self.assertIs(self.window.search_thread.candidates, previous_hits)
+        self.window.search_thread.wait()
+        self.app.processEvents()
+        self.assertEqual(list(model.search_hit_lines), [3, 9])
+
+        # Regexes and case changes cannot reuse earlier hits.
+        model.set_search("alpha x", True, False)
+        self.assertIsNone(model.search_candidates)
+        model.set_search("alpha.x", True, True)
+        self.assertIsNone(model.search_candidates)
+
+    def test_find_dialog_debounces_typing(self):
+        dialog = FindDialog(self.window)
+        try:
+            with patch.object(self.window, "update_search_highlights") as update, \
+                    patch.object(self.window, "find_in_files") as find_in_files:
+                dialog.input_field.setText("a")
+                dialog.input_field.setText("al")
+                self.app.processEvents()
+                update.assert_not_called()
+                self.assertTrue(dialog.search_timer.isActive())
+
+                # Find next applies the pending text before searching.
+                dialog.find_next()
+                update.assert_called_once_with("al", False, False)
+                find_in_files.assert_called_once_with("al", forward=True, case=False, regex=False)
+                self.assertFalse(dialog.search_timer.isActive())
+        finally:
+            dialog.deleteLater()
+
+    def test_find_all_lists_hits_and_jumps_to_nearest_visible_row(self):
+        self.window.log_model.set_lines([f"line {index} {'alpha' if index % 3 == 0 else 'beta'}\n" for index in range(9)])
+        self.window.log_model.update_visible_indices([1, 2, 3, 5, 6])
+
+        self.window.find_all("alpha")
+        self.window.search_thread.wait()
+        self.app.processEvents()
+
+        results = self.window.find_results_model
+        self.assertFalse(self.window.find_results_dock.isHidden())
+        self.assertEqual(self.window.find_results_dock.windowTitle(), "Find Results (3)")
+        self.assertEqual(
+            [results.data(results.index(row, 0), Qt.DisplayRole) for row in range(results.rowCount())],
+            ["       1 | line 0 alpha", "       4 | line 3 alpha", "       7 | line 6 alpha"],
+        )
+
+        self.window._jump_to_find_result(results.index(2, 0))
+        self.assertEqual(self.window.log_view.currentIndex().row(), 4)
+        # Line 1 is filtered out, so the nearest visible row is selected.
+        self.window._jump_to_find_result(results.index(0, 0))
+        self.assertEqual(self.window.log_view.currentIndex().row(), 0)
+        self.assertIn("hidden", self.window.status_bar.currentMessage())
+
+        # Hits stream in as rows; trims drop the hits of trimmed lines.
+        self.window.log_model.append_chunk(["alpha live\n"])
+        self.window._report_search_hits()
+        self.assertEqual(results.rowCount(), 4)
+        self.window.log_model.trim_front(4)
+        self.assertEqual([results.line_index(row) for row in range(results.rowCount())], [2, 5])
+
+        # Closing the find dialog keeps the listed results.
+        self.window.clear_search_highlights()
+        self.assertEqual(results.rowCount(), 2)
+
+    def test_copy_selection_reads_row_intervals_from_the_line_store(self):
+        model = self.window.log_model
+        model.set_lines([f"line {index}\n" for index in range(8)])
+        model.update_visible_indices([0, 2, 3, 5, 7])
+        self.window.log_view.selectAll()
+
+        with patch.object(model, "data", side_effect=AssertionError):
+            self.window.copy_selection()
+        self.assertEqual(
+            QApplication.clipboard().text(),
+            "     1 | line 0\n     3 | line 2\n     4 | line 3\n     6 | line 5\n     8 | line 7",
+        )
+        self.assertEqual(self.window.status_bar.currentMessage(), "Copied 5 lines to clipboard")
+
+        # Large selections are formatted in the background.
+        model.show_line_numbers = False
+        with patch("loganalysis_gui.main_window.COPY_BACKGROUND_ROWS", 2):
+            self.window.copy_selection()
+        self.window.copy_thread.wait()
+        self.app.processEvents()
+        self.assertIsNone(self.window.copy_thread)
+        self.assertEqual(QApplication.clipboard().text(), "line 0\nline 2\nline 3\nline 5\nline 7")
+
+    def test_huge_copy_offers_export_instead(self):
+        model = self.window.log_model
+        model.set_lines([f"line {index}\n" for index in range(8)])
+        model.update_visible_indices([0, 2, 3, 5, 7])
+        self.window.log_view.selectAll()
+        QApplication.clipboard().clear()
+
+        with patch("loganalysis_gui.main_window.COPY_CLIPBOARD_MAX_ROWS", 4), \
+                patch("loganalysis_gui.main_window.QMessageBox.question", return_value=QMessageBox.Yes), \
+                patch.object(self.window, "_export_lines") as export_lines:
+            self.window.copy_selection()
+
+        title, line_indices = export_lines.call_args[0]
+        self.assertEqual(title, "Export Selected Lines")
+        self.assertEqual(list(line_indices), [0, 2, 3, 5, 7])
+        self.assertEqual(QApplication.clipboard().text(), "")
+
+    def test_export_writes_visible_rows_and_can_be_cancelled(self):
+        self.window.log_model.set_lines([f"line {index}\n" for index in range(6)])
+        self.window.log_model.update_visible_indices([0, 2, 3])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "view.log")
+            with patch("loganalysis_gui.main_window.QFileDialog.getSaveFileName",
+                       return_value=(path, "Gzip Compressed Logs (*.gz)")):
+                self.window.export_visible_lines()
+            self.assertTrue(self.window.cancel_export_action.isEnabled())
+            self.window.export_thread.wait()
+            self.app.processEvents()
+
+            with gzip.open(path + ".gz", "rt") as handle:
+                self.assertEqual(handle.read(), "line 0\nline 2\nline 3\n")
+            self.assertIsNone(self.window.export_thread)
+            self.assertFalse(self.window.cancel_export_action.isEnabled())
+            self.assertIn("Exported 3 lines", self.window.status_bar.currentMessage())
+
+            with patch("loganalysis_gui.main_window.ExportWorker.start"):
+                self.window._start_export(path)
+            self.window.cancel_export()
+            self.assertIsNone(self.window.export_thread)
+            self.assertFalse(self.window.export_progress.isVisible())
+            self.assertEqual(self.window.status_bar.currentMessage(), "Export cancelled")
+
+    def test_search_index_is_built_for_loaded_file_and_dropped_on_reload(self):
+        lines = [f"line {index} {'needle' if index == 70 else 'hay'}\n" for index in range(100)]
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "device.log")
+            with open(log_path, "w") as handle:
+                handle.writelines(lines)
+            self.window.runtime.loaded_file_path = log_path
+            self.window.log_model.set_lines(lines)
+
+            self.window.search_index_action.setChecked(True)
+            self.window.trigram_index_thread.wait()
+            self.app.processEvents()
+
+            index = self.window.log_model.trigram_index
+            self.assertEqual(index.line_count, 100)
+            self.assertIn("Search index built", self.window.status_bar.currentMessage())
+
+            self.window.update_search_highlights("needle", False, False)
+            self.window.search_thread.wait()
+            self.app.processEvents()
+            self.assertEqual(list(self.window.log_model.search_hit_lines), [70])
+
+            self.window.search_index_action.setChecked(False)
+            self.assertIsNone(self.window.log_model.trigram_index)
+
     def test_append_chunk_uses_last_matching_filter_precedence(self):
         include_filter = make_filter("alpha")
         exclude_filter = make_filter("alpha")
@@ -391,12 +1008,12 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
 
         self.window.log_model.filters = [include_filter, exclude_filter]
         self.window.log_model.append_chunk(["alpha\n"])
-        self.assertEqual(self.window.log_model.visible_indices, [])
+        self.assertEqual(list(self.window.log_model.visible_indices), [])
 
         self.window.log_model.clear()
         self.window.log_model.filters = [exclude_filter, include_filter]
         self.window.log_model.append_chunk(["alpha\n"])
-        self.assertEqual(self.window.log_model.visible_indices, [0])
+        self.assertEqual(list(self.window.log_model.visible_indices), [0])
 
     def test_duplicate_filter_item_inserts_copy_after_source(self):
         source_item = self.add_filter_item(make_filter("alpha"))
@@ -596,6 +1213,8 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         
         self.window.update_search_highlights("matching", case=False, regex=False)
         self.assertEqual(self.window.log_model.search_query, "matching")
+        self.window.search_thread.wait()
+        self.app.processEvents()
         
         bg_matching = self.window.log_model.data(self.window.log_model.index(0, 0), Qt.BackgroundRole)
         bg_other = self.window.log_model.data(self.window.log_model.index(1, 0), Qt.BackgroundRole)
@@ -672,6 +1291,20 @@ class LogAnalysisMainWindowTests(unittest.TestCase):
         self.assertFalse(tab_state.filters[0]["exclude"])
         self.assertEqual(tab_state.filters[0]["description"], "Quick context filter")
 
+    def test_device_list_updates_keep_current_selection(self):
+        self.window._on_devices_changed(["phone-a", "phone-b"])
+        self.window.device_selector.setCurrentText("phone-b")
+
+        self.window._on_devices_changed(["phone-0", "phone-a", "phone-b"])
+
+        self.assertEqual(self.window.device_selector.currentText(), "phone-b")
+        self.assertEqual(self.window.device_selector.count(), 4)
+        self.assertEqual(self.window._selected_device_serials(), ["phone-b"])
+
+        self.window._on_devices_changed([])
+        self.assertFalse(self.window.device_selector.isEnabled())
+        self.assertEqual(self.window._selected_device_serials(), [None])
+
     def test_device_selector_toolbar_widgets(self):
         self.assertIsNotNone(self.window.device_selector)
         self.assertIsNotNone(self.window.btn_refresh_devices)
@@ -0,0 +1,83 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.models import measured_line_lengths
+from loganalysis_gui.recorder import (
+    RECORDING_INDEX_NAME,
+    UNREADABLE_LINE,
+    RecordedSessionLines,
+    SessionRecorder,
+)
+
+
+def stamped(index):
+    return f"01-02 03:04:{index // 1000:02d}.{index % 1000:03d}  1  1 I T: line {index}\n"
+
+
+class SessionRecorderTests(unittest.TestCase):
+    def test_recording_rolls_segments_and_reopens_lazily(self):
+        lines = [stamped(index) for index in range(25)]
+        with tempfile.TemporaryDirectory() as directory:
+            session = os.path.join(directory, "session")
+            recorder = SessionRecorder(
+                session, segment_lines=10, block_lines=4, source_labels={0: "phone-a", 1: "phone-b"}
+            )
+            recorder.write(lines[:7])
+            recorder.write(lines[7:24], [index % 2 for index in range(7, 24)])
+            recorder.write([lines[24].rstrip("\n")], 1)
+            recorder.close()
+
+            self.assertIsNone(recorder.error)
+            self.assertEqual(recorder.lines_written, 25)
+            with open(os.path.join(session, RECORDING_INDEX_NAME), encoding="utf-8") as handle:
+                index = json.load(handle)
+            self.assertEqual(index["sources"], {"0": "phone-a", "1": "phone-b"})
+            segments = []
+            for number in range(3):
+                with open(os.path.join(session, f"segment-{number:05d}.json"), encoding="utf-8") as handle:
+                    segments.append(json.load(handle))
+            self.assertEqual([segment["line_count"] for segment in segments], [10, 10, 5])
+            self.assertEqual(segments[1]["first_line"], 10)
+            self.assertEqual(segments[1]["first_timestamp"], "01-02 03:04:00.010")
+            self.assertEqual(segments[1]["last_timestamp"], "01-02 03:04:00.019")
+            self.assertEqual([block[0] for block in segments[0]["blocks"]], [0, 4, 8])
+
+            # Independent gzip members still read back as one ordinary .gz file.
+            with gzip.open(os.path.join(session, segments[0]["file"]), "rt") as handle:
+                self.assertEqual(handle.readlines(), lines[:10])
+
+            recorded = RecordedSessionLines(session, cache_blocks=2)
+            self.assertEqual(len(recorded), 25)
+            self.assertEqual(recorded[13], lines[13])
+            self.assertEqual(recorded[-1], lines[24])
+            self.assertEqual(recorded[8:12], lines[8:12])
+            self.assertEqual(list(recorded), lines)
+            with self.assertRaises(IndexError):
+                recorded[25]
+            self.assertEqual(recorded.source_labels, {0: "phone-a", 1: "phone-b"})
+            self.assertEqual(list(recorded.line_sources), [0] * 7 + [index % 2 for index in range(7, 24)] + [1])
+            self.assertEqual(recorded.line_lengths, measured_line_lengths(lines))
+            with patch.object(RecordedSessionLines, "_decode_block", side_effect=AssertionError("decoded")):
+                # Opening reads the stored lengths instead of measuring every line.
+                self.assertEqual(len(RecordedSessionLines(session).line_lengths), 25)
+
+            os.unlink(os.path.join(session, segments[1]["file"]))
+            os.unlink(os.path.join(session, "segment-00001.sources"))
+            os.unlink(os.path.join(session, "segment-00001.lengths"))
+            reopened = RecordedSessionLines(session)
+            self.assertEqual(reopened[10], UNREADABLE_LINE)
+            self.assertEqual(reopened[20], lines[20])
+            self.assertEqual(list(reopened.line_sources[10:20]), [0] * 10)
+            self.assertEqual(reopened.line_sources[24], 1)
+            self.assertEqual(reopened.line_lengths[10], len(UNREADABLE_LINE.rstrip()))
+
+
+if __name__ == "__main__":
+    unittest.main()
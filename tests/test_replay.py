@@ -0,0 +1,149 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.constants import DEFAULT_LOGCAT_BUFFERS
+from loganalysis_gui.replay import (
+    REPLAY_FAST,
+    REPLAY_RATE,
+    REPLAY_REALTIME,
+    ReplayPacer,
+    main,
+    threadtime_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(round(delay, 6))
+        self.now += delay
+
+
+def stamped(seconds, text):
+    return f"01-02 03:04:{seconds:06.3f}  1  1 I T: {text}\n"
+
+
+class ReplayTests(unittest.TestCase):
+    def test_threadtime_seconds(self):
+        self.assertEqual(threadtime_seconds("01-01 00:00:01.250  1  1 I T: x\n"), 1.25)
+        self.assertEqual(
+            threadtime_seconds("03-01 00:00:00.000 x") - threadtime_seconds("02-28 00:00:00.000 x"),
+            2 * 86400,
+        )
+        self.assertIsNone(threadtime_seconds("--------- beginning of main\n"))
+
+    def test_realtime_pacing_follows_timestamps_and_scales_with_speed(self):
+        clock = FakeClock()
+        lines = [stamped(5.0, "a"), "continued\n", stamped(5.5, "b"), stamped(7.5, "c")]
+        pacer = ReplayPacer(REPLAY_REALTIME, speed=2.0, clock=clock, sleep=clock.sleep)
+
+        chunks = list(pacer.chunks(lines))
+
+        self.assertEqual(chunks, [lines[:2], [lines[2]], [lines[3]]])
+        self.assertEqual(clock.sleeps, [0.25, 1.0])
+
+    def test_rate_pacing_batches_lines_that_are_already_due(self):
+        clock = FakeClock()
+        pacer = ReplayPacer(REPLAY_RATE, rate=10, chunk_size=3, clock=clock, sleep=clock.sleep)
+        lines = [f"{index}\n" for index in range(4)]
+
+        chunks = list(pacer.chunks(lines))
+
+        self.assertEqual(chunks, [["0\n"], ["1\n"], ["2\n"], ["3\n"]])
+        self.assertEqual(clock.sleeps, [0.1, 0.1, 0.1])
+
+        # A sleep that overshoots by a second leaves ten lines due at once.
+        oversleep = lambda delay: setattr(clock, "now", clock.now + 1.0)
+        pacer = ReplayPacer(REPLAY_RATE, rate=10, chunk_size=3, clock=clock, sleep=oversleep)
+        chunk_sizes = [len(chunk) for chunk in pacer.chunks([f"{i}\n" for i in range(12)])]
+        self.assertEqual(chunk_sizes, [1, 3, 3, 3, 1, 1])
+
+    def test_fast_mode_never_sleeps(self):
+        clock = FakeClock()
+        pacer = ReplayPacer(REPLAY_FAST, chunk_size=2, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual(list(pacer.chunks(["a\n", "b\n", "c\n"])), [["a\n", "b\n"], ["c\n"]])
+        self.assertEqual(clock.sleeps, [])
+
+    def test_adb_stand_in_lists_device_and_replays_logcat(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as handle:
+            handle.write(stamped(1.0, "a") + stamped(1.0, "b"))
+            file_path = handle.name
+
+        try:
+            devices = io.StringIO()
+            self.assertEqual(main(["devices"], devices), 0)
+            self.assertIn("replay\tdevice", devices.getvalue())
+
+            output = io.StringIO()
+            argv = ["--file", file_path, "--mode", "fast", "--loops", "2", "-s", "replay", "logcat", "-v", "threadtime", "-d"]
+            self.assertEqual(main(argv, output), 0)
+            self.assertEqual(output.getvalue(), (stamped(1.0, "a") + stamped(1.0, "b")) * 2)
+        finally:
+            os.unlink(file_path)
+
+    def test_adb_stand_in_resumes_from_start_time_and_stays_open_like_logcat(self):
+        lines = [stamped(1.0, "a"), "--------- beginning of main\n", stamped(2.0, "b"), stamped(3.0, "c")]
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as handle:
+            handle.writelines(lines)
+            file_path = handle.name
+
+        try:
+            output = io.StringIO()
+            argv = ["--file", file_path, "--mode", "fast", "logcat", "-v", "threadtime", "-T", "01-02 03:04:02.000"]
+            with patch("loganalysis_gui.replay.wait_until_killed") as wait:
+                self.assertEqual(main(argv, output), 0)
+            wait.assert_called_once_with()
+            self.assertEqual(output.getvalue(), "".join(lines[2:]))
+        finally:
+            os.unlink(file_path)
+
+    def test_adb_stand_in_replays_file_once_for_the_default_buffer_set(self):
+        lines = [stamped(1.0, "a"), stamped(2.0, "b")]
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as handle:
+            handle.writelines(lines)
+            file_path = handle.name
+
+        try:
+            # Whether the buffers come as one list or one logcat each, only main carries the file.
+            output = io.StringIO()
+            for buffer in DEFAULT_LOGCAT_BUFFERS:
+                argv = ["--file", file_path, "--mode", "fast", "logcat", "-b", buffer, "-v", "threadtime", "-d"]
+                self.assertEqual(main(argv, output), 0)
+            self.assertEqual(output.getvalue(), "".join(lines))
+            output = io.StringIO()
+            argv = ["--file", file_path, "--mode", "fast", "logcat", "-b", ",".join(DEFAULT_LOGCAT_BUFFERS), "-d"]
+            self.assertEqual(main(argv, output), 0)
+            self.assertEqual(output.getvalue(), "".join(lines))
+
+            output = io.StringIO()
+            self.assertEqual(main(["--file", file_path, "--mode", "fast", "logcat", "-b", "system,crash", "-d"], output), 0)
+            self.assertEqual(output.getvalue(), "")
+            self.assertEqual(main(["--file", file_path, "--mode", "fast", "logcat", "-b", "all", "-d"], output), 0)
+            self.assertEqual(output.getvalue(), "".join(lines))
+        finally:
+            os.unlink(file_path)
+
+    def test_adb_stand_in_tracks_devices(self):
+        output = io.StringIO()
+        with patch("loganalysis_gui.replay.wait_until_killed") as wait:
+            self.assertEqual(main(["track-devices"], output), 0)
+
+        wait.assert_called_once_with()
+        self.assertEqual(output.getvalue(), "000ereplay\tdevice\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
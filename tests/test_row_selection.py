@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.row_selection import RowSelection
+
+
+class RowSelectionTests(unittest.TestCase):
+    def test_intervals_are_sorted_and_merged(self):
+        selection = RowSelection([(10, 12), (0, 3), (2, 5), (5, 6), (8, 8)])
+
+        self.assertEqual(list(selection), [(0, 6), (10, 12)])
+        self.assertEqual(len(selection), 8)
+        self.assertEqual(RowSelection.from_inclusive([(4, 4), (0, 2)]), RowSelection([(0, 3), (4, 5)]))
+        self.assertFalse(RowSelection())
+
+    def test_select_all_on_huge_views_stays_one_interval(self):
+        selection = RowSelection.from_inclusive([(0, 199_999_999)])
+
+        self.assertEqual(len(selection), 200_000_000)
+        self.assertEqual(list(selection.clipped(150_000_000)), [(0, 150_000_000)])
+        self.assertEqual(selection.single_row(), -1)
+
+    def test_single_row_and_take(self):
+        visible_indices = array("I", [3, 5, 8, 13, 21, 34])
+
+        self.assertEqual(RowSelection([(2, 3)]).single_row(), 2)
+        self.assertEqual(RowSelection([(1, 2), (3, 4)]).single_row(), -1)
+        self.assertEqual(list(RowSelection([(4, 9), (0, 2)]).take(visible_indices)), [3, 5, 21, 34])
+
+
+if __name__ == "__main__":
+    unittest.main()
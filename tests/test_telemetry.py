@@ -0,0 +1,81 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.telemetry import (
+    METRIC_APPLY,
+    METRIC_DROPPED,
+    METRIC_READ_LINES,
+    METRIC_TRIMMED,
+    LiveTelemetry,
+    format_report,
+    format_status,
+    latency_histogram,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LiveTelemetryTests(unittest.TestCase):
+    def test_summary_reports_rates_percentiles_and_totals_over_window(self):
+        clock = FakeClock()
+        telemetry = LiveTelemetry(window=10.0, clock=clock)
+        for second in range(20):
+            clock.now = float(second)
+            telemetry.record(METRIC_READ_LINES, 100)
+            telemetry.record(METRIC_APPLY, float(second))
+        telemetry.record(METRIC_TRIMMED, 5)
+        telemetry.record(METRIC_DROPPED, 2)
+
+        summary = telemetry.summary()
+
+        # Only samples from the last ten seconds stay in the window; totals keep counting.
+        self.assertEqual(summary[METRIC_READ_LINES]["count"], 11)
+        self.assertAlmostEqual(summary[METRIC_READ_LINES]["per_second"], 110.0)
+        self.assertEqual(summary[METRIC_READ_LINES]["total"], 2000)
+        self.assertEqual(summary[METRIC_APPLY]["max"], 19.0)
+        self.assertEqual(summary[METRIC_APPLY]["p50"], 14.0)
+        self.assertEqual(sum(summary[METRIC_APPLY]["histogram"]), 11)
+        self.assertEqual(summary[METRIC_TRIMMED]["total"], 5)
+        self.assertIn("110 lines/s", format_status(summary))
+        # Lines trimmed from the live view are not lines that never arrived.
+        self.assertIn("Trimmed: 5 | Dropped: 2", format_status(summary))
+        self.assertIn("_apply_chunk_to_model (ms): n=11", format_report(summary))
+
+    def test_latency_histogram_buckets_by_upper_bound(self):
+        self.assertEqual(latency_histogram([0.05, 0.1, 0.2, 1000], bounds=(0.1, 1)), [2, 1, 1])
+
+    def test_write_csv_dumps_window_samples(self):
+        clock = FakeClock()
+        telemetry = LiveTelemetry(clock=clock)
+        telemetry.record(METRIC_READ_LINES, 10)
+        clock.now = 0.5
+        telemetry.record(METRIC_APPLY, 1.25)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            file_path = handle.name
+        try:
+            self.assertEqual(telemetry.write_csv(file_path), 2)
+            with open(file_path, newline="", encoding="utf-8") as handle:
+                rows = list(csv.reader(handle))
+        finally:
+            os.unlink(file_path)
+
+        self.assertEqual(
+            rows,
+            [["metric", "seconds", "value"], ["read_lines", "0.000000", "10"], ["apply_chunk_ms", "0.500000", "1.25"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from loganalysis_gui.highlight import search_pattern
+from loganalysis_gui.trigram_index import (
+    TrigramIndex,
+    filter_trigrams,
+    index_path_for,
+    literal_trigrams,
+    regex_trigrams,
+    search_trigrams,
+)
+
+
+LINES = [
+    f"01-02 03:04:{index % 60:02d}.000  {100 + index % 7:4d}  200 I {'Wifi' if index % 5 else 'Net'}     : "
+    f"{'scan DONE' if index % 11 == 0 else 'idle'} {index} café\n"
+    for index in range(500)
+]
+
+
+class TrigramIndexTests(unittest.TestCase):
+    def test_candidates_contain_every_matching_line(self):
+        index = TrigramIndex.build(LINES, block_lines=8)
+
+        for query, case_sensitive, regex in (
+            ("scan done", False, False),
+            ("DONE", True, False),
+            (r"scan\s+DONE \d+", True, True),
+            (r"Net +: idle", False, True),
+            ("café", False, False),
+        ):
+            trigrams = search_trigrams(query, case_sensitive, regex)
+            pattern = search_pattern(query, case_sensitive, regex)
+            expected = [line_index for line_index, line in enumerate(LINES) if pattern.search(line)]
+            self.assertTrue(expected, query)
+            if not trigrams:
+                continue
+            candidates = set(index.candidate_lines(trigrams))
+            self.assertLessEqual(set(expected), candidates, query)
+            if len(expected) < len(LINES) // 2:
+                self.assertLess(len(candidates), len(LINES), query)
+
+    def test_only_required_literals_become_trigrams(self):
+        self.assertEqual(regex_trigrams("foo|barbaz", True), set())
+        self.assertEqual(regex_trigrams(r"ab?cdef\d", True), {b"cde", b"def"})
+        self.assertEqual(regex_trigrams("(?i)ABCD", True), {b"abc", b"bcd"})
+        self.assertEqual(regex_trigrams("(", True), set())
+        # Case-insensitive regexes also match dotless i and long s.
+        self.assertEqual(literal_trigrams("list", regex_ignorecase=True), set())
+        self.assertEqual(literal_trigrams("list"), {b"lis", b"ist"})
+        self.assertEqual(filter_trigrams({"text": "  Wifi ", "regex": False, "case_sensitive": True, "field": "tag"}),
+                         {b"wif", b"ifi"})
+        self.assertEqual(filter_trigrams({"text": "E", "regex": False, "case_sensitive": False, "field": "level"}),
+                         set())
+
+    def test_saved_index_round_trips_and_rejects_other_logs(self):
+        index = TrigramIndex.build(LINES, block_lines=16)
+        trigrams = search_trigrams("scan done", False, False)
+        with tempfile.TemporaryDirectory() as directory:
+            path = index_path_for(os.path.join(directory, "device.log"))
+            index.save(path, 1234, 5678)
+
+            loaded = TrigramIndex.load(path, 1234, 5678, len(LINES))
+            self.assertEqual(loaded.candidate_lines(trigrams), index.candidate_lines(trigrams))
+            self.assertEqual(len(loaded), len(index))
+            self.assertIsNone(TrigramIndex.load(path, 1234, 5679, len(LINES)))
+            self.assertIsNone(TrigramIndex.load(path, 1234, 5678, len(LINES) + 1))
+
+            with open(path, "r+b") as handle:
+                handle.truncate(os.path.getsize(path) - 4)
+            self.assertIsNone(TrigramIndex.load(path, 1234, 5678, len(LINES)))
+
+    def test_build_stops_when_cancelled(self):
+        self.assertIsNone(TrigramIndex.build(LINES, should_continue=lambda: False))
+
+
+if __name__ == "__main__":
+    unittest.main()
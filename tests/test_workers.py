@@ -1,11 +1,54 @@
+import gzip
+import io
 import os
+import re
+import struct
+import subprocess
 import sys
 import tempfile
+import time
 import unittest
+from array import array
+from unittest.mock import Mock, patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
-from loganalysis_gui.workers import FileLoadWorker
+from loganalysis_gui.logcat import BinaryLogcatDecoder, parse_event_log_tags
+from loganalysis_gui.replay import REPLAY_FAST, REPLAY_REALTIME
+from loganalysis_gui.trigram_index import TrigramIndex, index_path_for, search_trigrams
+from loganalysis_gui import workers
+from loganalysis_gui.workers import (
+    AdbWorker,
+    DeviceWatcher,
+    ExportWorker,
+    FileLoadWorker,
+    FilterWorker,
+    FindIndexWorker,
+    ReplayWorker,
+    SearchWorker,
+    TrigramIndexWorker,
+    parse_adb_devices,
+)
+
+
+def pack_logger_entry(pid, tid, sec, nsec, priority, tag, message, *, header_size=28, payload=None):
+    if payload is None:
+        payload = bytes([priority]) + tag.encode() + b"\0" + message.encode() + b"\0"
+    if header_size == 20:
+        header = struct.pack("<HHiIII", len(payload), 0, pid, tid, sec, nsec)
+    else:
+        extra = b"\0" * (header_size - 20)
+        header = struct.pack("<HHiIII", len(payload), header_size, pid, tid, sec, nsec) + extra
+    return header + payload
+
+
+class FakeBinaryProcess:
+    def __init__(self, data):
+        self.stdout = io.BufferedReader(io.BytesIO(data))
+        self.stderr = io.BytesIO()
+
+    def poll(self):
+        return 0
 
 
 class FileLoadWorkerTests(unittest.TestCase):
@@ -25,7 +68,8 @@ class FileLoadWorkerTests(unittest.TestCase):
 
             self.assertGreaterEqual(len(progress_events), 2)
             self.assertEqual(progress_events[-1], (7, file_path, 17, 17, 3))
-            self.assertEqual(completions[0], (7, file_path, ["alpha\n", "beta\r\n", "gamma"]))
+            self.assertEqual(completions[0][:3], (7, file_path, ["alpha\n", "beta\r\n", "gamma"]))
+            self.assertEqual(completions[0][3].tolist(), [5, 4, 5])
         finally:
             os.unlink(file_path)
 
@@ -43,9 +87,457 @@ class FileLoadWorkerTests(unittest.TestCase):
         self.assertEqual(errors, [(3, file_path, "File not found.")])
 
     def test_adb_worker_serial_targeting(self):
-        from loganalysis_gui.workers import AdbWorker
         worker = AdbWorker(device_serial="test-serial-1234")
         self.assertEqual(worker.device_serial, "test-serial-1234")
+        self.assertEqual(
+            worker.logcat_command(),
+            ["adb", "-s", "test-serial-1234", "logcat", "-v", "threadtime"],
+        )
+        self.assertEqual(
+            AdbWorker(binary=True).logcat_command(),
+            ["adb", "logcat", "-B"],
+        )
+        self.assertEqual(
+            AdbWorker(buffer="events", binary=True).logcat_command(),
+            ["adb", "logcat", "-b", "events", "-B"],
+        )
+        self.assertEqual(
+            AdbWorker(filter_args=["Wifi:V", "*:S"], start_time="01-02 03:04:05.678").logcat_command(),
+            ["adb", "logcat", "-v", "threadtime", "-T", "01-02 03:04:05.678", "Wifi:V", "*:S"],
+        )
+
+    def test_adb_worker_retries_without_rejected_filter_args(self):
+        rejected = Mock()
+        rejected.stdout = io.StringIO("")
+        rejected.stderr = io.StringIO("logcat: unrecognized option '--pid=1'\nUsage: logcat [options] [filterspecs]\n")
+        rejected.poll.return_value = 1
+        accepted = Mock()
+        accepted.stdout = io.StringIO("01-02 03:04:05.678  1  1 I T: ok\n")
+        accepted.stderr = io.StringIO("")
+        accepted.poll.return_value = 0
+        chunks = []
+        worker = AdbWorker(filter_args=["--pid=1"])
+        worker.chunk_ready.connect(chunks.append)
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", side_effect=[rejected, accepted]) as popen:
+            worker.run()
+
+        self.assertEqual(popen.call_args_list[0].args[0][-1], "--pid=1")
+        self.assertNotIn("--pid=1", popen.call_args_list[1].args[0])
+        self.assertEqual(chunks, [["01-02 03:04:05.678  1  1 I T: ok\n"]])
+        self.assertEqual(worker.last_timestamp, "01-02 03:04:05.678")
+
+    def test_adb_worker_keeps_filter_args_when_the_device_goes_away(self):
+        offline = Mock()
+        offline.stdout = io.StringIO("")
+        offline.stderr = io.StringIO("error: device offline\n")
+        offline.poll.return_value = 1
+        worker = AdbWorker(filter_args=["Wifi:V", "*:S"])
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", return_value=offline) as popen:
+            worker.run()
+
+        popen.assert_called_once()
+        self.assertEqual(worker.filter_args, ["Wifi:V", "*:S"])
+        self.assertIn("device offline", worker.stderr_tail)
+        self.assertIs(popen.call_args.kwargs["stderr"], subprocess.PIPE)
+
+
+    def test_adb_worker_reconnects_from_last_timestamp_without_duplicates(self):
+        first = ["01-02 03:04:05.000  1  1 I T: a\n", "01-02 03:04:06.000  1  1 I T: b\n"]
+        resumed = ["01-02 03:04:06.000  1  1 I T: b\n", "01-02 03:04:07.000  1  1 I T: c\n"]
+        processes = []
+        for lines in (first, resumed):
+            process = Mock()
+            process.stdout = io.StringIO("".join(lines))
+            process.poll.return_value = 0
+            processes.append(process)
+        chunks = []
+        attempts = []
+        worker = AdbWorker(device_serial="phone", reconnect=True)
+        worker.reconnecting.connect(lambda attempt, delay: attempts.append((attempt, delay)))
+
+        def on_chunk(chunk):
+            chunks.append(chunk)
+            if len(chunks) == 2:
+                worker.stop()
+
+        worker.chunk_ready.connect(on_chunk)
+        with patch("loganalysis_gui.workers.ADB_RECONNECT_INITIAL_DELAY", 0), patch(
+            "loganalysis_gui.workers.subprocess.Popen", side_effect=processes
+        ) as popen:
+            worker.run()
+
+        self.assertEqual(chunks, [first, resumed[1:]])
+        self.assertEqual(attempts, [(1, 0)])
+        self.assertEqual(popen.call_args_list[1].args[0][-2:], ["-T", "01-02 03:04:06.000"])
+
+
+    def test_replay_worker_emits_file_through_chunk_signal(self):
+        lines = [f"01-02 03:04:05.{index:03d}  1  1 I T: line {index}\n" for index in range(250)]
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as handle:
+            handle.writelines(lines)
+            file_path = handle.name
+
+        try:
+            chunks = []
+            worker = ReplayWorker(file_path, REPLAY_FAST)
+            worker.chunk_ready.connect(chunks.append)
+            worker.run()
+        finally:
+            os.unlink(file_path)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 50])
+        self.assertEqual([line for chunk in chunks for line in chunk], lines)
+        self.assertEqual(worker.last_timestamp, "01-02 03:04:05.249")
+
+    def test_replay_worker_stop_interrupts_realtime_wait(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as handle:
+            handle.write("01-02 03:04:05.000  1  1 I T: a\n01-02 04:04:05.000  1  1 I T: b\n")
+            file_path = handle.name
+
+        try:
+            worker = ReplayWorker(file_path, REPLAY_REALTIME)
+            worker.chunk_ready.connect(lambda chunk: worker.stop())
+            started = time.monotonic()
+            worker.run()
+        finally:
+            os.unlink(file_path)
+
+        self.assertLess(time.monotonic() - started, 5)
+
+
+
+class FilterWorkerTests(unittest.TestCase):
+    def run_worker(self, worker):
+        partials = []
+        results = []
+
+        def on_partial(request_id, rows):
+            partials.append(list(rows))
+            # The view extends what it receives in place.
+            rows.append(10 ** 6)
+
+        worker.partial_filtering.connect(on_partial)
+        worker.finished_filtering.connect(lambda *args: results.append(args))
+        worker.run()
+        return partials, results[0]
+
+    def test_progressive_pass_publishes_focus_window_first(self):
+        lines = [f"{'keep' if index % 2 else 'drop'} {index}\n" for index in range(100)]
+        filters = [{"text": "keep", "case_sensitive": False, "regex": False, "exclude": False, "active": True}]
+        worker = FilterWorker(
+            lines, filters, True, 7, focus_index=50, progressive_min_lines=10, focus_lines=10, progress_lines=20
+        )
+
+        partials, result = self.run_worker(worker)
+
+        request_id, visible_indices, match_count, filter_counts, _widest, visible_diff = result
+        self.assertEqual(request_id, 7)
+        self.assertEqual(partials[0], [45, 47, 49, 51, 53])
+        self.assertEqual(partials[1], list(range(55, 75, 2)))
+        self.assertEqual(visible_indices.tolist(), list(range(1, 100, 2)))
+        self.assertEqual((match_count, filter_counts), (50, [50]))
+        # Applying the final diff to the published rows yields the full result.
+        rows = [row for partial in partials for row in partial]
+        self.assertIsNone(visible_diff.base)
+        self.assertEqual(visible_diff.base_count, len(rows))
+        first_row, leading = visible_diff.inserted[0]
+        self.assertEqual((first_row, leading.tolist()), (0, list(range(1, 45, 2))))
+        self.assertEqual(leading.tolist() + rows, visible_indices.tolist())
+
+    def test_small_inputs_use_a_single_pass_with_row_diff(self):
+        worker = FilterWorker(["a\n", "b\n"], [], True, 1, previous_indices=[0], focus_index=0)
+
+        partials, result = self.run_worker(worker)
+
+        self.assertEqual(partials, [])
+        self.assertEqual(result[1].tolist(), [0, 1])
+        self.assertEqual([(row, list(indices)) for row, indices in result[5].inserted], [(1, [1])])
+
+
+class SearchWorkerTests(unittest.TestCase):
+    def test_scan_reports_hit_blocks_with_absolute_line_numbers(self):
+        lines = [f"{'hit' if index % 3 == 0 else 'miss'} {index}\n" for index in range(10)]
+        worker = SearchWorker(4, lines, re.compile("hit"), start=2, first_line_number=100, block_lines=4)
+        blocks = []
+        finished = []
+        worker.hits_ready.connect(lambda generation, first_line, hits: blocks.append((generation, first_line, hits)))
+        worker.search_finished.connect(finished.append)
+
+        worker.run()
+
+        self.assertEqual(
+            blocks,
+            [(4, 102, bytearray([0, 1, 0, 0])), (4, 106, bytearray([1, 0, 0, 1]))],
+        )
+        self.assertEqual(finished, [4])
+
+    def test_narrowed_scan_rechecks_only_previous_hits(self):
+        lines = [f"hit {index}\n" for index in range(10)]
+        # Lines 0-5 were scanned for the previous query; only 1 and 4 matched.
+        worker = SearchWorker(1, lines, re.compile("hit"), block_lines=4, candidates=array("I", [1, 4]),
+                              candidate_stop=6)
+        blocks = []
+        worker.hits_ready.connect(lambda generation, first_line, hits: blocks.append((first_line, hits)))
+
+        worker.run()
+
+        self.assertEqual(
+            blocks,
+            [(0, bytearray([0, 1, 0, 0])), (4, bytearray([1, 0, 1, 1])), (8, bytearray([1, 1]))],
+        )
+
+    def test_stopped_scan_reports_nothing(self):
+        worker = SearchWorker(1, ["hit\n"] * 10, re.compile("hit"), block_lines=2)
+        results = []
+        worker.hits_ready.connect(lambda *args: results.append(args))
+        worker.search_finished.connect(results.append)
+        worker.stop()
+
+        worker.run()
+
+        self.assertEqual(results, [])
+
+
+class ExportWorkerTests(unittest.TestCase):
+    LINES = [f"line {index} é\n" for index in range(10)]
+
+    def test_exports_visible_lines_in_blocks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, read in (("out.log", open), ("out.log.gz", gzip.open)):
+                path = os.path.join(directory, name)
+                worker = ExportWorker(path, self.LINES, array("I", [1, 4, 5, 9]), block_rows=3)
+                progress = []
+                finished = []
+                worker.progress_updated.connect(lambda written, total: progress.append((written, total)))
+                worker.export_finished.connect(lambda *args: finished.append(args))
+
+                worker.run()
+
+                with read(path, "rb") as handle:
+                    self.assertEqual(handle.read().decode("utf-8"), "line 1 é\nline 4 é\nline 5 é\nline 9 é\n")
+                self.assertEqual(progress, [(3, 4), (4, 4)])
+                self.assertEqual(finished, [(path, 4)])
+            self.assertEqual(sorted(os.listdir(directory)), ["out.log", "out.log.gz"])
+
+    def test_cancelled_or_failed_export_leaves_no_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.log")
+            worker = ExportWorker(path, self.LINES, array("I", range(10)))
+            results = []
+            worker.export_finished.connect(lambda *args: results.append(args))
+            worker.stop()
+            worker.run()
+
+            missing_dir = os.path.join(directory, "missing", "out.log")
+            failing = ExportWorker(missing_dir, self.LINES, array("I", range(10)))
+            failing.export_failed.connect(lambda *args: results.append(args))
+            failing.run()
+
+            self.assertEqual(os.listdir(directory), [])
+            self.assertEqual(len(results), 1)
+            self.assertEqual(results[0][0], missing_dir)
+
+
+class FindIndexWorkerTests(unittest.TestCase):
+    def test_index_covers_every_block_of_visible_rows(self):
+        lines = [f"{'hit' if index % 4 == 0 else 'miss'}\n" for index in range(20)]
+        worker = FindIndexWorker(3, list(range(0, 20, 2)), lines, re.compile("hit"), bytearray([1, 0, 0, 0]), block_rows=3)
+        results = []
+        worker.index_ready.connect(lambda request_id, rows: results.append((request_id, rows.tolist())))
+
+        worker.run()
+
+        self.assertEqual(results, [(3, [0, 2, 4, 6, 8])])
+
+
+class TrigramIndexedWorkerTests(unittest.TestCase):
+    LINES = [f"{'needle found' if index % 50 == 3 else 'hay'} {index}\n" for index in range(400)]
+
+    def test_filter_worker_only_evaluates_index_candidates(self):
+        filters = [
+            {"text": "needle", "case_sensitive": False, "regex": False, "exclude": False, "active": True},
+            {"text": r"found 3\d", "case_sensitive": True, "regex": True, "exclude": True, "active": True},
+        ]
+        plain = FilterWorker(self.LINES, filters, True, 1)
+        indexed = FilterWorker(self.LINES, filters, True, 1, trigram_index=TrigramIndex.build(self.LINES, block_lines=8))
+        results = []
+        for worker in (plain, indexed):
+            worker.finished_filtering.connect(lambda *args: results.append(args))
+
+        plain.run()
+        with patch("loganalysis_gui.workers.evaluate_line", wraps=workers.evaluate_line) as evaluate:
+            indexed.run()
+
+        self.assertEqual(results[1][1].tolist(), results[0][1].tolist())
+        self.assertEqual(results[1][1:4], results[0][1:4])
+        self.assertEqual(evaluate.call_count, 8 * 8)
+
+    def test_search_worker_matches_only_candidates(self):
+        index = TrigramIndex.build(self.LINES, block_lines=8)
+        search_re = re.compile("needle")
+        worker = SearchWorker(1, self.LINES, search_re, block_lines=100, trigram_index=index,
+                              trigrams=search_trigrams("needle", True, False))
+        hits = bytearray()
+        worker.hits_ready.connect(lambda _generation, _first_line, block: hits.extend(block))
+
+        worker.run()
+
+        self.assertEqual(hits, bytearray(1 if search_re.search(line) else 0 for line in self.LINES))
+
+    def test_index_worker_saves_next_to_the_log_and_reloads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "device.log")
+            with open(log_path, "w") as handle:
+                handle.writelines(self.LINES)
+            results = []
+            for _attempt in range(2):
+                worker = TrigramIndexWorker(log_path, self.LINES)
+                worker.index_ready.connect(lambda path, index, loaded: results.append((path, len(index), loaded)))
+                worker.run()
+
+            self.assertTrue(os.path.exists(index_path_for(log_path)))
+            self.assertEqual([loaded for _path, _size, loaded in results], [False, True])
+            self.assertEqual(results[0][1], results[1][1])
+
+
+class DeviceWatcherTests(unittest.TestCase):
+    def test_parse_adb_devices_keeps_ready_devices(self):
+        output = "emulator-5554\tdevice\nR58M\tunauthorized\n0123\tdevice product:x\n"
+        self.assertEqual(parse_adb_devices(output), ["emulator-5554", "0123"])
+
+    def test_track_devices_emits_each_changed_list(self):
+        payload = b"emulator-5554\tdevice\n"
+        update = b"%04x" % len(payload) + payload
+        stream = update + update + b"0000"
+        process = Mock()
+        process.stdout = io.BytesIO(stream)
+        process.poll.return_value = 0
+        updates = []
+        watcher = DeviceWatcher()
+        watcher.devices_changed.connect(updates.append)
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", return_value=process) as popen:
+            self.assertTrue(watcher._track())
+
+        self.assertEqual(popen.call_args.args[0], ["adb", "track-devices"])
+        self.assertEqual(updates, [["emulator-5554"], []])
+
+    def test_falls_back_to_polling_when_tracking_is_unavailable(self):
+        process = Mock()
+        process.stdout = io.BytesIO(b"")
+        process.poll.return_value = 1
+        polled = Mock(stdout="List of devices attached\nphone\tdevice\n\n")
+        updates = []
+        watcher = DeviceWatcher(poll_interval=0)
+        watcher.devices_changed.connect(updates.append)
+        watcher.devices_changed.connect(lambda devices: watcher.stop())
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", return_value=process), patch(
+            "loganalysis_gui.workers.subprocess.run", return_value=polled
+        ):
+            watcher.run()
+
+        self.assertFalse(watcher.use_tracking)
+        self.assertEqual(updates, [["phone"]])
+
+    def test_missing_adb_reports_once_and_stops(self):
+        failures = []
+        watcher = DeviceWatcher()
+        watcher.scan_failed.connect(failures.append)
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", side_effect=FileNotFoundError):
+            watcher.run()
+
+        self.assertEqual(failures, ["ADB not found in system PATH."])
+
+
+class BinaryLogcatTests(unittest.TestCase):
+    def test_decoder_handles_v1_and_v4_headers_split_across_reads(self):
+        data = pack_logger_entry(10, 11, 1700000000, 5000000, 4, "Tag", "hello", header_size=20)
+        data += pack_logger_entry(20, 21, 1700000001, 999000000, 6, "Other", "boom\n", header_size=28)
+        decoder = BinaryLogcatDecoder()
+
+        first = decoder.feed(data[:30])
+        second = decoder.feed(data[30:])
+
+        self.assertEqual(len(first), 0)
+        self.assertEqual(second.pids, [10, 20])
+        self.assertEqual(second.tids, [11, 21])
+        self.assertEqual(second.priorities, [4, 6])
+        self.assertEqual(second.tags, ["Tag", "Other"])
+        self.assertEqual(second.messages, ["hello", "boom"])
+        self.assertEqual(decoder.pending_bytes, 0)
+
+    def test_render_threadtime_matches_text_format(self):
+        records = BinaryLogcatDecoder().feed(
+            pack_logger_entry(123, 456, 1700000000, 42000000, 5, "Wifi", "line one\nline two")
+        )
+        stamp = time.strftime("%m-%d %H:%M:%S", time.localtime(1700000000))
+
+        self.assertEqual(
+            records.render_threadtime(),
+            [
+                f"{stamp}.042   123   456 W Wifi    : line one\n",
+                f"{stamp}.042   123   456 W Wifi    : line two\n",
+            ],
+        )
+
+    def test_events_buffer_decodes_typed_payload_with_tag_map(self):
+        payload = struct.pack("<i", 30010) + bytes([3, 3])
+        payload += bytes([0]) + struct.pack("<i", 7)
+        payload += bytes([2]) + struct.pack("<i", 2) + b"hi"
+        payload += bytes([1]) + struct.pack("<q", -5)
+        data = pack_logger_entry(9, 9, 1700000000, 0, 0, "", "", payload=payload)
+        data += pack_logger_entry(9, 9, 1700000000, 0, 0, "", "", payload=struct.pack("<i", 1) + bytes([0, 1, 0, 0, 0]))
+
+        records = BinaryLogcatDecoder(parse_event_log_tags("30010 am_proc_bound (User|1|5)\n# comment\n")).feed(data)
+
+        self.assertEqual(records.tags, ["am_proc_bound", "1"])
+        self.assertEqual(records.messages, ["[7,hi,-5]", "1"])
+        self.assertTrue(records.render_threadtime()[0].endswith(" I am_proc_bound: [7,hi,-5]\n"))
+
+    def test_event_tag_map_is_fetched_once_per_device(self):
+        workers._event_tag_cache.clear()
+        result = Mock(stdout="42 answer (value|1)\n")
+        with patch("loganalysis_gui.workers.subprocess.run", return_value=result) as run:
+            self.assertEqual(workers.load_event_tags("phone"), {42: "answer"})
+            self.assertEqual(workers.load_event_tags("phone"), {42: "answer"})
+        workers._event_tag_cache.clear()
+
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(run.call_args.args[0], ["adb", "-s", "phone", "shell", "cat", "/system/etc/event-log-tags"])
+
+
+    def test_adb_worker_binary_mode_emits_rendered_chunks(self):
+        data = b"".join(
+            pack_logger_entry(1, 2, 1700000000, 0, 3, "T", f"message {index}")
+            for index in range(3)
+        )
+        chunks = []
+        worker = AdbWorker(binary=True, read_size=40)
+        worker.chunk_ready.connect(chunks.append)
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", return_value=FakeBinaryProcess(data)):
+            worker.run()
+
+        lines = [line for chunk in chunks for line in chunk]
+        self.assertEqual([line.split(": ", 1)[1] for line in lines], [f"message {i}\n" for i in range(3)])
+
+    def test_adb_worker_binary_mode_resumes_from_epoch_time(self):
+        data = pack_logger_entry(1, 2, 1700000000, 0, 3, "T", "a") + pack_logger_entry(
+            1, 2, 1700000001, 250000000, 3, "T", "b"
+        )
+        worker = AdbWorker(binary=True)
+
+        with patch("loganalysis_gui.workers.subprocess.Popen", return_value=FakeBinaryProcess(data)):
+            worker.run()
+
+        # Host and device timezones may differ; the epoch form means the same instant to both.
+        self.assertEqual(worker.last_timestamp, "1700000001.250")
+        worker.start_time = worker.last_timestamp
+        self.assertEqual(worker.logcat_command()[-2:], ["-T", "1700000001.250"])
 
 
 if __name__ == "__main__":